@@ -1,4 +1,5 @@
-import copy
+import re
+import json
 
 payload_mint_root_batch = {
     "from": "<FROM>",
@@ -96,36 +97,96 @@ CAMPAIGNS = {
     # "mixed_full": erc721_tx_build + erc721_read_only + erc1155_tx_build + erc1155_read_only,
 }
 
-def _replace_placeholders(obj, address: str, batch_id: str):
+# Placeholders of the payload templates, filled per user (<FROM>, <TO>, <BATCH_ID>) or per request (<TOKEN_ID>)
+SLOTS = ("<FROM>", "<TO>", "<BATCH_ID>", "<TOKEN_ID>")
+
+
+class PayloadTemplate:
     """
-    Substitui recursivamente <FROM>, <TO> e <BATCH_ID> em qualquer estrutura (dict, list, str).
+    A payload encoded to JSON once, with slots where the placeholders were.
+
+    The encoded body is kept as byte chunks interleaved with slot names, so
+    filling it is one `b"".join` of a few chunks: no dict copies, recursive
+    walks or `json.dumps` per request. `bind()` fills some slots and returns a
+    new template (done once per user); `render()` fills the remaining ones and
+    returns the request body. Placeholders are string values, so the filled
+    values are JSON strings too (a token id 7 is sent as "7", as before).
     """
-    if isinstance(obj, dict):
-        return {k: _replace_placeholders(v, address, batch_id) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [_replace_placeholders(v, address, batch_id) for v in obj]
-    elif isinstance(obj, str):
-        return obj.replace("<FROM>", address).replace("<TO>", address).replace("<BATCH_ID>", batch_id)
-    return obj
+
+    def __init__(self, chunks: list):
+        # Alternating literal bytes and slot names: [bytes, slot, bytes, slot, ..., bytes]
+        self.chunks = chunks
+        self.slots = frozenset(chunks[1::2])
+        self._body = chunks[0] if len(chunks) == 1 else None
+
+    @classmethod
+    def compile(cls, payload: dict) -> "PayloadTemplate":
+        encoded = json.dumps(payload, separators=(",", ":"))
+        pieces = re.split("(" + "|".join(re.escape(json.dumps(slot)) for slot in SLOTS) + ")", encoded)
+
+        chunks = []
+        for index, piece in enumerate(pieces):
+            # Odd pieces are the quoted placeholders matched by the split
+            chunks.append(json.loads(piece) if index % 2 else piece.encode())
+        return cls(chunks)
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        return json.dumps(str(value)).encode()
+
+    def bind(self, values: dict) -> "PayloadTemplate":
+        """Fills the slots in `values` and merges the adjacent chunks."""
+        chunks = [self.chunks[0]]
+        for index in range(1, len(self.chunks), 2):
+            slot, literal = self.chunks[index], self.chunks[index + 1]
+            if slot in values:
+                chunks[-1] += self._encode(values[slot]) + literal
+            else:
+                chunks += [slot, literal]
+        return PayloadTemplate(chunks)
+
+    def render(self, values: dict = None) -> bytes:
+        """Request body with every remaining slot filled from `values`."""
+        if self._body is not None:
+            return self._body
+
+        missing = self.slots.difference(values or ())
+        if missing:
+            raise KeyError(f"Unfilled payload slots: {sorted(missing)}")
+
+        return b"".join(
+            chunk if index % 2 == 0 else self._encode(values[chunk])
+            for index, chunk in enumerate(self.chunks)
+        )
+
+
+# Every campaign payload compiled once, by endpoint
+TEMPLATES = {
+    endpoint: PayloadTemplate.compile(payload)
+    for campaign in CAMPAIGNS.values()
+    for endpoint, payload in campaign
+}
+
+
+def _user_template(endpoint: str, address: str, batch_id: str) -> PayloadTemplate:
+    """Template of `endpoint` with the user slots (<FROM>, <TO>, <BATCH_ID>) filled."""
+    return TEMPLATES[endpoint].bind({"<FROM>": address, "<TO>": address, "<BATCH_ID>": batch_id})
 
 
 def build_campaign(contract: str, task_type: str, address: str, batch_id: str):   
     """
     Constrói uma campanha substituindo <FROM>, <TO> e <BATCH_ID> pelos valores reais.
-    Retorna uma lista de (endpoint, payload).
+    Retorna uma lista de (endpoint, PayloadTemplate).
     """
         
     campaign_key = (contract, task_type)
     if campaign_key not in CAMPAIGNS:
         raise ValueError(f"Campaign '{contract} {task_type}' not found.")
 
-    final_campaign = []
-    for endpoint, payload in CAMPAIGNS[campaign_key]:
-        payload_copy = copy.deepcopy(payload)
-        replaced = _replace_placeholders(payload_copy, address, batch_id)
-        final_campaign.append((endpoint, replaced))
-
-    return final_campaign
+    return [
+        (endpoint, _user_template(endpoint, address, batch_id))
+        for endpoint, _ in CAMPAIGNS[campaign_key]
+    ]
 
 
 def build_campaign_sequential(
@@ -142,7 +203,8 @@ def build_campaign_sequential(
         mintRootBatchTx -> n splitBatchTx -> n setProductIsActiveTx -> n addStatusTx
 
     This function returns the campaign in the exact same format expected by
-    User._build_user_campaigns(), meaning a list of (endpoint, payload) tuples.
+    User._build_user_campaigns(), meaning a list of (endpoint, PayloadTemplate)
+    tuples; only the <TOKEN_ID> slot is left to fill per request.
 
     Parameters
     ----------
@@ -161,8 +223,8 @@ def build_campaign_sequential(
 
     Returns
     -------
-    list[tuple[str, dict]]
-        A list of (endpoint, payload) tuples in sequential order.
+    list[tuple[str, PayloadTemplate]]
+        A list of (endpoint, template) tuples in sequential order.
 
     Raises
     ------
@@ -186,29 +248,25 @@ def build_campaign_sequential(
     campaign = []
 
     # 1. mintRootBatchTx (always once)
-    endpoint, payload = mint_tpl
-    replaced = _replace_placeholders(copy.deepcopy(payload), address, batch_id)
-    campaign.append((endpoint, replaced))
+    endpoint, _ = mint_tpl
+    campaign.append((endpoint, _user_template(endpoint, address, batch_id)))
 
     # 2. splitBatchTx (n times)
     if n_split_batch_tx:
         for _ in range(n_split_batch_tx):
-            endpoint, payload = split_tpl
-            replaced = _replace_placeholders(copy.deepcopy(payload), address, batch_id)
-            campaign.append((endpoint, replaced))
+            endpoint, _ = split_tpl
+            campaign.append((endpoint, _user_template(endpoint, address, batch_id)))
 
     # 3. setProductIsActiveTx (n times)
     if n_set_product_is_active_tx:
         for _ in range(n_set_product_is_active_tx):
-            endpoint, payload = active_tpl
-            replaced = _replace_placeholders(copy.deepcopy(payload), address, batch_id)
-            campaign.append((endpoint, replaced))
+            endpoint, _ = active_tpl
+            campaign.append((endpoint, _user_template(endpoint, address, batch_id)))
 
     # 4. addStatusTx (n times)
     if n_add_status_tx:
         for _ in range(n_add_status_tx):
-            endpoint, payload = status_tpl
-            replaced = _replace_placeholders(copy.deepcopy(payload), address, batch_id)
-            campaign.append((endpoint, replaced))
+            endpoint, _ = status_tpl
+            campaign.append((endpoint, _user_template(endpoint, address, batch_id)))
 
     return campaign
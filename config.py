@@ -15,7 +15,8 @@ HOST = os.getenv("API_URL", "http://localhost:3000")
 
 TYPE = ["cartesian", "paired"]
 CONTRACT = ["erc721", "erc1155", "both"]
-RUN = ["static", "ramp-up", "both"]
+RUN = ["static", "ramp-up", "both", "arrival-rate", "profile", "corpus"]
+ARRIVAL_DISTRIBUTIONS = ["constant", "poisson"]
 
 DURATION = [10]
 USERS = [10]
@@ -23,6 +24,8 @@ STEP_USERS = [1]
 INTERVAL_USERS = [1]
 INTERVAL_REQUEST = 1
 REPEAT = 1
+ARRIVAL_RATE = 10
+EXPECTED_INTERVAL = 0
 
 WARMUP_USERS = 10
 WARMUP_DURATION = 10
@@ -30,6 +33,50 @@ WARMUP_STEP_USERS = 1
 WARMUP_INTERVAL_USERS = 1
 WARMUP_INTERVAL_REQUESTS = 1
 
+# Load generation processes
+WORKERS = 1
+
+# Distributed mode (coordinator/worker over ZeroMQ)
+ROLES = ["standalone", "coordinator", "worker"]
+COORDINATOR_BIND = "tcp://127.0.0.1:5555"
+COORDINATOR_CONNECT = os.getenv("COORDINATOR_URL", "tcp://127.0.0.1:5555")
+EXPECTED_WORKERS = 1
+
+# Shared secret of the coordinator and its workers: authenticates every message
+# (HMAC) and encrypts the wallet keys handed to the workers. Environment only.
+COORDINATOR_SECRET = os.getenv("COORDINATOR_SECRET")
+
+# PBKDF2 rounds of the wallet keystores sent to the workers (one decryption per user)
+WORKER_KEY_ITERATIONS = 10_000
+
+# Seconds a worker waits for the phase start (or the next message) before giving up
+WORKER_START_TIMEOUT = 300
+
+# Raw results destination ("memory" keeps all rows in RAM until the phase ends)
+RESULT_SINKS = ["memory", "csv", "records"]
+
+# Live metrics (timeseries.csv) interval in seconds, 0 disables it
+REPORT_INTERVAL = 5
+
+# Event loop monitor (loop.csv): sampling interval in seconds (0 disables it), row window,
+# and when a window (and a phase) counts as a saturated load generator
+LOOP_MONITOR_INTERVAL = 0.1
+LOOP_MONITOR_WINDOW = 1.0
+LOOP_LAG_THRESHOLD_MS = 50
+LOOP_CPU_THRESHOLD = 0.9
+LOOP_SATURATED_FRACTION = 0.1
+
+# Event loop implementation of the load generator ("uvloop" needs `pip install uvloop`)
+LOOP_BACKENDS = ["asyncio", "uvloop"]
+
+# Persistent wallet pool (reused across runs, topped up below WALLET_MIN_BALANCE ETH)
+WALLET_POOL_FILE = os.getenv("WALLET_POOL_FILE", "wallets/wallet_pool.json")
+WALLET_MIN_BALANCE = 1
+
+# HTTP connection pool
+CONNECTOR_LIMIT = 100
+CONNECTOR_LIMIT_PER_HOST = 0
+
 # Wallets
 # MNEMONIC = os.getenv("MNEMONIC")
 # WALLETS_DIR = "wallets"
@@ -55,4 +102,37 @@ ARGS_FILENAME = "args.json"
 TIMEOUT_BLOCKCHAIN = 120
 TIMEOUT_API = 120
 
-AMOUNT_ETH = 5
\ No newline at end of file
+AMOUNT_ETH = 5
+
+# Transaction signing: "inline" (event loop), "thread" pool or "process" pool
+# (SIGNER_WORKERS = 1 with "process" is a dedicated signer process)
+SIGNER_MODES = ["inline", "thread", "process"]
+SIGNER_WORKERS = 2
+
+# Transactions each user keeps awaiting their receipt (1 = wait for every receipt)
+MAX_IN_FLIGHT_TX = 1
+
+# What TaskAPI does with a response body: "discard" (read and dropped),
+# "light" (check it is a JSON object/array) or "full" (decode, with orjson when installed).
+# API-TX-BUILD bodies are the transactions to send, so they are always decoded.
+RESPONSE_POLICIES = ["discard", "light", "full"]
+READ_ONLY_RESPONSE = "full"
+
+# Concurrent eth_call replays when resolving revert reasons after a phase
+REVERT_CONCURRENCY = 10
+
+# Pre-signed transactions of a corpus run (0 = arrival rate * duration)
+CORPUS_SIZE = 0
+
+# Transfers submitted at once by the pipelined wallet funder
+FUNDING_WINDOW = 20
+
+# Stand-in servers of the self-benchmark (standin.py / --self-benchmark)
+STANDIN_API_PORT = 3900
+STANDIN_RPC_PORT = 8945
+STANDIN_BLOCK_TIME = 1.0
+STANDIN_CHAIN_ID = 1337
+SELF_BENCHMARK_WORKERS = [1, 2]
+SELF_BENCHMARK_USERS = 50
+SELF_BENCHMARK_DURATION = 10
+SELF_BENCHMARK_LATENCY = "constant:10"
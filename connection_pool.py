@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import aiohttp
+
+# Internal imports
+from event_loop import new_event_loop
+
+
+class SharedConnectionPool:
+    """
+    One aiohttp TCPConnector shared by every virtual user (Async).
+
+    aiohttp binds a connector to the event loop that created it, so the pool
+    owns a long-lived loop and every phase must run through `run()` instead of
+    `asyncio.run()`. Users get lightweight `ClientSession` views over the shared
+    connector, which keeps keep-alive sockets open across users, phases and
+    repetitions.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: float = 10.0,
+        force_close: bool = False,
+        loop_backend: str = "asyncio"
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.force_close = force_close
+
+        self.loop = new_event_loop(loop_backend)
+        self.connector = None
+
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        """Creates the connector lazily, inside the pool loop."""
+        if self.connector is None or self.connector.closed:
+            self.connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+                force_close=self.force_close
+            )
+            logging.info(
+                f"[Pool] Shared connector created "
+                f"(limit={self.limit}, limit_per_host={self.limit_per_host})"
+            )
+        return self.connector
+
+    def session(self, trace_configs: list = None) -> aiohttp.ClientSession:
+        """Returns a session view that does not own (nor close) the shared connector."""
+        return aiohttp.ClientSession(connector=self._get_connector(), connector_owner=False, trace_configs=trace_configs)
+
+    def run(self, coro):
+        """Runs a coroutine to completion on the pool loop."""
+        asyncio.set_event_loop(self.loop)
+        return self.loop.run_until_complete(coro)
+
+    def close(self):
+        """Closes the shared connector and the pool loop."""
+        if self.loop.is_closed():
+            return
+
+        if self.connector is not None and not self.connector.closed:
+            self.loop.run_until_complete(self.connector.close())
+
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        logging.info("[Pool] Shared connector closed")
@@ -0,0 +1,147 @@
+import os
+import uuid
+import logging
+import asyncio
+
+import numpy as np
+
+# Internal imports
+import campaigns
+from wallet.config import get_async_w3
+from wallet.signer import get_signer
+
+
+def corpus_path(output_file: str) -> str:
+    """Path of the corpus saved next to an out*.csv file (out_rep-1.csv -> corpus_rep-1.npz)."""
+    directory, filename = os.path.split(output_file)
+    name = os.path.splitext(filename)[0].replace("out", "corpus", 1)
+    return os.path.join(directory, f"{name}.npz")
+
+
+class TxCorpus:
+    """
+    Pre-signed transactions replayed by the corpus run.
+
+    Entries are kept in firing order (round-robin over the users, each user's
+    nonces ascending), so replaying them in sequence never sends a nonce
+    before the previous one of the same wallet. The corpus is saved next to
+    out.csv as an .npz record of what was fired: the signed transactions
+    concatenated in one byte array plus offsets, their hashes, users, nonces
+    and interned endpoints. It is not replayed again, since its nonces are
+    spent by the run.
+    """
+
+    def __init__(self, entries: list = None):
+        # Each entry: {"user_id", "nonce", "endpoint", "raw", "hash"}
+        self.entries = entries or []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @staticmethod
+    def _interleave(per_user: list) -> list:
+        """One transaction of each user at a time, in nonce order."""
+        entries = []
+        for index in range(max((len(user_entries) for user_entries in per_user), default=0)):
+            for user_entries in per_user:
+                if index < len(user_entries):
+                    entries.append(user_entries[index])
+        return entries
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        endpoints = list(dict.fromkeys(entry["endpoint"] for entry in self.entries))
+        codes = {endpoint: code for code, endpoint in enumerate(endpoints)}
+        raws = [entry["raw"] for entry in self.entries]
+
+        np.savez_compressed(
+            path,
+            user_id=np.array([entry["user_id"] for entry in self.entries], dtype=np.int64),
+            nonce=np.array([entry["nonce"] for entry in self.entries], dtype=np.int64),
+            endpoint=np.array([codes[entry["endpoint"]] for entry in self.entries], dtype=np.int32),
+            endpoint_values=np.asarray(endpoints, dtype=str),
+            offsets=np.cumsum([0] + [len(raw) for raw in raws], dtype=np.int64),
+            raw=np.frombuffer(b"".join(raws), dtype=np.uint8),
+            hash=np.frombuffer(b"".join(entry["hash"] for entry in self.entries), dtype=np.uint8).reshape(-1, 32),
+        )
+
+
+async def _build_user_corpus(user, session, count: int) -> list:
+    """Signs `count` mint transactions of one user with consecutive nonces from its pending nonce (Async)."""
+    async_w3 = get_async_w3()
+    signer = get_signer()
+
+    endpoint, _ = campaigns.build_campaign_sequential(
+        contract=user.contract,
+        address=user.wallet.address,
+        batch_id=user.batch_id
+    )[0]
+    # <BATCH_ID> left open: every mint gets its own batch, like a fresh user sequence would
+    template = campaigns.TEMPLATES[endpoint].bind({"<FROM>": user.wallet.address, "<TO>": user.wallet.address})
+
+    base_nonce = await async_w3.eth.get_transaction_count(user.wallet.address, "pending")
+    entries = []
+
+    for index in range(count):
+        result, tx_obj = await user.task_api.run_request(
+            session=session,
+            endpoint=endpoint,
+            body=template.render({"<BATCH_ID>": f"LOTE-{uuid.uuid4()}"}),
+            task_type="API-TX-BUILD",
+            request_id=index + 1
+        )
+        if not tx_obj or result.get("status") != "success":
+            raise RuntimeError(f"[User-{user.user_id:03d}] Failed to get a tx body from {endpoint}")
+
+        nonce = base_nonce + index
+        tx = await user.wallet.build_transaction(tx_obj, nonce=nonce)
+        if not tx:
+            raise RuntimeError(f"[User-{user.user_id:03d}] Failed to build corpus transaction (nonce {nonce})")
+
+        if signer is None:
+            signed_tx = user.wallet.sign_transaction(tx)
+        else:
+            signed_tx, _ = await signer.sign(user.wallet, tx)
+
+        entries.append({
+            "user_id": user.user_id,
+            "nonce": nonce,
+            "endpoint": endpoint,
+            "raw": bytes(signed_tx.raw_transaction),
+            "hash": bytes(signed_tx.hash),
+        })
+
+    logging.info(f"\t[User-{user.user_id:03d}] {count} transactions signed (nonces {base_nonce}..{base_nonce + count - 1})")
+    return entries
+
+
+async def build_corpus(users: list, open_session, size: int) -> TxCorpus:
+    """
+    Builds a corpus of `size` signed mint transactions spread over `users` (Async).
+
+    The tx bodies come from the API mint endpoint of each user's contract
+    (`campaigns.erc721_tx_build` / `erc1155_tx_build`); every user builds its
+    share sequentially, users in parallel. `open_session(user)` sets up the
+    HTTP session of the user (closed here).
+    """
+    per_user = [size // len(users) + (1 if index < size % len(users) else 0) for index in range(len(users))]
+
+    async def build(user, count):
+        if count == 0:
+            return []
+        open_session(user)
+        try:
+            return await _build_user_corpus(user, user.session, count)
+        finally:
+            await user.session.close()
+
+    logging.info(f"[Corpus] Building {size} signed transactions for {len(users)} users...")
+    per_user_entries = await asyncio.gather(*(build(user, count) for user, count in zip(users, per_user)))
+
+    return TxCorpus(TxCorpus._interleave(per_user_entries))
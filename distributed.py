@@ -0,0 +1,274 @@
+import hmac
+import json
+import time
+import hashlib
+import logging
+import importlib
+import zmq
+from eth_account import Account
+
+# Internal imports
+from workers import run_shard, POLL_INTERVAL
+from histogram import HistogramSet
+from config import WORKER_KEY_ITERATIONS, WORKER_START_TIMEOUT
+
+# A shard that stays silent longer than its duration plus this margin is considered lost
+WORKER_SILENCE_TIMEOUT = 120
+
+_MAC_SIZE = hashlib.sha256().digest_size
+
+
+def encode_message(message, secret: bytes) -> bytes:
+    """JSON (kind, index, payload) frame prefixed with its HMAC-SHA256 under `secret`."""
+    body = json.dumps(message, separators=(",", ":")).encode()
+    return hmac.new(secret, body, hashlib.sha256).digest() + body
+
+
+def decode_message(frame: bytes, secret: bytes):
+    """(kind, index, payload) of a frame, or None when it is not signed with `secret`."""
+    mac, body = frame[:_MAC_SIZE], frame[_MAC_SIZE:]
+    if not hmac.compare_digest(mac, hmac.new(secret, body, hashlib.sha256).digest()):
+        return None
+    kind, index, payload = json.loads(body)
+    return kind, index, payload
+
+
+def pack_job(tester_kwargs: dict, secret: bytes) -> dict:
+    """
+    Shard LoadTester arguments as JSON: the user class by name and every
+    wallet key as an encrypted keystore (never the raw key on the wire).
+    """
+    kwargs = dict(tester_kwargs)
+    user_cls = kwargs["user_cls"]
+    kwargs["user_cls"] = f"{user_cls.__module__}:{user_cls.__qualname__}"
+    kwargs["user_specs"] = [
+        (user_id, Account.encrypt(private_key, secret.decode(), kdf="pbkdf2", iterations=WORKER_KEY_ITERATIONS), batch_id)
+        for user_id, private_key, batch_id in kwargs["user_specs"]
+    ]
+    return kwargs
+
+
+def unpack_job(kwargs: dict, secret: bytes) -> dict:
+    """Inverse of `pack_job()`; user classes are only loaded from the `users` package."""
+    kwargs = dict(kwargs)
+    module, name = kwargs["user_cls"].split(":")
+    if module.split(".")[0] != "users":
+        raise ValueError(f"Refusing user class outside the users package: {kwargs['user_cls']}")
+    kwargs["user_cls"] = getattr(importlib.import_module(module), name)
+    kwargs["user_specs"] = [
+        (user_id, Account.decrypt(keystore, secret.decode()).hex(), batch_id)
+        for user_id, keystore, batch_id in kwargs["user_specs"]
+    ]
+    return kwargs
+
+
+class _SocketChannel:
+    """Adapts a ZeroMQ DEALER socket to the `put(message)` interface used by run_shard."""
+
+    def __init__(self, socket, secret: bytes):
+        self.socket = socket
+        self.secret = secret
+
+    def put(self, message):
+        kind, index, payload = message
+        # Histograms travel as plain lists, rebuilt by the coordinator
+        if kind == "done" and payload.get("histograms") is not None:
+            payload = {**payload, "histograms": payload["histograms"].to_list()}
+        self.socket.send(encode_message((kind, index, payload), self.secret))
+
+
+class Coordinator:
+    """
+    Distributes user shards to remote workers and collects their results (ZeroMQ ROUTER).
+
+    The coordinator keeps the run plan and the wallets (users are created,
+    authorized and funded locally, as in the multi-process mode); workers only
+    receive the LoadTester arguments of their shard. It implements the same
+    `run_sharded` interface as `workers.run_sharded`, so `LoadTester` and the
+    usual `results/<timestamp>/...` layout are unchanged.
+
+    Every message is JSON signed with the shared `secret` (COORDINATOR_SECRET):
+    frames from peers that do not hold it are dropped, and the wallet keys of
+    a shard are sent as keystores encrypted with it.
+    """
+
+    def __init__(self, bind: str, expected_workers: int, secret: str):
+        self.bind = bind
+        self.expected_workers = expected_workers
+        self.secret = secret.encode()
+
+        self.context = zmq.Context.instance()
+        self.socket = self.context.socket(zmq.ROUTER)
+        self.socket.bind(bind)
+
+        self.worker_ids = []
+
+    @property
+    def worker_count(self):
+        return len(self.worker_ids)
+
+    def _send(self, identity, message):
+        self.socket.send_multipart([identity, encode_message(message, self.secret)])
+
+    def _recv(self, timeout: float):
+        """Returns (identity, message) or None when nothing valid arrives within `timeout` seconds."""
+        if not self.socket.poll(int(timeout * 1000)):
+            return None
+
+        frames = self.socket.recv_multipart()
+        message = decode_message(frames[-1], self.secret) if len(frames) == 2 else None
+        if message is None:
+            logging.warning("[Coordinator] Dropped a message not signed with the coordinator secret")
+            return None
+        return frames[0], message
+
+    def wait_for_workers(self):
+        """Blocks until `expected_workers` workers have connected."""
+        logging.info(f"[Coordinator] Listening on {self.bind}, waiting for {self.expected_workers} workers...")
+
+        while self.worker_count < self.expected_workers:
+            received = self._recv(POLL_INTERVAL)
+            if received is None:
+                continue
+
+            identity, (kind, _, payload) = received
+            if kind == "hello" and identity not in self.worker_ids:
+                self.worker_ids.append(identity)
+                logging.info(f"[Coordinator] Worker {self.worker_count}/{self.expected_workers} connected ({payload})")
+
+        logging.info("")
+
+    def run_sharded(self, shard_kwargs: list, run_method: str, phase: str, results):
+        """
+        Runs one shard per remote worker, with a common phase start barrier.
+
+        Results are appended to `results` as they arrive. Returns the per-shard
+        summaries and the elapsed time measured from the start barrier.
+        """
+        workers = self.worker_ids[:len(shard_kwargs)]
+
+        for index, (identity, kwargs) in enumerate(zip(workers, shard_kwargs)):
+            job = {"tester_kwargs": pack_job(kwargs, self.secret), "run_method": run_method, "phase": phase}
+            self._send(identity, ("job", index, job))
+
+        pending = set(range(len(workers)))
+        not_ready = set(pending)
+        summaries = []
+        start_time = time.perf_counter()
+        started = False
+        last_seen = {index: time.perf_counter() for index in pending}
+        silence_timeout = max(kwargs["duration"] for kwargs in shard_kwargs) + WORKER_SILENCE_TIMEOUT
+
+        while pending:
+            received = self._recv(POLL_INTERVAL)
+
+            if received is None:
+                now = time.perf_counter()
+                for index in list(pending):
+                    if now - last_seen[index] > silence_timeout:
+                        logging.error(f"[Coordinator] Worker-{index:02d} silent for {silence_timeout:.0f}s, giving up on it")
+                        pending.discard(index)
+                        not_ready.discard(index)
+            else:
+                identity, (kind, index, payload) = received
+                # Only the worker the shard was handed to reports on it
+                if index not in last_seen or identity != workers[index]:
+                    continue
+                last_seen[index] = time.perf_counter()
+
+                if kind == "ready":
+                    not_ready.discard(index)
+                elif kind == "results":
+                    for result in payload:
+                        results.append(result)
+                elif kind == "done":
+                    if payload.get("histograms") is not None:
+                        payload["histograms"] = HistogramSet.from_list(payload["histograms"])
+                    summaries.append(payload)
+                    pending.discard(index)
+                elif kind == "error":
+                    logging.error(f"[Coordinator] Worker-{index:02d} failed: {payload}")
+                    pending.discard(index)
+                    not_ready.discard(index)
+
+            if not not_ready and not started:
+                logging.info(f"[Coordinator] All workers ready, starting phase {phase}")
+                started = True
+                start_time = time.perf_counter()
+                for index in pending:
+                    self._send(workers[index], ("start", index, None))
+
+        total_time = round(time.perf_counter() - start_time, 2)
+        return summaries, total_time
+
+    def close(self):
+        """Tells every worker to exit and releases the socket."""
+        for identity in self.worker_ids:
+            self._send(identity, ("stop", None, None))
+
+        self.socket.close(linger=1000)
+        logging.info("[Coordinator] Workers released")
+
+
+def run_worker(connect: str, secret: str, name: str = None):
+    """
+    Connects to a coordinator and runs the shards it hands out until told to stop.
+
+    Each shard runs in this process (own event loop and sessions); results are
+    streamed back to the coordinator through the same socket.
+    """
+    secret = secret.encode()
+    context = zmq.Context.instance()
+    socket = context.socket(zmq.DEALER)
+    socket.connect(connect)
+    channel = _SocketChannel(socket, secret)
+
+    channel.put(("hello", None, name))
+    logging.info(f"[Worker] Connected to coordinator at {connect}")
+
+    def receive(timeout: float = None):
+        """Next message signed by the coordinator, None after `timeout` seconds without one."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            remaining = None if deadline is None else max(0, int((deadline - time.monotonic()) * 1000))
+            if not socket.poll(remaining):
+                return None
+            message = decode_message(socket.recv(), secret)
+            if message is not None:
+                return message
+            logging.warning("[Worker] Dropped a message not signed with the coordinator secret")
+
+    def wait_for_start():
+        message = receive(WORKER_START_TIMEOUT)
+        if message is None:
+            logging.error(f"[Worker] No phase start from the coordinator within {WORKER_START_TIMEOUT}s, dropping the shard")
+            return False
+        return message[0] == "start"
+
+    try:
+        while True:
+            kind, index, payload = receive()
+
+            if kind == "stop":
+                logging.info("[Worker] Stop received from coordinator")
+                break
+
+            if kind == "job":
+                logging.info(f"[Worker] Shard {index} received: {payload['run_method']} / {payload['phase']}")
+                try:
+                    tester_kwargs = unpack_job(payload["tester_kwargs"], secret)
+                except Exception as e:
+                    logging.error(f"[Worker] Invalid shard {index}: {type(e).__name__}: {e}")
+                    channel.put(("error", index, f"{type(e).__name__}: {e}"))
+                    continue
+
+                run_shard(
+                    worker_index=index,
+                    tester_kwargs=tester_kwargs,
+                    run_method=payload["run_method"],
+                    phase=payload["phase"],
+                    channel=channel,
+                    wait_for_start=wait_for_start
+                )
+    finally:
+        socket.close(linger=1000)
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+
+# Internal imports
+from config import LOOP_BACKENDS
+
+
+def _uvloop():
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop
+
+
+def available_backends() -> list:
+    """Loop backends that can run here (uvloop only when installed)."""
+    return [backend for backend in LOOP_BACKENDS if backend != "uvloop" or _uvloop() is not None]
+
+
+def resolve_backend(backend: str) -> str:
+    """The backend that will actually run: "uvloop" falls back to "asyncio" when not installed."""
+    if backend not in LOOP_BACKENDS:
+        raise ValueError(f"Unknown loop backend: {backend} (expected one of {LOOP_BACKENDS})")
+
+    if backend == "uvloop" and _uvloop() is None:
+        logging.warning("[Loop] uvloop is not installed (pip install uvloop), using the default asyncio loop")
+        return "asyncio"
+    return backend
+
+
+def new_event_loop(backend: str = "asyncio") -> asyncio.AbstractEventLoop:
+    """Creates an event loop of the given backend (the default selector loop for "asyncio")."""
+    if resolve_backend(backend) == "uvloop":
+        return _uvloop().new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def run(coro, backend: str = "asyncio"):
+    """`asyncio.run()` on a fresh loop of the given backend (works before Python 3.11)."""
+    if resolve_backend(backend) != "uvloop":
+        return asyncio.run(coro)
+
+    uvloop = _uvloop()
+    if hasattr(uvloop, "run"):
+        return uvloop.run(coro)
+
+    # Older uvloop releases: install its policy for the duration of the run
+    previous = asyncio.get_event_loop_policy()
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    try:
+        return asyncio.run(coro)
+    finally:
+        asyncio.set_event_loop_policy(previous)
@@ -0,0 +1,188 @@
+import json
+import math
+
+# Values are recorded in integer microseconds
+UNITS_PER_SECOND = 1_000_000
+
+# Log-linear buckets: 2^(SUB_BUCKET_BITS - 1) linear sub-buckets per power of two,
+# i.e. a relative error below 1 / 2^(SUB_BUCKET_BITS - 1) (~0.8% with 8 bits)
+SUB_BUCKET_BITS = 8
+_SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+_SUB_BUCKET_HALF_BITS = SUB_BUCKET_BITS - 1
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << _SUB_BUCKET_HALF_BITS) + (value >> shift)
+
+
+def _bucket_range(index: int):
+    """Lowest and highest value (inclusive) that fall in bucket `index`."""
+    if index < _SUB_BUCKET_COUNT:
+        return index, index
+    shift = (index >> _SUB_BUCKET_HALF_BITS) - 1
+    mantissa = index - (shift << _SUB_BUCKET_HALF_BITS)
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear latency histogram (seconds in, seconds out).
+
+    Memory is bounded by the number of buckets, not by the number of samples,
+    and two histograms merge by adding their bucket counts, so per-user,
+    per-process and per-repetition histograms combine without losing accuracy.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        value = int(seconds * UNITS_PER_SECOND)
+        index = _bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def percentile(self, q: float) -> float:
+        """Value (seconds) at quantile `q` (0-1), within the bucket resolution."""
+        if not self.count:
+            return math.nan
+
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = _bucket_range(index)
+                value = (low + high) / 2 / UNITS_PER_SECOND
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def copy(self):
+        return LatencyHistogram().merge(self)
+
+    def to_dict(self):
+        return {
+            "counts": self.counts,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"] if data["min"] is not None else math.inf
+        histogram.max = data["max"]
+        return histogram
+
+
+class HistogramSet:
+    """Latency histograms keyed by (task, endpoint, status), fed with result dicts."""
+
+    def __init__(self):
+        self.histograms = {}
+
+    def __len__(self):
+        return sum(histogram.count for histogram in self.histograms.values())
+
+    def record(self, result: dict):
+        duration = result.get("duration")
+        if not isinstance(duration, (int, float)) or duration < 0:
+            return
+
+        key = (str(result.get("task")), str(result.get("endpoint")), str(result.get("status")))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = LatencyHistogram()
+        histogram.record(duration)
+
+    def merge(self, other: "HistogramSet"):
+        for key, histogram in other.histograms.items():
+            if key in self.histograms:
+                self.histograms[key].merge(histogram)
+            else:
+                self.histograms[key] = histogram.copy()
+        return self
+
+    def snapshot(self):
+        """Independent copy of the current state (safe to keep while recording goes on)."""
+        return HistogramSet().merge(self)
+
+    def combined(self, by=("task",)):
+        """Merges the histograms over the dimensions not listed in `by`."""
+        positions = {"task": 0, "endpoint": 1, "status": 2}
+        result = {}
+        for key, histogram in self.histograms.items():
+            group = tuple(key[positions[dim]] for dim in by)
+            if group in result:
+                result[group].merge(histogram)
+            else:
+                result[group] = histogram.copy()
+        return result
+
+    def summary(self, percentiles=(.5, .9, .99), by=("task", "endpoint", "status")):
+        """One row per group: count, mean, min, max and the requested percentiles."""
+        rows = []
+        for group, histogram in sorted(self.combined(by).items()):
+            row = dict(zip(by, group))
+            row.update({
+                "count": histogram.count,
+                "mean": histogram.mean,
+                "min": histogram.min,
+                "max": histogram.max,
+            })
+            for p in percentiles:
+                row[f"p{int(p * 100)}"] = histogram.percentile(p)
+            rows.append(row)
+        return rows
+
+    def to_list(self):
+        """JSON-friendly form: one entry per (task, endpoint, status) histogram."""
+        return [
+            {"task": task, "endpoint": endpoint, "status": status, **histogram.to_dict()}
+            for (task, endpoint, status), histogram in self.histograms.items()
+        ]
+
+    @classmethod
+    def from_list(cls, data: list):
+        histograms = cls()
+        for entry in data:
+            key = (entry["task"], entry["endpoint"], entry["status"])
+            histograms.histograms[key] = LatencyHistogram.from_dict(entry)
+        return histograms
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_list(), f)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path) as f:
+            return cls.from_list(json.load(f))
@@ -0,0 +1,66 @@
+import time
+import aiohttp
+
+# Internal imports
+from sinks import HTTP_TIMING_FIELDS
+
+
+def _mark(name: str):
+    """Trace handler that stamps `name` into the request's marks dict (`trace_request_ctx`)."""
+    async def handler(session, context, params):
+        marks = context.trace_request_ctx
+        if marks is not None:
+            marks[name] = time.perf_counter()
+    return handler
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """
+    aiohttp tracing of the phases of every request of a session.
+
+    Each request passes a dict as `trace_request_ctx`; the handlers stamp in it
+    when the request waited for a free connection of the pool, resolved the
+    host, opened the connection, sent its headers and got the response
+    headers. `http_timings()` turns the stamps into the out.csv columns.
+    """
+    config = aiohttp.TraceConfig()
+    config.on_connection_queued_start.append(_mark("queued_start"))
+    config.on_connection_queued_end.append(_mark("queued_end"))
+    config.on_connection_create_start.append(_mark("create_start"))
+    config.on_connection_create_end.append(_mark("create_end"))
+    config.on_dns_resolvehost_start.append(_mark("dns_start"))
+    config.on_dns_resolvehost_end.append(_mark("dns_end"))
+    config.on_request_headers_sent.append(_mark("headers_sent"))
+    config.on_request_end.append(_mark("headers_received"))
+    return config
+
+
+def _span(marks: dict, start: str, end: str) -> float:
+    if start in marks and end in marks:
+        return marks[end] - marks[start]
+    return 0.0
+
+
+def http_timings(marks: dict, body_end: float) -> dict:
+    """
+    Phases (seconds) of one traced request, keyed by HTTP_TIMING_FIELDS.
+
+    pool_wait: queued for a free connection of the connector (limit reached)
+    dns / connect: host resolution and TCP (+TLS) connect, 0 on a reused connection
+    ttfb: headers sent -> response headers, the part spent on the network and the API
+    transfer: response headers -> body read (body policy of TaskAPI included)
+    Empty when the session was not traced.
+    """
+    if "headers_received" not in marks:
+        return {}
+
+    dns = _span(marks, "dns_start", "dns_end")
+    timings = (
+        _span(marks, "queued_start", "queued_end"),
+        dns,
+        # DNS resolution runs inside the connection creation
+        max(_span(marks, "create_start", "create_end") - dns, 0.0),
+        _span(marks, "headers_sent", "headers_received"),
+        body_end - marks["headers_received"],
+    )
+    return {field: round(value, 6) for field, value in zip(HTTP_TIMING_FIELDS, timings)}
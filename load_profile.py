@@ -0,0 +1,169 @@
+import json
+import math
+import os
+
+# Stage shapes (see LoadProfile.target_at)
+PROFILE_SHAPES = ["ramp", "step", "hold", "spike", "sine"]
+
+# What the stage targets drive: concurrent virtual users or request starts per second
+PROFILE_UNITS = ["users", "rps"]
+
+# Resolution (seconds) of the profile controller
+PROFILE_TICK = 0.5
+
+
+class Stage:
+    """One stage of a load profile: reach `target` over `duration` seconds with a given shape."""
+
+    def __init__(self, duration: float, target: float = None, shape: str = "ramp", period: float = None):
+        if shape not in PROFILE_SHAPES:
+            raise ValueError(f"Invalid stage shape '{shape}' (expected one of {PROFILE_SHAPES})")
+        if duration <= 0:
+            raise ValueError(f"Stage duration must be positive, got {duration}")
+        if target is None and shape != "hold":
+            raise ValueError(f"Stage '{shape}' needs a target")
+        if target is not None and target < 0:
+            raise ValueError(f"Stage target must not be negative, got {target}")
+
+        self.duration = float(duration)
+        self.target = float(target) if target is not None else None
+        self.shape = shape
+        self.period = float(period) if period else self.duration
+
+    def value(self, base: float, t: float) -> float:
+        """Target `t` seconds into the stage, starting from the level `base`."""
+        if self.shape == "ramp":
+            return base + (self.target - base) * min(1.0, t / self.duration)
+        if self.shape == "hold":
+            return base
+        if self.shape == "sine":
+            # Oscillates between base and target, starting (and ending, with a whole period) at base
+            return base + (self.target - base) * (1 - math.cos(2 * math.pi * t / self.period)) / 2
+        # step / spike
+        return self.target
+
+    def end_level(self, base: float) -> float:
+        """Level the next stage starts from: spikes and sine waves return to the base."""
+        if self.shape in ("ramp", "step"):
+            return self.target
+        return base
+
+    def to_dict(self):
+        data = {"duration": self.duration, "target": self.target, "shape": self.shape}
+        if self.shape == "sine":
+            data["period"] = self.period
+        return data
+
+
+class LoadProfile:
+    """
+    Declarative load shape: a list of stages over users or RPS.
+
+    Stage shapes, relative to the level left by the previous stage:
+
+    - ramp: linear change up to `target` over the stage
+    - step: jump to `target` and keep it
+    - hold: keep the current level (`target` is ignored)
+    - spike: `target` during the stage, then back to the previous level
+    - sine: oscillate between the previous level and `target` every `period` seconds
+
+    Profiles are read from JSON files:
+
+        {
+            "name": "morning-spike",
+            "unit": "users",
+            "stages": [
+                {"duration": 60, "target": 10, "shape": "ramp"},
+                {"duration": 30, "target": 50, "shape": "spike"},
+                {"duration": 120, "target": 20, "shape": "sine", "period": 60},
+                {"duration": 30, "target": 0, "shape": "ramp"}
+            ]
+        }
+    """
+
+    def __init__(self, stages: list, unit: str = "users", name: str = "profile", start: float = 0):
+        if unit not in PROFILE_UNITS:
+            raise ValueError(f"Invalid profile unit '{unit}' (expected one of {PROFILE_UNITS})")
+        if not stages:
+            raise ValueError("A load profile needs at least one stage")
+
+        self.stages = stages
+        self.unit = unit
+        self.name = name
+        self.start = float(start)
+
+    @property
+    def duration(self) -> float:
+        return sum(stage.duration for stage in self.stages)
+
+    def _segments(self):
+        """Yields (stage, base level, stage start time)."""
+        level, offset = self.start, 0.0
+        for stage in self.stages:
+            yield stage, level, offset
+            level = stage.end_level(level)
+            offset += stage.duration
+
+    def target_at(self, elapsed: float) -> float:
+        """Target (users or req/s) `elapsed` seconds into the profile (0 once it is over)."""
+        for stage, base, offset in self._segments():
+            if elapsed < offset + stage.duration:
+                return stage.value(base, max(0.0, elapsed - offset))
+        return 0.0
+
+    @property
+    def max_target(self) -> float:
+        """Upper bound of the profile targets (e.g. how many users to create)."""
+        return max([self.start] + [stage.target for stage in self.stages if stage.target is not None])
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "unit": self.unit,
+            "start": self.start,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, name: str = None):
+        stages = [
+            Stage(
+                duration=stage["duration"],
+                target=stage.get("target"),
+                shape=stage.get("shape", "ramp"),
+                period=stage.get("period")
+            )
+            for stage in data.get("stages", [])
+        ]
+        return cls(
+            stages=stages,
+            unit=data.get("unit", "users"),
+            name=data.get("name", name or "profile"),
+            start=data.get("start", 0)
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        """Reads a profile from a JSON file (the file name is the default profile name)."""
+        with open(path) as f:
+            data = json.load(f)
+        return cls.from_dict(data, name=os.path.splitext(os.path.basename(path))[0])
+
+    @classmethod
+    def ramp_up(cls, users: int, step_users: int, interval_users: float, duration: float):
+        """
+        The classic ramp-up: `step_users` more users every `interval_users`
+        seconds, then every user running until the last group has run for
+        `duration` seconds (same window as before, but all users stop together).
+        """
+        step_users = max(1, step_users or users)
+        steps = int(math.ceil(users / step_users))
+
+        # No interval between the groups: they all start at once (zero-length steps are skipped)
+        stages = [
+            Stage(duration=interval_users, target=min(users, step * step_users), shape="step")
+            for step in range(1, steps)
+        ] if interval_users and interval_users > 0 else []
+        stages.append(Stage(duration=duration, target=users, shape="step"))
+
+        return cls(stages=stages, unit="users", name="ramp-up")
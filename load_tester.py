@@ -1,6 +1,7 @@
 import csv
 import os
 import json
+import math
 import time
 import random
 import logging
@@ -11,11 +12,25 @@ from typing import List, Dict, Type
 
 # Internal imports
 import log
-from wallet.admin import fund_wallet, fund_wallets_batch
+from wallet.admin import fund_wallet, fund_wallets_batch, fund_wallets_pipelined
 from users.user import User
-from config import TIMEOUT_BLOCKCHAIN, AMOUNT_ETH
-from wallet.config import get_w3, check_connection
+from config import TIMEOUT_BLOCKCHAIN, AMOUNT_ETH, WALLET_MIN_BALANCE, MAX_IN_FLIGHT_TX, LOOP_MONITOR_INTERVAL, READ_ONLY_RESPONSE
+from wallet.config import get_w3, get_async_w3, get_chain_id, check_connection
+from wallet.pool import WalletPool, authorization_scope
+from wallet.signer import configure_signer
+from wallet.receipts import ReceiptTracker
+from wallet.reverts import RevertLog, resolve_revert_reasons
 from stats import Stats
+from connection_pool import SharedConnectionPool
+from workers import run_sharded
+from sinks import SINKS
+from histogram import HistogramSet
+from reporter import MetricsReporter, ReportedResults, timeseries_path
+from load_profile import LoadProfile, PROFILE_TICK
+from corpus import build_corpus, corpus_path
+from loop_monitor import LoopMonitor, summarize_windows
+from event_loop import resolve_backend, run as run_on_loop
+from http_trace import trace_config
 
 class LoadTester:
     """Performs HTTP load tests simulating multiple users (Async core)."""
@@ -37,7 +52,61 @@ class LoadTester:
         connector_limit_per_host: int = 0,
         connector_keepalive_timeout: float = 15.0,
         connector_ttl_dns_cache: float = 10.0,
-        connector_force_close: bool = False
+        connector_force_close: bool = False,
+
+        # Shared connection pool (one connector for all users)
+        shared_connector: bool = False,
+        connection_pool: SharedConnectionPool = None,
+
+        # Open model (arrival-rate run)
+        arrival_rate: float = None,
+        arrival_distribution: str = "constant",
+
+        # Coordinated-omission correction for the closed-loop runs
+        expected_interval: float = None,
+
+        # Multi-process load generation
+        workers: int = 1,
+        user_specs: list = None,
+        prepare_wallets: bool = True,
+
+        # Distributed mode (remote workers behind a distributed.Coordinator)
+        coordinator=None,
+
+        # Where phase results go: "memory" (list saved at the end) or a key of sinks.SINKS
+        result_sink: str = "memory",
+
+        # Interval (seconds) of the live timeseries.csv (None/0 disables it)
+        report_interval: float = None,
+
+        # Event loop lag/CPU sampling interval (seconds) of loop.csv (None/0 disables it)
+        loop_monitor_interval: float = LOOP_MONITOR_INTERVAL,
+
+        # Event loop implementation of the phases ("asyncio" or "uvloop")
+        loop_backend: str = "asyncio",
+
+        # Declarative load shape (profile run)
+        profile: LoadProfile = None,
+
+        # Persistent funded wallets (reused instead of fresh wallets per run)
+        wallet_pool: WalletPool = None,
+        min_balance: float = WALLET_MIN_BALANCE,
+
+        # Transaction signing off the event loop ("inline", "thread" or "process")
+        signer: str = "inline",
+        signer_workers: int = 2,
+
+        # Transactions per user awaiting their receipt while the next steps run
+        max_in_flight_tx: int = MAX_IN_FLIGHT_TX,
+
+        # What is done with API-READ-ONLY response bodies ("discard", "light" or "full")
+        read_only_response: str = READ_ONLY_RESPONSE,
+
+        # Per-request HTTP timing breakdown (pool wait, DNS, connect, TTFB, transfer) via aiohttp tracing
+        http_trace: bool = False,
+
+        # Pre-signed corpus run (size None = arrival_rate * duration)
+        corpus_size: int = None
     ):
         if not issubclass(user_cls, User):
             raise TypeError(f"{user_cls.__name__} must inherit from User")
@@ -51,11 +120,48 @@ class LoadTester:
         self.duration = duration
 
         self.interval_requests = interval_requests
-        self.users = self._create_users(amount_users=users)
+        self.max_in_flight_tx = max_in_flight_tx
+        self.read_only_response = read_only_response
+        self.http_trace = http_trace
+        self._trace_configs = [trace_config()] if http_trace else None
+        self.wallet_pool = wallet_pool
+        self.min_balance = min_balance
+
+        if user_specs is None and wallet_pool is not None:
+            user_specs = wallet_pool.user_specs(users)
+        self.users = self._create_users(amount_users=users, user_specs=user_specs)
+        self._users_by_id = {user.user_id: user for user in self.users}
         self.number_users = len(self.users)
         self.step_users = step_users
         self.interval_users = interval_users
 
+        self.arrival_rate = arrival_rate
+        self.arrival_distribution = arrival_distribution
+        self.expected_interval = expected_interval
+        self.workers = max(1, min(workers, self.number_users))
+        self.coordinator = coordinator
+        self.result_sink = result_sink
+        self.report_interval = report_interval
+        self.loop_backend = resolve_backend(loop_backend)
+        self.loop_monitor = LoopMonitor(loop_monitor_interval) if loop_monitor_interval else None
+        self.profile = profile
+        self.corpus_size = corpus_size
+        self.signer = signer
+        self.signer_workers = signer_workers
+        self.reporter = None
+        self.in_flight = 0
+
+        # One block follower resolves the receipts of every user of this tester
+        self.receipt_tracker = None
+        self.revert_log = None
+        if self.mode == "api-blockchain":
+            configure_signer(signer, signer_workers)
+            self.receipt_tracker = ReceiptTracker()
+            self.revert_log = RevertLog()
+            for user in self.users:
+                user.wallet.receipt_tracker = self.receipt_tracker
+                user.wallet.revert_log = self.revert_log
+
         # Connector Config
         self.connector_limit = connector_limit
         self.connector_limit_per_host = connector_limit_per_host
@@ -63,20 +169,46 @@ class LoadTester:
         self.connector_ttl_dns_cache = connector_ttl_dns_cache
         self.connector_force_close = connector_force_close
 
-        if self.mode == "api-blockchain":
-            self._authorized_users()
-            self._fund_users()
+        # A pool passed in by the caller is reused (and closed) by the caller,
+        # so it can outlive this tester across phases, runs and repetitions.
+        self._owns_connection_pool = connection_pool is None and shared_connector
+        if self._owns_connection_pool:
+            connection_pool = SharedConnectionPool(
+                limit=connector_limit,
+                limit_per_host=connector_limit_per_host,
+                keepalive_timeout=connector_keepalive_timeout,
+                ttl_dns_cache=connector_ttl_dns_cache,
+                force_close=connector_force_close,
+                loop_backend=self.loop_backend
+            )
+        self.connection_pool = connection_pool
+
+        # Worker processes receive users that were already authorized and funded
+        if self.mode == "api-blockchain" and prepare_wallets:
+            if self.wallet_pool is not None:
+                self._prepare_pool_wallets()
+            else:
+                self._authorized_users()
+                self._fund_users()
 
         self.results_tx_build: List[Dict] = []
         self.results_read_only: List[Dict] = []
 
-    def _fund_users(self):
+        # Live latency histograms per phase, updated on every result
+        self.histograms = {
+            "api-tx-build": HistogramSet(),
+            "api-read-only": HistogramSet(),
+        }
+
+    def _fund_users(self, users=None):
+
+        users = self.users if users is None else users
                 
         # Collect all recipients for batch funding
-        recipients = [(user.user_id, user.wallet.address) for user in self.users]
+        recipients = [(user.user_id, user.wallet.address) for user in users]
         
-        # Use batch funding
-        results = fund_wallets_batch(
+        # Consecutive local nonces, receipts awaited per window
+        results = fund_wallets_pipelined(
             recipients=recipients,
             amount_eth=AMOUNT_ETH,
             gas_price_gwei=5,
@@ -95,7 +227,7 @@ class LoadTester:
         # We can skipping balance check here to avoid async complexity in Init
         # or use a sync call via w3 directly if needed. 
         # For now, listing addresses is enough.
-        for user in self.users:
+        for user in users:
             try:
                 w3 = get_w3()
                 balance_wei = w3.eth.get_balance(user.wallet.address)
@@ -112,16 +244,22 @@ class LoadTester:
                     f"Balance: Error ({e})"
                 )
 
+        return results
 
-    def _authorized_users(self):
+
+    def _authorized_users(self, users=None):
+        """Authorizes the users' addresses (all by default) for the contract. Returns True on success."""
+
+        users = self.users if users is None else users
+        authorized = False
 
         logging.info("-" * log.SIZE)
-        logging.info(f"Starting authorizing {self.number_users} users for contract...")
+        logging.info(f"Starting authorizing {len(users)} users for contract...")
         logging.info("")
 
         url = f"{self.host}/api/{self.contract}/admin/setAllowedAddressesBatch"
 
-        addresses = [user.wallet.address for user in self.users]
+        addresses = [user.wallet.address for user in users]
 
         payload = {
             "addresses": addresses,
@@ -131,7 +269,7 @@ class LoadTester:
         logging.info(f"\t- URL : {url}")
         logging.info("")
         logging.info("\t- Users:")
-        for user in self.users:
+        for user in users:
             logging.info(f"\t\t[User-{user.user_id:03d}] Wallet : {user.wallet.address}")
 
         logging.info("")
@@ -153,6 +291,7 @@ class LoadTester:
                 logging.error(f"Authorization failed with status code {status_code}")
             else:
                 logging.info("All users authorized successfully.")
+                authorized = True
             logging.info("")
 
         except requests.exceptions.Timeout:
@@ -166,21 +305,76 @@ class LoadTester:
         logging.info("Finish authorizing users for contract.")
         logging.info("")
 
+        return authorized
+
+
+    def _prepare_pool_wallets(self):
+        """Authorizes and tops up only the pool wallets that need it, then saves the pool."""
+
+        pool = self.wallet_pool
+        scope = authorization_scope(self.host, self.contract, get_chain_id())
+
+        unauthorized = [user for user in self.users if not pool.is_authorized(user.wallet.address, scope)]
+        if unauthorized:
+            if self._authorized_users(unauthorized):
+                pool.mark_authorized([user.wallet.address for user in unauthorized], scope)
+        else:
+            logging.info(f"[WalletPool] All {self.number_users} wallets already authorized for {scope}")
+
+        # Balance reads are cheap RPC calls, funding transactions are not
+        w3 = get_w3()
+        low_balance = []
+        for user in self.users:
+            address = user.wallet.address
+            try:
+                balance = float(w3.from_wei(w3.eth.get_balance(address), "ether"))
+                pool.set_balance(address, balance)
+            except Exception as e:
+                logging.error(f"[WalletPool] [User-{user.user_id:03d}] Failed to read balance, using last known: {e}")
+                balance = pool.balance(address)
+
+            if balance < self.min_balance:
+                low_balance.append(user)
+
+        if low_balance:
+            logging.info(f"[WalletPool] Topping up {len(low_balance)}/{self.number_users} wallets below {self.min_balance} ETH")
+            results = self._fund_users(low_balance)
+            for user in low_balance:
+                if results.get(user.user_id):
+                    pool.set_balance(user.wallet.address, pool.balance(user.wallet.address) + AMOUNT_ETH)
+        else:
+            logging.info(f"[WalletPool] All {self.number_users} wallets hold at least {self.min_balance} ETH")
+
+        pool.save()
+
 
-    def _create_users(self, amount_users: int):
-        """Init all users before start the test."""
+    def _create_users(self, amount_users: int, user_specs: list = None):
+        """
+        Init all users before start the test.
 
-        logging.info(f"Starting {amount_users} users...")
+        `user_specs` is a list of (user_id, private_key, batch_id) used to rebuild
+        existing users (e.g. a shard inside a worker process).
+        """
+
+        if user_specs is None:
+            user_specs = [(user_id, None, None) for user_id in range(1, amount_users + 1)]
+
+        logging.info(f"Starting {len(user_specs)} users...")
         logging.info("")
 
         users = []
 
-        for user_id in range(1, amount_users + 1):
+        for user_id, private_key, batch_id in user_specs:
             users.append(self.user_cls(
                 host=self.host,
                 mode=self.mode,
                 user_id=user_id,
-                interval_requests=self.interval_requests
+                interval_requests=self.interval_requests,
+                private_key=private_key,
+                batch_id=batch_id,
+                max_in_flight_tx=self.max_in_flight_tx,
+                read_only_response=self.read_only_response,
+                http_trace=self.http_trace
             ))
 
         logging.info("")
@@ -189,8 +383,78 @@ class LoadTester:
         return users
 
 
-    async def _run(self, user, user_id, duration, run_function, results_operation):
-        """Runs a single type of flow (API or Blockchain) for 'duration' seconds (Async)."""
+    @staticmethod
+    def _stamp_schedule(results, intended_start, actual_start):
+        """
+        Adds the intended start (epoch seconds) and the coordinated-omission
+        corrected latency to every result of one scheduled call.
+
+        The call started `actual_start - intended_start` seconds late, so each
+        result measured inside it is corrected by that schedule lag
+        (corrected_duration = completion - intended start of the result).
+        Failed rows without a duration (-1) are charged the time from the
+        intended start to now, so failures stay in the corrected percentiles.
+        """
+        now = time.perf_counter()
+        lag = max(0.0, actual_start - intended_start)
+        intended_epoch = time.time() - (now - intended_start)
+
+        for result in results:
+            result["intended_start"] = round(intended_epoch, 6)
+            duration = result.get("duration")
+            if isinstance(duration, (int, float)) and duration >= 0:
+                result["corrected_duration"] = round(duration + lag, 5)
+            else:
+                result["corrected_duration"] = round(now - intended_start, 5)
+
+        return results
+
+
+    @staticmethod
+    def _closed_loop_schedule(next_intended, actual_start, expected_interval):
+        """
+        (intended start of this call, intended start of the next one) in the
+        closed loop. The next call is expected `expected_interval` after this
+        one actually started: a call slower than the interval is charged to the
+        call after it only, since the user's own pause runs inside the call and
+        the loop can never catch up with a fixed schedule. Without an expected
+        interval there is no schedule (intended == actual).
+        """
+        if not expected_interval:
+            return actual_start, actual_start
+        return next_intended, actual_start + expected_interval
+
+
+    def _collect(self, phase, results_operation, results):
+        """Appends the results of one call to the phase results and histograms."""
+        histograms = self.histograms[phase]
+        for result in results:
+            results_operation.append(result)
+            histograms.record(result)
+            if self.reporter is not None:
+                self.reporter.record(result)
+
+
+    def _defer_results(self, user, phase, results_operation, intended_start, actual_start):
+        """Routes the late rows of pipelined transactions to the call that submitted them."""
+        def deliver(results):
+            self._stamp_schedule(results, intended_start, actual_start)
+            self._collect(phase, results_operation, results)
+
+        user.deferred_results = deliver
+
+
+    def histogram_snapshot(self, phase):
+        """Copy of the phase latency histograms, safe to take while the phase runs."""
+        return self.histograms[phase].snapshot()
+
+
+    async def _run(self, user, user_id, duration, phase, run_function, results_operation, stop=None):
+        """Runs a single type of flow (API or Blockchain) for 'duration' seconds (Async).
+
+        A set `stop` event (load profiles scaling users down) ends the loop
+        after the call in progress.
+        """
         
         logging.info(f"[User-{user_id:03d}] Starting run: {run_function.__name__}...")
 
@@ -203,7 +467,16 @@ class LoadTester:
         start_bc_fail = user.bc_fail
         start_time = time.perf_counter()
 
-        while (time.perf_counter() - start_time) < duration:
+        # Per-user schedule for coordinated-omission correction
+        next_intended = start_time
+
+        while (time.perf_counter() - start_time) < duration and not (stop is not None and stop.is_set()):
+            actual_start = time.perf_counter()
+            intended_start, next_intended = self._closed_loop_schedule(next_intended, actual_start, self.expected_interval)
+
+            self._defer_results(user, phase, results_operation, intended_start, actual_start)
+
+            self.in_flight += 1
             try:
                 # Await the user function
                 # Note: run_function (sequential or random) updates sequences/etc
@@ -213,12 +486,12 @@ class LoadTester:
                 else:
                     results = run_function() # Should ideally be async
 
-                for result in results:
-                    results_operation.append(result)
+                self._stamp_schedule(results, intended_start, actual_start)
+                self._collect(phase, results_operation, results)
 
             except Exception as e:
                 logging.error(f"[User-{user_id:03d}] Error during {run_function.__name__}: {type(e).__name__}: {e}")
-                results_operation.append({
+                self._collect(phase, results_operation, self._stamp_schedule([{
                     "timestamp": int(time.time()),
                     "user_id": user_id,
                     "request": "error",
@@ -226,10 +499,16 @@ class LoadTester:
                     "endpoint": "unknown",
                     "duration": -1,
                     "status": f"fail ({type(e).__name__})"
-                })
+                }], intended_start, actual_start))
                 # Small sleep to prevent tight loop in case of repeated immediate errors
                 await asyncio.sleep(0.1)
 
+            finally:
+                self.in_flight -= 1
+
+        # Pipelined transactions still awaiting their receipt belong to this run
+        await user.wait_in_flight()
+
         # Capture final state and calculate stats
         end_time = time.perf_counter()
         end_api_count = user.api_requests_counter
@@ -273,20 +552,29 @@ class LoadTester:
         }
 
 
-    async def simulate_user(self, phase, user_id: int, duration: float, interval_requests: float):
-        """Runs the user's sequence of Tasks for 'duration' seconds (Async)."""
+    def _open_session(self, user):
+        """Initializes the user's HTTP session (own connector or a view over the shared pool)."""
+        if self.connection_pool is not None:
+            # Lightweight view over the shared connector
+            user.session = self.connection_pool.session(trace_configs=self._trace_configs)
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=self.connector_limit, 
+                limit_per_host=self.connector_limit_per_host,
+                keepalive_timeout=self.connector_keepalive_timeout,
+                ttl_dns_cache=self.connector_ttl_dns_cache,
+                force_close=self.connector_force_close
+            )
+            user.session = aiohttp.ClientSession(connector=connector, trace_configs=self._trace_configs)
+
 
-        user = self.users[user_id - 1]
+    async def simulate_user(self, phase, user_id: int, duration: float, interval_requests: float, stop: asyncio.Event = None):
+        """Runs the user's sequence of Tasks for 'duration' seconds, or until `stop` is set (Async)."""
+
+        user = self._users_by_id[user_id]
         
         # Initialize User Session
-        connector = aiohttp.TCPConnector(
-            limit=self.connector_limit, 
-            limit_per_host=self.connector_limit_per_host,
-            keepalive_timeout=self.connector_keepalive_timeout,
-            ttl_dns_cache=self.connector_ttl_dns_cache,
-            force_close=self.connector_force_close
-        )
-        user.session = aiohttp.ClientSession(connector=connector)
+        self._open_session(user)
 
         try:
             counts = {
@@ -297,11 +585,11 @@ class LoadTester:
 
             # 1. sequential API + Blockchain (API-TX_BUILD)
             if phase == "api-tx-build":
-                counts = await self._run(user, user_id, duration, user.run_sequential_request, self.results_tx_build)
+                counts = await self._run(user, user_id, duration, phase, user.run_sequential_request, self.results_tx_build, stop)
 
             # 2. random API (API-READ-ONLY)
             if phase == "api-read-only":
-                counts = await self._run(user, user_id, duration, user.run_random_request, self.results_read_only)
+                counts = await self._run(user, user_id, duration, phase, user.run_random_request, self.results_read_only, stop)
                 
             return counts
         
@@ -309,28 +597,93 @@ class LoadTester:
             await user.session.close()
             
 
-    def run_static_load(self, phase, output_file=None):
+    def _run_loop(self, coro):
+        """Runs a coroutine on the shared pool loop, or on a fresh loop of the tester backend."""
+        if self.connection_pool is not None:
+            return self.connection_pool.run(coro)
+        return run_on_loop(coro, self.loop_backend)
+
+    def _run_async(self, coro):
+        """Runs a phase coroutine with the background tasks alongside it."""
+        return self._run_loop(self._with_background_tasks(coro))
+
+    async def _with_background_tasks(self, coro):
+        """Runs the phase coroutine with the metrics reporter, loop monitor and receipt tracker alongside it."""
+        background = []
+        if self.loop_monitor is not None:
+            background.append(asyncio.create_task(self.loop_monitor.run()))
+        if self.reporter is not None:
+            background.append(asyncio.create_task(self.reporter.run()))
+        if self.receipt_tracker is not None:
+            background.append(self.receipt_tracker.start())
 
-        """Runs a static load test (Async wrapper)."""
-        
-        logging.info("")
-        logging.info(f"Starting static load test with {self.number_users} users for {self.duration}s...")
-        logging.info("")
-        
-        async def main_async():
-             start_time = time.perf_counter()
-             tasks = [
-                 self.simulate_user(phase=phase, user_id=user_id, duration=self.duration, interval_requests=self.interval_requests)                
-                 for user_id in range(1, self.number_users + 1)
-             ]
-             results = await asyncio.gather(*tasks)
-             total_time = round(time.perf_counter() - start_time, 2)
-             return results, total_time
+        try:
+            return await coro
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            self._close_reporter()
 
-        # Execute async loop
-        results_list, total_time = asyncio.run(main_async())
+    def close(self):
+        """Releases resources owned by this tester (the shared pool, if created here)."""
+        if self._owns_connection_pool and self.connection_pool is not None:
+            self.connection_pool.close()
+            self.connection_pool = None
+
+
+    def _phase_results(self, phase):
+        """Returns the result list that collects the given phase."""
+        if phase == "api-tx-build":
+            return self.results_tx_build
+        elif phase == "api-read-only":
+            return self.results_read_only
+        return []
+
+
+    def _open_sink(self, phase, output_file):
+        """Replaces the phase result list by a streaming sink writing to `output_file`."""
+        if self.result_sink == "memory" or not output_file:
+            return
+
+        sink = SINKS[self.result_sink](output_file)
+        if phase == "api-tx-build":
+            self.results_tx_build = sink
+        elif phase == "api-read-only":
+            self.results_read_only = sink
+
+
+    def _open_reporter(self, output_file, in_workers=False):
+        """Starts the timeseries.csv reporter next to `output_file` (when enabled)."""
+        if not self.report_interval or not output_file:
+            return
+
+        self.reporter = MetricsReporter(
+            timeseries_path(output_file),
+            self.report_interval,
+            # In-flight calls are only known when the users run in this process
+            in_flight=None if in_workers else (lambda: self.in_flight)
+        )
+        logging.info(f"Live metrics every {self.report_interval}s: {self.reporter.path}")
+
+    def _close_reporter(self):
+        if self.reporter is not None:
+            self.reporter.close()
+            self.reporter = None
+
+
+    def _resolve_reverts(self, reverts):
+        """Replays the reverted transactions of a finished phase to get their revert reasons."""
+        try:
+            return self._run_loop(resolve_revert_reasons(reverts))
+        except Exception as e:
+            logging.error(f"[Reverts] Revert analysis failed: {type(e).__name__}: {e}")
+            return reverts
 
 
+    def _summarize_phase(self, label, phase, results_list, total_time, output_file, reverts=None, loop_windows=None):
+        """Merges the per-user counters, prints the global summary and builds the run data."""
+
         global_api = 0
         global_bc = 0
         global_total = 0
@@ -351,24 +704,31 @@ class LoadTester:
 
         
         global_rps = global_total / total_time if total_time > 0 else 0.0
-        
+
+        # Event loop windows of this process plus the ones reported by the worker shards
+        loop_windows = (loop_windows or []) + (self.loop_monitor.drain() if self.loop_monitor is not None else [])
+        generator = summarize_windows(loop_windows)
+
         log.print_global_summary(
-            "STATIC", self.number_users, total_time, 
+            label, self.number_users, total_time, 
             global_api, global_bc, global_total, global_rps,
-            global_api_success, global_api_fail, global_bc_success, global_bc_fail
+            global_api_success, global_api_fail, global_bc_success, global_bc_fail,
+            generator=generator
         )
 
-
-        if phase == "api-tx-build":
-            results = self.results_tx_build
-        elif phase == "api-read-only":
-            results = self.results_read_only
-        else:
-            results = []
+        # Reverts of this process plus the ones reported by the worker shards;
+        # shards only report them, the process that writes out.csv resolves them
+        reverts = (reverts or []) + (self.revert_log.drain() if self.revert_log is not None else [])
+        if reverts and output_file:
+            reverts = self._resolve_reverts(reverts)
 
         return {
             "users": self.number_users,
-            "results": results,
+            "results": self._phase_results(phase),
+            "reverts": reverts,
+            "loop": loop_windows,
+            "generator": generator,
+            "histograms": self.histograms.get(phase),
             "output_file": output_file,
             "total_time": total_time,
             "global_stats": {
@@ -383,95 +743,610 @@ class LoadTester:
             }
         }
 
-    def run_ramp_up_load(self, phase, output_file=None):
 
-        """Runs a ramp-up load test, adding users gradually (Async wrapper)."""
+    # ---- Multi-process load generation ----
+    def user_specs(self):
+        """Returns (user_id, private_key, batch_id) for every user, to rebuild them elsewhere."""
+        return [
+            (user.user_id, user.wallet.account.key.hex(), user.batch_id)
+            for user in self.users
+        ]
+
+
+    def _worker_kwargs(self, user_specs):
+        """LoadTester arguments for one shard (picklable, single process, wallets ready)."""
+        return {
+            "host": self.host,
+            "mode": self.mode,
+            "contract": self.contract,
+            "duration": self.duration,
+            "user_cls": self.user_cls,
+            "users": len(user_specs),
+            "step_users": self.step_users,
+            "interval_users": self.interval_users,
+            "interval_requests": self.interval_requests,
+            "connector_limit": self.connector_limit,
+            "connector_limit_per_host": self.connector_limit_per_host,
+            "connector_keepalive_timeout": self.connector_keepalive_timeout,
+            "connector_ttl_dns_cache": self.connector_ttl_dns_cache,
+            "connector_force_close": self.connector_force_close,
+            # A pool cannot cross processes: each shard opens its own for the phase
+            "shared_connector": self.connection_pool is not None,
+            "arrival_rate": self.arrival_rate / self.workers if self.arrival_rate else self.arrival_rate,
+            "arrival_distribution": self.arrival_distribution,
+            "expected_interval": self.expected_interval,
+            "signer": self.signer,
+            "signer_workers": self.signer_workers,
+            "max_in_flight_tx": self.max_in_flight_tx,
+            "read_only_response": self.read_only_response,
+            "http_trace": self.http_trace,
+            "loop_monitor_interval": self.loop_monitor.interval if self.loop_monitor is not None else None,
+            "loop_backend": self.loop_backend,
+            "workers": 1,
+            "user_specs": user_specs,
+            "prepare_wallets": False,
+        }
+
+
+    @property
+    def sharded(self):
+        """True when the phases run in worker processes (local or remote)."""
+        return self.workers > 1 or self.coordinator is not None
+
+
+    def _run_in_workers(self, run_method, label, phase, output_file):
+        """Shards the users across `workers` processes and merges their counters."""
+
+        logging.info("")
+        where = "remote workers" if self.coordinator is not None else "processes"
+        logging.info(f"Starting {label.lower()} load test with {self.number_users} users in {self.workers} {where} for {self.duration}s...")
+        logging.info("")
+
+        specs = self.user_specs()
+        shards = [specs[index::self.workers] for index in range(self.workers)]
+
+        # Remote workers (coordinator) or local processes
+        runner = self.coordinator.run_sharded if self.coordinator is not None else run_sharded
+
+        # No event loop here: the reporter is driven by a thread and fed by the streamed results
+        results = self._phase_results(phase)
+        self._open_reporter(output_file, in_workers=True)
+        if self.reporter is not None:
+            results = ReportedResults(results, self.reporter)
+            self.reporter.start_thread()
+
+        try:
+            summaries, total_time = runner(
+                shard_kwargs=[self._worker_kwargs(shard) for shard in shards],
+                run_method=run_method,
+                phase=phase,
+                results=results
+            )
+        finally:
+            self._close_reporter()
+
+        # Shard results are appended straight to the phase results, the
+        # histograms come merged from the shard summaries instead
+        for summary in summaries:
+            if summary.get("histograms") is not None:
+                self.histograms[phase].merge(summary["histograms"])
+
+        run_data = self._summarize_phase(
+            label, phase, [summary["global_stats"] for summary in summaries], total_time, output_file,
+            reverts=[entry for summary in summaries for entry in summary.get("reverts") or []],
+            loop_windows=[window for summary in summaries for window in summary.get("loop") or []]
+        )
+
+        arrivals = [summary["arrivals"] for summary in summaries if summary.get("arrivals")]
+        if arrivals:
+            run_data["arrivals"] = {
+                "target_rate": self.arrival_rate,
+                "distribution": self.arrival_distribution,
+                "scheduled": sum(a["scheduled"] for a in arrivals),
+                "dropped": sum(a["dropped"] for a in arrivals),
+            }
+
+        return run_data
+
+
+    def run_static_load(self, phase, output_file=None):
+
+        """Runs a static load test (Async wrapper)."""
+
+        self._open_sink(phase, output_file)
+
+        if self.sharded:
+            return self._run_in_workers("run_static_load", "STATIC", phase, output_file)
+
+        self._open_reporter(output_file)
         
         logging.info("")
-        logging.info(f"Starting ramp-up load test with up to {self.number_users} users...")
+        logging.info(f"Starting static load test with {self.number_users} users for {self.duration}s...")
         logging.info("")
-    
         
-        async def main_ramp_up():
+        async def main_async():
+             start_time = time.perf_counter()
+             tasks = [
+                 self.simulate_user(phase=phase, user_id=user_id, duration=self.duration, interval_requests=self.interval_requests)                
+                 for user_id in self._users_by_id
+             ]
+             results = await asyncio.gather(*tasks)
+             total_time = round(time.perf_counter() - start_time, 2)
+             return results, total_time
+
+        # Execute async loop
+        results_list, total_time = self._run_async(main_async())
+
+        return self._summarize_phase("STATIC", phase, results_list, total_time, output_file)
+
+    def run_ramp_up_load(self, phase, output_file=None):
+
+        """Runs a ramp-up load test, adding `step_users` every `interval_users` seconds (Async wrapper)."""
+
+        profile = LoadProfile.ramp_up(self.number_users, self.step_users, self.interval_users, self.duration)
+        return self._run_user_profile("RAMP-UP", profile, phase, output_file)
+
+
+    def run_profile_load(self, phase, output_file=None):
+
+        """Runs the declarative load profile: users started/stopped or request starts paced per stage."""
+
+        if self.profile.unit == "rps":
+            return self._run_rate_profile(phase, output_file)
+        return self._run_user_profile("PROFILE", self.profile, phase, output_file)
+
+
+    # ---- Load profiles (closed model) ----
+    def _run_user_profile(self, label, profile, phase, output_file):
+        """Starts and stops users every PROFILE_TICK so the active count follows `profile`."""
+
+        self._open_sink(phase, output_file)
+
+        if self.sharded:
+            logging.warning(f"{label.capitalize()} runs in a single process, ignoring workers.")
+
+        self._open_reporter(output_file)
+
+        logging.info("")
+        logging.info(
+            f"Starting {label.lower()} load test with up to {self.number_users} users "
+            f"({len(profile.stages)} stages, {profile.duration:.0f}s)..."
+        )
+        logging.info("")
+
+        async def main_profile():
             start_time = time.perf_counter()
+            idle = list(self._users_by_id)
+            active = []
             tasks = []
-            active_users = 0
-
-            while active_users < self.number_users:
-                # Add a new user group (step users)
-                new_users = min(self.step_users, self.number_users - active_users)
-                for i in range(new_users):
-                    user_id = active_users + i + 1
-                    # Start task
+
+            def release(user_id):
+                return lambda task: idle.append(user_id)
+
+            while True:
+                elapsed = time.perf_counter() - start_time
+                if elapsed >= profile.duration:
+                    break
+
+                target = min(self.number_users, int(round(profile.target_at(elapsed))))
+                changed = False
+
+                # Newest users stop first, stopped users rejoin `idle` once their call ends
+                while len(active) > target:
+                    stop = active.pop()
+                    stop.set()
+                    changed = True
+
+                while len(active) < target and idle:
+                    user_id = idle.pop(0)
+                    stop = asyncio.Event()
                     task = asyncio.create_task(
-                        self.simulate_user(phase=phase, user_id=user_id, duration=self.duration, interval_requests=self.interval_requests)
+                        self.simulate_user(
+                            phase=phase, user_id=user_id, duration=profile.duration - elapsed,
+                            interval_requests=self.interval_requests, stop=stop
+                        )
                     )
+                    task.add_done_callback(release(user_id))
                     tasks.append(task)
+                    active.append(stop)
+                    changed = True
 
-                active_users += new_users
-                logging.info(f"Active users: {active_users}/{self.number_users}")
+                if changed:
+                    logging.info(f"Active users: {len(active)}/{self.number_users} (target {target}, {elapsed:.1f}s)")
 
-                # Wait for the time between increments
-                if active_users < self.number_users:
-                    await asyncio.sleep(self.interval_users)
+                await asyncio.sleep(PROFILE_TICK)
 
-            # Wait for all tasks to finish
+            for stop in active:
+                stop.set()
+
+            # One counts dict per user activation, summed in the phase summary
             results = await asyncio.gather(*tasks)
             total_time = round(time.perf_counter() - start_time, 2)
             return results, total_time
 
         # Execute
-        results_list, total_time = asyncio.run(main_ramp_up())
+        results_list, total_time = self._run_async(main_profile())
 
+        return self._summarize_phase(label, phase, results_list, total_time, output_file)
 
-        global_api = 0
-        global_bc = 0
-        global_total = 0
-        global_api_success = 0
-        global_api_fail = 0
-        global_bc_success = 0
-        global_bc_fail = 0
-        
-        for res in results_list:
-            if res:
-                global_api += res["api"]
-                global_bc += res["bc"]
-                global_total += res["total"]
-                global_api_success += res["api_success"]
-                global_api_fail += res["api_fail"]
-                global_bc_success += res["bc_success"]
-                global_bc_fail += res["bc_fail"]
 
+    # ---- Open model (constant arrival rate) ----
+    def _next_interarrival(self, rate=None):
+        """Time until the next scheduled request start (at `rate` req/s, default arrival_rate)."""
+        rate = rate or self.arrival_rate
+        if self.arrival_distribution == "poisson":
+            return random.expovariate(rate)
+        return 1.0 / rate
 
-        global_rps = global_total / total_time if total_time > 0 else 0.0
 
-        log.print_global_summary(
-            "RAMP-UP", self.number_users, total_time, 
-            global_api, global_bc, global_total, global_rps,
-            global_api_success, global_api_fail, global_bc_success, global_bc_fail
+    @staticmethod
+    def _snapshot_counters(user):
+        return {
+            "api": user.api_requests_counter,
+            "bc": user.blockchain_requests_counter,
+            "api_success": user.api_success,
+            "api_fail": user.api_fail,
+            "bc_success": user.bc_success,
+            "bc_fail": user.bc_fail,
+        }
+
+
+    async def _dispatch_arrival(self, idle_users: asyncio.Queue, phase, results_operation, waiting: set, intended_start):
+        """Runs one scheduled request on the first free user slot (Async)."""
+
+        task = asyncio.current_task()
+        user = await idle_users.get()
+        waiting.discard(task)
+
+        self.in_flight += 1
+        try:
+            actual_start = time.perf_counter()
+            self._defer_results(user, phase, results_operation, intended_start, actual_start)
+
+            if phase == "api-tx-build":
+                results = await user.run_sequential_request()
+            else:
+                results = await user.run_random_request()
+
+            # Time spent waiting for a free slot counts against the latency
+            self._stamp_schedule(results, intended_start, actual_start)
+            self._collect(phase, results_operation, results)
+
+        except Exception as e:
+            logging.error(f"[User-{user.user_id:03d}] Error during {phase} arrival: {type(e).__name__}: {e}")
+            self._collect(phase, results_operation, self._stamp_schedule([{
+                "timestamp": int(time.time()),
+                "user_id": user.user_id,
+                "request": "error",
+                "task": "error",
+                "endpoint": "unknown",
+                "duration": -1,
+                "status": f"fail ({type(e).__name__})"
+            }], intended_start, actual_start))
+
+        finally:
+            self.in_flight -= 1
+            idle_users.put_nowait(user)
+
+
+    def run_arrival_rate_load(self, phase, output_file=None):
+
+        """
+        Runs an open-model load test (Async wrapper).
+
+        Request starts follow `arrival_rate` (fixed or Poisson inter-arrivals)
+        regardless of response times. Each user is one in-flight slot: an arrival
+        waits for a free user, and arrivals still waiting when the window closes
+        are counted as dropped.
+        """
+
+        self._open_sink(phase, output_file)
+
+        if self.sharded:
+            return self._run_in_workers("run_arrival_rate_load", "ARRIVAL-RATE", phase, output_file)
+
+        self._open_reporter(output_file)
+
+        logging.info("")
+        logging.info(
+            f"Starting arrival-rate load test at {self.arrival_rate} req/s "
+            f"({self.arrival_distribution}) with {self.number_users} slots for {self.duration}s..."
         )
-        
+        logging.info("")
 
-        if phase == "api-tx-build":
-            results = self.results_tx_build
-        elif phase == "api-read-only":
-            results = self.results_read_only
-        else:
-            results = []
+        return self._run_arrivals("ARRIVAL-RATE", phase, output_file, self.duration, lambda elapsed: self.arrival_rate)
 
-        return {
-            "users": self.number_users,
-            "results": results,
-            "output_file": output_file,
-            "total_time": total_time,
-            "global_stats": {
-                "api": global_api,
-                "bc": global_bc,
-                "total": global_total,
-                "rps": global_rps,
-                "api_success": global_api_success,
-                "api_fail": global_api_fail,
-                "bc_success": global_bc_success,
-                "bc_fail": global_bc_fail
+
+    def _run_rate_profile(self, phase, output_file):
+        """Open-model run whose arrival rate follows the profile stages (req/s)."""
+
+        self._open_sink(phase, output_file)
+
+        if self.sharded:
+            logging.warning("Profile runs in a single process, ignoring workers.")
+
+        self._open_reporter(output_file)
+
+        logging.info("")
+        logging.info(
+            f"Starting profile load test up to {self.profile.max_target} req/s "
+            f"({self.arrival_distribution}, {len(self.profile.stages)} stages) "
+            f"with {self.number_users} slots for {self.profile.duration:.0f}s..."
+        )
+        logging.info("")
+
+        return self._run_arrivals("PROFILE", phase, output_file, self.profile.duration, self.profile.target_at)
+
+
+    def _run_arrivals(self, label, phase, output_file, duration, rate_at):
+        """Schedules request starts at `rate_at(elapsed)` req/s for `duration` seconds."""
+
+        results_operation = self._phase_results(phase)
+
+        async def main_arrival_rate():
+            idle_users = asyncio.Queue()
+            for user in self.users:
+                self._open_session(user)
+                idle_users.put_nowait(user)
+
+            start_counts = [self._snapshot_counters(user) for user in self.users]
+
+            # The scheduler owns the pacing, users must not sleep between requests
+            intervals = [user.interval_requests for user in self.users]
+            for user in self.users:
+                user.interval_requests = 0
+
+            in_flight = set()
+            waiting = set()
+            scheduled = 0
+
+            try:
+                start_time = time.perf_counter()
+                next_arrival = start_time
+
+                while (next_arrival - start_time) < duration:
+                    delay = next_arrival - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                    # Nothing to schedule at a zero rate, check again on the next tick
+                    rate = rate_at(next_arrival - start_time)
+                    if rate <= 0:
+                        next_arrival += PROFILE_TICK
+                        continue
+
+                    task = asyncio.create_task(
+                        self._dispatch_arrival(idle_users, phase, results_operation, waiting, next_arrival)
+                    )
+                    waiting.add(task)
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                    scheduled += 1
+
+                    next_arrival += self._next_interarrival(rate)
+
+                # Arrivals that never got a free slot inside the window are dropped
+                dropped = len(waiting)
+                for task in list(waiting):
+                    task.cancel()
+
+                if in_flight:
+                    await asyncio.gather(*in_flight, return_exceptions=True)
+
+                # Pipelined transactions still awaiting their receipt
+                await asyncio.gather(*(user.wait_in_flight() for user in self.users))
+
+                total_time = round(time.perf_counter() - start_time, 2)
+
+            finally:
+                for user, interval in zip(self.users, intervals):
+                    user.interval_requests = interval
+                    await user.session.close()
+
+            counts = []
+            for user, start in zip(self.users, start_counts):
+                end = self._snapshot_counters(user)
+                delta = {key: end[key] - start[key] for key in start}
+                delta["total"] = delta["api"] + delta["bc"]
+                counts.append(delta)
+
+            return counts, total_time, scheduled, dropped
+
+        results_list, total_time, scheduled, dropped = self._run_async(main_arrival_rate())
+
+        offered_rps = scheduled / total_time if total_time > 0 else 0.0
+        logging.info(f"Arrivals: scheduled {scheduled} ({offered_rps:.2f} req/s offered), dropped {dropped}")
+
+        run_data = self._summarize_phase(label, phase, results_list, total_time, output_file)
+        run_data["arrivals"] = {
+            "target_rate": self.arrival_rate if self.profile is None else self.profile.max_target,
+            "distribution": self.arrival_distribution,
+            "scheduled": scheduled,
+            "dropped": dropped,
+        }
+        return run_data
+
+
+    # ---- Pre-signed corpus (raw chain throughput) ----
+    def _prepare_corpus(self, output_file):
+        """Builds, signs and saves (next to out.csv) a new corpus before the timed window."""
+        size = self.corpus_size or int(math.ceil(self.arrival_rate * self.duration))
+        corpus = self._run_loop(build_corpus(self.users, self._open_session, size))
+
+        if output_file:
+            corpus.save(corpus_path(output_file))
+            logging.info(f"[Corpus] {len(corpus)} transactions saved: {corpus_path(output_file)}")
+        return corpus
+
+
+    async def _send_raw(self, async_w3, entry, request_id, phase, results_operation, counts, intended_start, send_lock):
+        """
+        Fires one pre-signed transaction and follows it until its block (Async).
+
+        `send_lock` is the lock of the entry's wallet: it is held until the
+        node accepted the transaction, so the sends of one wallet reach the
+        node in nonce order (asyncio locks are FIFO and the tasks are created
+        in corpus order). Receipts are still awaited concurrently.
+        """
+
+        user_counts = counts[entry["user_id"]]
+        user_counts["bc"] += 1
+        results = []
+        task_type = "TX-RAW-SEND"
+
+        self.in_flight += 1
+        actual_start = time.perf_counter()
+        self.receipt_tracker.track(entry["hash"])
+
+        try:
+            async with send_lock:
+                tx_hash = await async_w3.eth.send_raw_transaction(entry["raw"])
+            results.append({
+                "timestamp": int(time.time()),
+                "user_id": entry["user_id"],
+                "request": request_id,
+                "task": task_type,
+                "endpoint": entry["endpoint"],
+                "duration": time.perf_counter() - actual_start,
+                "status": "success"
+            })
+
+            task_type = "TX-BLOCK"
+            receipt = await self.receipt_tracker.wait(entry["hash"], timeout=TIMEOUT_BLOCKCHAIN)
+            status = "success" if receipt.status == 1 else "fail"
+
+            if status == "success":
+                user_counts["bc_success"] += 1
+            else:
+                user_counts["bc_fail"] += 1
+                if self.revert_log is not None:
+                    self.revert_log.record(entry["user_id"], request_id, tx_hash, receipt.blockNumber)
+
+            results.append({
+                "timestamp": int(time.time()),
+                "user_id": entry["user_id"],
+                "request": request_id,
+                "task": task_type,
+                "endpoint": entry["endpoint"],
+                "duration": time.perf_counter() - actual_start,
+                "status": status
+            })
+
+        except Exception as e:
+            self.receipt_tracker.forget(entry["hash"])
+            user_counts["bc_fail"] += 1
+            logging.error(f"[User-{entry['user_id']:03d}] [Corpus-{request_id:05d}] {task_type} failed (nonce {entry['nonce']}): {type(e).__name__}: {e}")
+            results.append({
+                "timestamp": int(time.time()),
+                "user_id": entry["user_id"],
+                "request": request_id,
+                "task": task_type,
+                "endpoint": entry["endpoint"],
+                "duration": -1,
+                "status": f"fail ({type(e).__name__})"
+            })
+
+        finally:
+            self.in_flight -= 1
+
+        self._stamp_schedule(results, intended_start, actual_start)
+        self._collect(phase, results_operation, results)
+
+
+    def run_corpus_load(self, phase, output_file=None):
+
+        """
+        Replays a pre-signed transaction corpus at `arrival_rate` tx/s (Async wrapper).
+
+        Before the timed window the corpus is built (mint bodies from the API,
+        precomputed nonces, signed) and saved next to out.csv. Inside the
+        window only eth_sendRawTransaction is fired, following the arrival
+        schedule, so the measurement isolates the node from the API, the
+        TX-BUILD RPC calls and signing. TX-RAW-SEND rows hold the RPC time and
+        TX-BLOCK rows the time from sending to the block that included it.
+        """
+
+        if self.mode != "api-blockchain":
+            raise ValueError("Corpus runs send transactions: mode must be api-blockchain")
+
+        self._open_sink(phase, output_file)
+
+        if self.sharded:
+            logging.warning("Corpus runs in a single process, ignoring workers.")
+
+        corpus = self._prepare_corpus(output_file)
+        results_operation = self._phase_results(phase)
+
+        self._open_reporter(output_file)
+
+        logging.info("")
+        logging.info(
+            f"Starting corpus load test at {self.arrival_rate} tx/s "
+            f"({self.arrival_distribution}) with {len(corpus)} pre-signed transactions for {self.duration}s..."
+        )
+        logging.info("")
+
+        async def main_corpus():
+            async_w3 = get_async_w3()
+            counts = {
+                user.user_id: {"api": 0, "bc": 0, "api_success": 0, "api_fail": 0, "bc_success": 0, "bc_fail": 0}
+                for user in self.users
             }
+            # One send at a time per wallet, so its nonces are never delivered out of order
+            send_locks = {user.user_id: asyncio.Lock() for user in self.users}
+
+            in_flight = set()
+            scheduled = 0
+
+            start_time = time.perf_counter()
+            next_arrival = start_time
+
+            for request_id, entry in enumerate(corpus, start=1):
+                if (next_arrival - start_time) >= self.duration:
+                    break
+
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                task = asyncio.create_task(
+                    self._send_raw(
+                        async_w3, entry, request_id, phase, results_operation, counts, next_arrival,
+                        send_locks[entry["user_id"]]
+                    )
+                )
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                scheduled += 1
+
+                next_arrival += self._next_interarrival()
+
+            if scheduled == len(corpus) and (next_arrival - start_time) < self.duration:
+                logging.warning(f"[Corpus] Corpus exhausted after {time.perf_counter() - start_time:.2f}s")
+
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+            total_time = round(time.perf_counter() - start_time, 2)
+
+            for user_counts in counts.values():
+                user_counts["total"] = user_counts["bc"]
+
+            return list(counts.values()), total_time, scheduled
+
+        results_list, total_time, scheduled = self._run_async(main_corpus())
+
+        # The corpus used nonces behind the wallets' back
+        for user in self.users:
+            user.wallet.resync_nonce()
+
+        logging.info(f"Corpus: sent {scheduled} of {len(corpus)} pre-signed transactions")
+
+        run_data = self._summarize_phase("CORPUS", phase, results_list, total_time, output_file)
+        run_data["arrivals"] = {
+            "target_rate": self.arrival_rate,
+            "distribution": self.arrival_distribution,
+            "scheduled": scheduled,
+            "dropped": 0,
         }
+        return run_data
@@ -85,7 +85,10 @@ def print_global_run_plan_summary(
     combos, 
     interval_requests,
     total_runs,
-    total_runs_all
+    total_runs_all,
+    arrival_rate=None,
+    arrival_distribution=None,
+    profile=None,
 ):
     logging.info("Global Run Plan Summary")
     logging.info("")
@@ -120,6 +123,9 @@ def print_global_run_plan_summary(
                     step_users=step_users, 
                     interval_users=interval_users, 
                     interval_requests=interval_requests,
+                    arrival_rate=arrival_rate,
+                    arrival_distribution=arrival_distribution,
+                    profile=profile,
                 )
                 if not (run_number == total_runs):
                     logging.info("")
@@ -137,6 +143,9 @@ def print_args_run(
     interval_users, 
     interval_requests,
     args_file=None,
+    arrival_rate=None,
+    arrival_distribution=None,
+    profile=None,
 ):
 
     logging.info(f"\t- Host                : {host}")
@@ -148,6 +157,15 @@ def print_args_run(
     if run == "ramp-up":
         logging.info(f"\t- Step Users          : {step_users}")
         logging.info(f"\t- Interval Users      : {interval_users}s")
+    if run == "arrival-rate":
+        logging.info(f"\t- Arrival Rate        : {arrival_rate} req/s ({arrival_distribution})")
+    elif run == "corpus":
+        logging.info(f"\t- Send Rate           : {arrival_rate} tx/s ({arrival_distribution})")
+    if run == "profile" and profile is not None:
+        logging.info(f"\t- Profile             : {profile.name} ({profile.unit}, {len(profile.stages)} stages)")
+        for stage in profile.stages:
+            target = "-" if stage.target is None else f"{stage.target:g} {profile.unit}"
+            logging.info(f"\t\t{stage.shape:<6} {stage.duration:g}s -> {target}")
     logging.info(f"\t- Interval Request    : {interval_requests}s")
     logging.info(f"\t- Repeat              : {repeat}")
     if args_file:
@@ -222,6 +240,7 @@ def print_global_summary(
     global_api_fail,
     global_bc_success,
     global_bc_fail,
+    generator=None,
 ):
     logging.info("=" * 60)
     logging.info(f"GLOBAL SUMMARY ({phase_label.upper()}):")
@@ -231,6 +250,11 @@ def print_global_summary(
     logging.info(f"\t- Total BC       : {global_bc} (Success: {global_bc_success} | Fail: {global_bc_fail})")
     logging.info(f"\t- Total Requests : {global_total}")
     logging.info(f"\t- Global RPS     : {global_rps:.2f}")
+    if generator:
+        logging.info(f"\t- Loop Lag       : {generator['loop_lag_mean_ms']:.2f}ms mean | {generator['loop_lag_max_ms']:.2f}ms max")
+        logging.info(f"\t- Loop CPU       : {generator['loop_cpu'] * 100:.1f}% ({generator['loop_saturated_windows'] * 100:.1f}% of the time saturated)")
+        if generator["generator_saturated"]:
+            logging.warning("\t- GENERATOR SATURATED: latencies include time waiting for the event loop, add --workers")
     logging.info("=" * 60)
 
     
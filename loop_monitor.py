@@ -0,0 +1,134 @@
+import os
+import csv
+import time
+import asyncio
+import logging
+
+# Internal imports
+from config import LOOP_MONITOR_WINDOW, LOOP_LAG_THRESHOLD_MS, LOOP_CPU_THRESHOLD, LOOP_SATURATED_FRACTION
+
+# Phase summary columns (stats_global.csv)
+GENERATOR_FIELDNAMES = ["loop_lag_mean_ms", "loop_lag_max_ms", "loop_cpu", "loop_saturated_windows", "generator_saturated"]
+
+LOOP_FIELDNAMES = ["timestamp", "elapsed", "worker", "lag_mean_ms", "lag_max_ms", "cpu", "ready_max", "tasks", "saturated"]
+
+
+def loop_path(output_file: str) -> str:
+    """Path of the event loop samples saved next to an out*.csv file (out_rep-1.csv -> loop_rep-1.csv)."""
+    directory, filename = os.path.split(output_file)
+    return os.path.join(directory, filename.replace("out", "loop", 1))
+
+
+def _saturated(lag_mean_ms, cpu) -> bool:
+    return lag_mean_ms > LOOP_LAG_THRESHOLD_MS or cpu >= LOOP_CPU_THRESHOLD
+
+
+class LoopMonitor:
+    """
+    Measures how far behind the event loop of the load generator is.
+
+    Every `interval` seconds it sleeps and measures how late it woke up
+    (scheduling lag) and how many callbacks were ready to run at that moment.
+    Every `window` seconds the samples are folded into one row with the mean
+    and max lag, the CPU time of the loop thread over the wall time (1.0 = the
+    loop never idles) and the number of live tasks. A window with a mean lag
+    above LOOP_LAG_THRESHOLD_MS or a CPU above LOOP_CPU_THRESHOLD is flagged
+    as saturated: latencies measured there include time the result waited for
+    the loop, not only the API or the node.
+    """
+
+    def __init__(self, interval: float, window: float = LOOP_MONITOR_WINDOW, worker: int = 0):
+        self.interval = interval
+        self.window = max(window, interval)
+        self.worker = worker
+        self.windows = []
+
+    @staticmethod
+    def _ready(loop):
+        # Ready callbacks queue of the default asyncio loop (private, absent on other loops)
+        ready = getattr(loop, "_ready", None)
+        return len(ready) if ready is not None else None
+
+    def _close_window(self, lags, ready, window_start, cpu_start, start_time):
+        now = time.perf_counter()
+        wall = now - window_start
+        cpu = (time.thread_time() - cpu_start) / wall if wall > 0 else 0.0
+
+        lag_mean_ms = sum(lags) / len(lags) * 1000
+        row = {
+            "timestamp": int(time.time()),
+            "elapsed": round(now - start_time, 2),
+            "worker": self.worker,
+            "lag_mean_ms": round(lag_mean_ms, 3),
+            "lag_max_ms": round(max(lags) * 1000, 3),
+            "cpu": round(min(cpu, 1.0), 3),
+            "ready_max": max(ready) if ready else None,
+            "tasks": len(asyncio.all_tasks()),
+        }
+        row["saturated"] = int(_saturated(row["lag_mean_ms"], row["cpu"]))
+        self.windows.append(row)
+
+    async def run(self):
+        """Event loop task: samples until cancelled (the last partial window is kept)."""
+        loop = asyncio.get_running_loop()
+        start_time = window_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        lags, ready = [], []
+
+        try:
+            while True:
+                before = time.perf_counter()
+                await asyncio.sleep(self.interval)
+                now = time.perf_counter()
+
+                lags.append(max(now - before - self.interval, 0.0))
+                pending = self._ready(loop)
+                if pending is not None:
+                    ready.append(pending)
+
+                if now - window_start >= self.window:
+                    self._close_window(lags, ready, window_start, cpu_start, start_time)
+                    window_start, cpu_start = time.perf_counter(), time.thread_time()
+                    lags, ready = [], []
+        finally:
+            if lags:
+                self._close_window(lags, ready, window_start, cpu_start, start_time)
+
+    def drain(self) -> list:
+        """Returns the windows of the phase and starts over."""
+        windows, self.windows = self.windows, []
+        return windows
+
+
+def summarize_windows(windows: list) -> dict:
+    """Phase summary of the loop windows (of every worker); None when nothing was sampled."""
+    if not windows:
+        return None
+
+    lags = [float(w["lag_mean_ms"]) for w in windows]
+    saturated = sum(int(w["saturated"]) for w in windows)
+
+    return {
+        "loop_lag_mean_ms": round(sum(lags) / len(lags), 3),
+        "loop_lag_max_ms": round(max(float(w["lag_max_ms"]) for w in windows), 3),
+        "loop_cpu": round(sum(float(w["cpu"]) for w in windows) / len(windows), 3),
+        "loop_saturated_windows": round(saturated / len(windows), 3),
+        "generator_saturated": saturated / len(windows) >= LOOP_SATURATED_FRACTION,
+    }
+
+
+def save_windows(windows: list, path: str):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=LOOP_FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(windows)
+
+
+def load_windows(path: str) -> list:
+    """Windows written by `save_windows()` (values as strings, `summarize_windows` converts them)."""
+    try:
+        with open(path, newline="") as f:
+            return list(csv.DictReader(f))
+    except OSError as e:
+        logging.warning(f"[Loop] Failed to read {path}: {e}")
+        return []
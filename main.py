@@ -1,4 +1,5 @@
 import os
+import math
 import datetime
 import argparse
 import itertools
@@ -9,6 +10,7 @@ import log
 import save
 from stats import Stats
 from load_tester import LoadTester
+from load_profile import LoadProfile
 from users.user_erc721 import UserERC721
 from users.user_erc1155 import UserERC1155
 from config import (
@@ -24,12 +26,44 @@ from config import (
     INTERVAL_USERS, 
     INTERVAL_REQUEST, 
     REPEAT,
+    ARRIVAL_RATE,
+    ARRIVAL_DISTRIBUTIONS,
+    EXPECTED_INTERVAL,
+    WORKERS,
+    ROLES,
+    COORDINATOR_BIND,
+    COORDINATOR_CONNECT,
+    COORDINATOR_SECRET,
+    EXPECTED_WORKERS,
+    RESULT_SINKS,
+    REPORT_INTERVAL,
+    LOOP_MONITOR_INTERVAL,
+    LOOP_BACKENDS,
+    WALLET_POOL_FILE,
+    WALLET_MIN_BALANCE,
+    SIGNER_MODES,
+    SIGNER_WORKERS,
+    MAX_IN_FLIGHT_TX,
+    RESPONSE_POLICIES,
+    READ_ONLY_RESPONSE,
+    CORPUS_SIZE,
+    SELF_BENCHMARK_WORKERS,
+    SELF_BENCHMARK_USERS,
+    SELF_BENCHMARK_DURATION,
+    SELF_BENCHMARK_LATENCY,
+    STANDIN_BLOCK_TIME,
     WARMUP_USERS,
     WARMUP_DURATION,
     WARMUP_STEP_USERS,
     WARMUP_INTERVAL_USERS,
     WARMUP_INTERVAL_REQUESTS,
+    CONNECTOR_LIMIT,
+    CONNECTOR_LIMIT_PER_HOST,
 )
+from connection_pool import SharedConnectionPool
+from wallet.pool import WalletPool
+from distributed import Coordinator, run_worker
+from self_benchmark import run_self_benchmark
 from plot.plot import generate_plots
 
 def execute(run, phase, run_directory, repetition_index=None):
@@ -64,7 +98,11 @@ def run_load_tester(
     interval_requests,
     step_users=None, 
     interval_users=None,
-    repetition_index=None
+    repetition_index=None,
+    arrival_rate=None,
+    arrival_distribution=None,
+    profile=None,
+    tester_options=None
 ):
 
     run_label = run.upper()
@@ -73,6 +111,12 @@ def run_load_tester(
         run_directory_name = f"{contract}/mode-{mode}_duration-{duration}_users-{users}_interval-requests-{interval_requests}"
     elif run == "ramp-up":
         run_directory_name = f"{contract}/mode-{mode}_duration-{duration}_users-{users}_step_users-{step_users}_interval_users-{interval_users}_interval-requests-{interval_requests}"
+    elif run == "arrival-rate":
+        run_directory_name = f"{contract}/mode-{mode}_duration-{duration}_users-{users}_arrival-rate-{arrival_rate}_distribution-{arrival_distribution}"
+    elif run == "corpus":
+        run_directory_name = f"{contract}/mode-{mode}_duration-{duration}_users-{users}_corpus-rate-{arrival_rate}_distribution-{arrival_distribution}"
+    elif run == "profile":
+        run_directory_name = f"{contract}/mode-{mode}_profile-{profile.name}_unit-{profile.unit}_users-{users}_interval-requests-{interval_requests}"
     else:
         logging.error(f"Invalid run type: {run}")
         return
@@ -91,6 +135,9 @@ def run_load_tester(
         interval_users=interval_users,
         interval_requests=interval_requests,
         repeat=repeat,
+        arrival_rate=arrival_rate,
+        arrival_distribution=arrival_distribution,
+        profile=profile,
     )
 
     log.print_args_run(
@@ -105,6 +152,9 @@ def run_load_tester(
         interval_users=interval_users, 
         interval_requests=interval_requests,
         args_file=args_file,
+        arrival_rate=arrival_rate,
+        arrival_distribution=arrival_distribution,
+        profile=profile,
     )
 
     if contract == "erc721":
@@ -128,7 +178,11 @@ def run_load_tester(
         users=users,
         step_users=step_users,
         interval_users=interval_users,
-        interval_requests=interval_requests
+        interval_requests=interval_requests,
+        arrival_rate=arrival_rate,
+        arrival_distribution=arrival_distribution,
+        profile=profile,
+        **(tester_options or {})
     )
 
     logging.info("")
@@ -163,6 +217,42 @@ def run_load_tester(
             run_directory=run_directory,
             repetition_index=repetition_index
         )
+    elif run == "arrival-rate":
+        execute(
+            run=tester.run_arrival_rate_load,
+            phase="api-tx-build",
+            run_directory=run_directory,
+            repetition_index=repetition_index
+        )
+        execute(
+            run=tester.run_arrival_rate_load,
+            phase="api-read-only",
+            run_directory=run_directory,
+            repetition_index=repetition_index
+        )
+    elif run == "corpus":
+        # Only transactions: there is no read-only phase
+        execute(
+            run=tester.run_corpus_load,
+            phase="api-tx-build",
+            run_directory=run_directory,
+            repetition_index=repetition_index
+        )
+    elif run == "profile":
+        execute(
+            run=tester.run_profile_load,
+            phase="api-tx-build",
+            run_directory=run_directory,
+            repetition_index=repetition_index
+        )
+        execute(
+            run=tester.run_profile_load,
+            phase="api-read-only",
+            run_directory=run_directory,
+            repetition_index=repetition_index
+        )
+
+    tester.close()
 
     logging.info("")
     logging.info(f"[{run_label}] Finished load test (Run {current_run}/{total_runs}).")
@@ -179,7 +269,10 @@ def run_warmup(
     users, 
     interval_requests,
     step_users=None, 
-    interval_users=None
+    interval_users=None,
+    arrival_rate=None,
+    arrival_distribution=None,
+    tester_options=None
 ):
     run_label = f"WARM-UP][{run.upper()}"
     
@@ -203,7 +296,10 @@ def run_warmup(
         users=users,
         step_users=step_users,
         interval_users=interval_users,
-        interval_requests=interval_requests
+        interval_requests=interval_requests,
+        arrival_rate=arrival_rate,
+        arrival_distribution=arrival_distribution,
+        **(tester_options or {})
     )
 
     logging.info("")
@@ -218,6 +314,11 @@ def run_warmup(
     elif run == "ramp-up":
         tester.run_ramp_up_load(phase="api-tx-build")
         tester.run_ramp_up_load(phase="api-read-only")
+    elif run == "arrival-rate":
+        tester.run_arrival_rate_load(phase="api-tx-build")
+        tester.run_arrival_rate_load(phase="api-read-only")
+
+    tester.close()
     
     logging.info("")
     logging.info(f"[{run_label}] Finished load test.")
@@ -251,7 +352,56 @@ def main():
     parser.add_argument("--step-users", type=int, nargs="+", default=STEP_USERS, help=f"Número de usuários adicionados a cada incremento (apenas no ramp-up) (default: {STEP_USERS})")
     parser.add_argument("--interval-users", type=float, nargs="+", default=INTERVAL_USERS, help=f"Tempo entre incrementos de usuários (segundos) (apenas no ramp-up) (default: {INTERVAL_USERS})")
     parser.add_argument("--interval-requests", type=float, default=INTERVAL_REQUEST, help=f"Pausa entre requisições consecutivas (segundos) (default: {INTERVAL_REQUEST})")
+
+    # Open model (arrival-rate)
+    parser.add_argument("--arrival-rate", type=float, default=ARRIVAL_RATE, help=f"Taxa alvo de chegada de requisições (req/s) (apenas no arrival-rate) (default: {ARRIVAL_RATE})")
+    parser.add_argument("--arrival-distribution", choices=ARRIVAL_DISTRIBUTIONS, default=ARRIVAL_DISTRIBUTIONS[0], help=f"Distribuição dos intervalos entre chegadas (apenas no arrival-rate) (default: {ARRIVAL_DISTRIBUTIONS[0]})")
+    parser.add_argument("--profile", type=str, help="Arquivo JSON com os estágios do perfil de carga (alvo em usuários ou req/s, duração e forma: ramp, step, hold, spike, sine) (apenas no profile)")
+    parser.add_argument("--corpus-size", type=int, default=CORPUS_SIZE, help=f"Transações pré-assinadas geradas antes da janela medida (apenas no corpus; 0 = arrival-rate x duração) (default: {CORPUS_SIZE})")
+    parser.add_argument("--expected-interval", type=float, default=EXPECTED_INTERVAL, help=f"Intervalo esperado entre requisições de um usuário para a correção de coordinated omission nos modos static/ramp-up (0 = desabilitado) (default: {EXPECTED_INTERVAL})")
     
+    # Load generation workers
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"Número de processos geradores de carga; os usuários são divididos entre eles (default: {WORKERS})")
+
+    # Distributed mode
+    parser.add_argument("--role", choices=ROLES, default=ROLES[0], help=f"Papel no modo distribuído: coordinator distribui os usuários entre os workers conectados (default: {ROLES[0]})")
+    parser.add_argument("--bind", default=COORDINATOR_BIND, help=f"Endereço ZeroMQ em que o coordinator escuta (default: {COORDINATOR_BIND})")
+    parser.add_argument("--connect", default=COORDINATOR_CONNECT, help=f"Endereço ZeroMQ do coordinator (apenas worker) (default: {COORDINATOR_CONNECT})")
+    parser.add_argument("--expected-workers", type=int, default=EXPECTED_WORKERS, help=f"Número de workers que o coordinator aguarda antes de iniciar (default: {EXPECTED_WORKERS})")
+
+    # Raw results
+    parser.add_argument("--result-sink", choices=RESULT_SINKS, default=RESULT_SINKS[0], help=f"Destino dos resultados brutos: memory (salvos ao final da fase), csv (gravados incrementalmente em segundo plano) ou records (arrays compactos em memória, com out.npz para o Stats) (default: {RESULT_SINKS[0]})")
+    parser.add_argument("--report-interval", type=float, default=REPORT_INTERVAL, help=f"Intervalo (segundos) das métricas ao vivo gravadas em timeseries.csv; 0 desabilita (default: {REPORT_INTERVAL})")
+    parser.add_argument("--loop-backend", choices=LOOP_BACKENDS, default=LOOP_BACKENDS[0], help=f"Implementação do event loop das fases: asyncio (loop padrão) ou uvloop (requer `pip install uvloop`; sem ele usa o padrão) (default: {LOOP_BACKENDS[0]})")
+    parser.add_argument("--loop-monitor-interval", type=float, default=LOOP_MONITOR_INTERVAL, help=f"Intervalo (segundos) de amostragem do atraso e da CPU do event loop gravados em loop.csv; 0 desabilita (default: {LOOP_MONITOR_INTERVAL})")
+
+    # HTTP connection pool
+    parser.add_argument("--shared-pool", action="store_true", help="Compartilha um único pool de conexões HTTP entre todos os usuários, fases e repetições")
+    parser.add_argument("--connector-limit", type=int, default=CONNECTOR_LIMIT, help=f"Limite global de conexões do pool (default: {CONNECTOR_LIMIT})")
+    parser.add_argument("--connector-limit-per-host", type=int, default=CONNECTOR_LIMIT_PER_HOST, help=f"Limite de conexões por host (0 = sem limite) (default: {CONNECTOR_LIMIT_PER_HOST})")
+
+    # Wallets
+    parser.add_argument("--wallet-pool", action="store_true", help="Reutiliza carteiras persistidas em disco entre repetições, runs e execuções; autoriza e financia apenas as que precisam")
+    parser.add_argument("--wallet-pool-file", default=WALLET_POOL_FILE, help=f"Arquivo do pool de carteiras (default: {WALLET_POOL_FILE})")
+    parser.add_argument("--min-balance", type=float, default=WALLET_MIN_BALANCE, help=f"Saldo mínimo (ETH) abaixo do qual uma carteira do pool é recarregada (default: {WALLET_MIN_BALANCE})")
+
+    parser.add_argument("--signer", choices=SIGNER_MODES, default=SIGNER_MODES[0], help=f"Onde as transações são assinadas: inline (no event loop), thread (pool de threads) ou process (pool de processos; com --signer-workers 1 é um processo assinador dedicado) (default: {SIGNER_MODES[0]})")
+    parser.add_argument("--signer-workers", type=int, default=SIGNER_WORKERS, help=f"Número de threads/processos assinadores (default: {SIGNER_WORKERS})")
+    parser.add_argument("--max-in-flight-tx", type=int, default=MAX_IN_FLIGHT_TX, help=f"Transações de cada usuário aguardando recibo enquanto os próximos passos executam (1 = aguarda cada recibo) (default: {MAX_IN_FLIGHT_TX})")
+
+    # API responses
+    parser.add_argument("--read-only-response", choices=RESPONSE_POLICIES, default=READ_ONLY_RESPONSE, help=f"Tratamento do corpo das respostas API-READ-ONLY: discard (lido e descartado), light (verifica se é JSON) ou full (decodificado, com orjson se instalado) (default: {READ_ONLY_RESPONSE})")
+    parser.add_argument("--http-trace", action="store_true", help="Decompõe o tempo de cada requisição à API (espera no pool de conexões, DNS, conexão, TTFB e transferência do corpo) em colunas extras do out.csv, via aiohttp.TraceConfig")
+
+    # Self-benchmark (tester against local stand-in API and JSON-RPC servers)
+    parser.add_argument("--self-benchmark", action="store_true", help="Mede a vazão máxima e o overhead de latência do próprio testador contra servidores substitutos locais (API e JSON-RPC), sem rede externa")
+    parser.add_argument("--bench-workers", type=int, nargs="+", default=SELF_BENCHMARK_WORKERS, help=f"Números de processos geradores avaliados no self-benchmark (default: {SELF_BENCHMARK_WORKERS})")
+    parser.add_argument("--bench-users", type=int, default=SELF_BENCHMARK_USERS, help=f"Usuários no self-benchmark (default: {SELF_BENCHMARK_USERS})")
+    parser.add_argument("--bench-duration", type=float, default=SELF_BENCHMARK_DURATION, help=f"Duração de cada medição do self-benchmark (segundos) (default: {SELF_BENCHMARK_DURATION})")
+    parser.add_argument("--bench-latency", default=SELF_BENCHMARK_LATENCY, help=f"Latência dos servidores substitutos em ms para medir o overhead: constant:10, uniform:5:20, exp:10 ou lognormal:10:0.5 (default: {SELF_BENCHMARK_LATENCY})")
+    parser.add_argument("--bench-loop-backends", choices=LOOP_BACKENDS, nargs="+", default=LOOP_BACKENDS, help=f"Implementações de event loop comparadas no self-benchmark (as não instaladas são ignoradas) (default: {LOOP_BACKENDS})")
+    parser.add_argument("--bench-block-time", type=float, default=STANDIN_BLOCK_TIME, help=f"Intervalo entre blocos do JSON-RPC substituto (segundos) (default: {STANDIN_BLOCK_TIME})")
+
     # Repetition
     parser.add_argument("--repeat", type=int, default=REPEAT, help=f"Número de vezes para repetir cada configuração de execução (default: {REPEAT})")
 
@@ -264,6 +414,9 @@ def main():
 
     args = parser.parse_args()
 
+    if args.role != "standalone" and not COORDINATOR_SECRET:
+        parser.error(f"--role {args.role} requires the COORDINATOR_SECRET environment variable (same value on the coordinator and every worker)")
+
     # If --plot is provided, only generate plots and exit
     if args.plot:
         if not os.path.exists(args.plot):
@@ -305,6 +458,31 @@ def main():
         return
 
     timestamp = datetime.datetime.now().strftime("%d-%m-%Y_%H-%M-%S")
+
+    # A worker only executes the shards handed out by the coordinator
+    if args.role == "worker":
+        worker_directory = save.create_results_directory(timestamp=f"{timestamp}_worker")
+        log.setup_logging(results_directory=worker_directory, verbosity=args.verbosity)
+        run_worker(connect=args.connect, secret=COORDINATOR_SECRET, name=os.uname().nodename)
+        return
+
+    # The self-benchmark only exercises the tester against the local stand-in servers
+    if args.self_benchmark:
+        bench_directory = save.create_results_directory(timestamp=f"{timestamp}_self-benchmark")
+        log.setup_logging(results_directory=bench_directory, verbosity=args.verbosity)
+        run_self_benchmark(
+            results_directory=bench_directory,
+            workers_list=args.bench_workers,
+            users=args.bench_users,
+            duration=args.bench_duration,
+            latency=args.bench_latency,
+            mode=args.mode,
+            contract=args.contract if args.contract != "both" else "erc721",
+            block_time=args.bench_block_time,
+            loop_backends=args.bench_loop_backends,
+        )
+        return
+
     results_directory = save.create_results_directory(timestamp=timestamp)
     log.setup_logging(results_directory=results_directory, verbosity=args.verbosity)
 
@@ -321,6 +499,20 @@ def main():
 
         combos = list(zip(users, step_users, interval_users, duration))
 
+    # A profile defines its own durations; user profiles also define the number of users
+    profile = None
+    if args.run == "profile":
+        if not args.profile:
+            parser.error("--run profile requires --profile <file.json>")
+        profile = LoadProfile.load(args.profile)
+        if profile.unit == "users":
+            combos = [(int(math.ceil(profile.max_target)), None, None, profile.duration)]
+        else:
+            combos = [(users, None, None, profile.duration) for users in dict.fromkeys(args.users)]
+
+    if args.run == "corpus" and args.mode != "api-blockchain":
+        parser.error("--run corpus requires --mode api-blockchain")
+
     contracts_to_run = ["erc721", "erc1155"] if args.contract == "both" else [args.contract]
 
     runs = ["static", "ramp-up"] if args.run == "both" else [args.run]
@@ -339,13 +531,59 @@ def main():
         combos=combos,
         interval_requests=args.interval_requests,
         total_runs=total_runs,
-        total_runs_all=total_runs_all
+        total_runs_all=total_runs_all,
+        arrival_rate=args.arrival_rate,
+        arrival_distribution=args.arrival_distribution,
+        profile=profile,
     )
 
+    # One connector for the whole session (reused by warm-up, runs and repetitions)
+    connection_pool = None
+    if args.shared_pool:
+        connection_pool = SharedConnectionPool(
+            limit=args.connector_limit,
+            limit_per_host=args.connector_limit_per_host,
+            loop_backend=args.loop_backend
+        )
+
+    # LoadTester options shared by the warm-up and every run
+    tester_options = {
+        "connection_pool": connection_pool,
+        "expected_interval": args.expected_interval,
+        "workers": args.workers,
+        "result_sink": args.result_sink,
+        "report_interval": args.report_interval,
+        "loop_monitor_interval": args.loop_monitor_interval,
+        "loop_backend": args.loop_backend,
+        "signer": args.signer,
+        "signer_workers": args.signer_workers,
+        "max_in_flight_tx": args.max_in_flight_tx,
+        "read_only_response": args.read_only_response,
+        "http_trace": args.http_trace,
+        "corpus_size": args.corpus_size or None,
+    }
+
+    # Wallets sized to the largest user count of the sweep, funded and authorized on demand
+    if args.wallet_pool:
+        wallet_pool = WalletPool.load(args.wallet_pool_file)
+        pool_size = max([users for (users, _, _, _) in combos] + ([args.warmup_users] if args.warmup_duration else []))
+        wallet_pool.ensure(pool_size)
+        logging.info(f"[WalletPool] Using {pool_size} of {len(wallet_pool)} wallets from {args.wallet_pool_file}")
+        tester_options["wallet_pool"] = wallet_pool
+        tester_options["min_balance"] = args.min_balance
+
+    coordinator = None
+    if args.role == "coordinator":
+        coordinator = Coordinator(bind=args.bind, expected_workers=args.expected_workers, secret=COORDINATOR_SECRET)
+        coordinator.wait_for_workers()
+        tester_options["coordinator"] = coordinator
+        tester_options["workers"] = coordinator.worker_count
+
     # Warm-up execution
     if args.warmup_duration:
         contract =  contracts_to_run[0]
-        run = runs[0]
+        # Profiles and corpus runs warm up with a static load
+        run = runs[0] if runs[0] not in ("profile", "corpus") else "static"
         
         run_warmup(
             run=run,
@@ -357,6 +595,9 @@ def main():
             interval_requests=args.warmup_interval_requests,
             step_users=args.warmup_step_users if run == "ramp-up" else None,
             interval_users=args.warmup_interval_users if run == "ramp-up" else None,
+            arrival_rate=args.arrival_rate,
+            arrival_distribution=args.arrival_distribution,
+            tester_options=tester_options,
         )
 
 
@@ -384,7 +625,11 @@ def main():
                         interval_requests=args.interval_requests,
                         step_users=step_users if run == "ramp-up" else None,
                         interval_users=interval_users if run == "ramp-up" else None,
-                        repetition_index=rep
+                        repetition_index=rep,
+                        arrival_rate=args.arrival_rate,
+                        arrival_distribution=args.arrival_distribution,
+                        profile=profile,
+                        tester_options=tester_options
                     )
 
                 # After all repetitions for this config, consolidate stats
@@ -392,6 +637,12 @@ def main():
                     save.consolidate_stats(run_dir, "api-tx-build")
                     save.consolidate_stats(run_dir, "api-read-only")
 
+    if connection_pool is not None:
+        connection_pool.close()
+
+    if coordinator is not None:
+        coordinator.close()
+
     # Generate analysis plots
     try:
         generate_plots(results_directory)
@@ -0,0 +1,155 @@
+import os
+import csv
+import time
+import asyncio
+import logging
+import threading
+
+# Internal imports
+from histogram import HistogramSet
+
+REPORT_PERCENTILES = (.5, .9, .99)
+
+# Row that aggregates every task/endpoint of the interval
+TOTAL = "ALL"
+
+
+def timeseries_path(output_file: str) -> str:
+    """Path of the time series written next to an out*.csv file (out_rep-1.csv -> timeseries_rep-1.csv)."""
+    directory, filename = os.path.split(output_file)
+    return os.path.join(directory, filename.replace("out", "timeseries", 1))
+
+
+class MetricsReporter:
+    """
+    Writes interval metrics of a running phase to timeseries.csv.
+
+    Every `interval` seconds one row per (task, endpoint) seen in the interval,
+    plus an "ALL" row, is written with the interval throughput, success/fail
+    counts, the requests in flight at that moment and latency percentiles of
+    the results that completed in the interval. Rows are flushed right away,
+    so throughput collapses and latency knees are visible while the run goes on.
+
+    Inside the event loop it runs as a task (`run()`); when the phase runs in
+    worker processes the parent drives it from a thread (`start_thread()`).
+    """
+
+    def __init__(self, path: str, interval: float, in_flight=None, percentiles=REPORT_PERCENTILES):
+        self.path = path
+        self.interval = interval
+        self.percentiles = percentiles
+
+        # Callable returning the number of calls in flight (None when unknown)
+        self.in_flight = in_flight or (lambda: None)
+
+        self.fieldnames = [
+            "timestamp", "elapsed", "task", "endpoint",
+            "requests", "rps", "success", "fail", "in_flight", "mean",
+        ] + [f"p{int(p * 100)}" for p in percentiles]
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._reset_window()
+
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        self._writer.writeheader()
+        self._file.flush()
+
+        self._start_time = self._window_start = time.perf_counter()
+
+    def _reset_window(self):
+        self._histograms = HistogramSet()
+        self._status = {}
+
+    def record(self, result: dict):
+        key = (str(result.get("task")), str(result.get("endpoint")))
+        success = result.get("status") == "success"
+
+        with self._lock:
+            self._histograms.record(result)
+            counts = self._status.setdefault(key, [0, 0])
+            counts[0 if success else 1] += 1
+
+    def _row(self, task, endpoint, counts, histogram, elapsed, window, in_flight):
+        requests = counts[0] + counts[1]
+        row = {
+            "timestamp": int(time.time()),
+            "elapsed": round(elapsed, 2),
+            "task": task,
+            "endpoint": endpoint,
+            "requests": requests,
+            "rps": round(requests / window, 2) if window > 0 else 0.0,
+            "success": counts[0],
+            "fail": counts[1],
+            "in_flight": in_flight,
+        }
+        if histogram is not None and histogram.count:
+            row["mean"] = round(histogram.mean, 5)
+            for p in self.percentiles:
+                row[f"p{int(p * 100)}"] = round(histogram.percentile(p), 5)
+        return row
+
+    def flush(self):
+        """Writes the rows of the current interval and starts a new one."""
+        with self._lock:
+            histograms, status = self._histograms, self._status
+            self._reset_window()
+
+        now = time.perf_counter()
+        window = now - self._window_start
+        self._window_start = now
+        elapsed = now - self._start_time
+        in_flight = self.in_flight()
+
+        by_endpoint = histograms.combined(by=("task", "endpoint"))
+        total_counts = [sum(c[0] for c in status.values()), sum(c[1] for c in status.values())]
+        total_histogram = histograms.combined(by=()).get(())
+
+        rows = [self._row(TOTAL, TOTAL, total_counts, total_histogram, elapsed, window, in_flight)]
+        for (task, endpoint), counts in sorted(status.items()):
+            rows.append(self._row(task, endpoint, counts, by_endpoint.get((task, endpoint)), elapsed, window, in_flight))
+
+        try:
+            self._writer.writerows(rows)
+            self._file.flush()
+        except Exception as e:
+            logging.error(f"[Reporter] Failed to write {self.path}: {e}")
+
+    async def run(self):
+        """Event loop task: flushes every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def _thread_loop(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start_thread(self):
+        self._thread = threading.Thread(target=self._thread_loop, name="metrics-reporter", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops the reporting thread (if any), writes the last partial interval and closes the file."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class ReportedResults:
+    """Phase results wrapper that also feeds the reporter (results streamed back by worker shards)."""
+
+    def __init__(self, results, reporter: MetricsReporter):
+        self.results = results
+        self.reporter = reporter
+
+    def append(self, result: dict):
+        self.results.append(result)
+        self.reporter.record(result)
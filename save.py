@@ -9,6 +9,9 @@ from stats import Stats
 # Internal imports
 from log import SIZE
 from config import RESULTS_DIR, ARGS_RUN_FILENAME, ARGS_FILENAME, RESUME_RUN_FILENAME
+from sinks import ResultSink, RESULT_FIELDNAMES, HTTP_TIMING_FIELDS
+from histogram import HistogramSet
+from loop_monitor import GENERATOR_FIELDNAMES, loop_path, save_windows, load_windows, summarize_windows
 
 def _create_directory(directory_path: str):
     os.makedirs(directory_path, exist_ok=True)
@@ -31,7 +34,7 @@ def create_directory(current_directory, child_directory):
     return directory
 
 
-def save_run_args(run_directory, host, mode, contract, run, duration, users, step_users, interval_users, interval_requests, repeat):
+def save_run_args(run_directory, host, mode, contract, run, duration, users, step_users, interval_users, interval_requests, repeat, arrival_rate=None, arrival_distribution=None, profile=None):
     """
     Save run configuration parameters into a JSON file.
 
@@ -53,6 +56,15 @@ def save_run_args(run_directory, host, mode, contract, run, duration, users, ste
         "repeat": repeat,
     }
 
+    if run in ("arrival-rate", "corpus"):
+        args_data["arrival-rate"] = arrival_rate
+        args_data["arrival-distribution"] = arrival_distribution
+
+    if run == "profile" and profile is not None:
+        args_data["profile"] = profile.to_dict()
+        if profile.unit == "rps":
+            args_data["arrival-distribution"] = arrival_distribution
+
     with open(args_file, "w") as f:
         json.dump(args_data, f, indent=2)
 
@@ -89,15 +101,7 @@ def save_results_args(results_directory, args):
 
 
 def save_results(results, output_file: str):
-    fieldnames = [
-        "timestamp",
-        "user_id",
-        "request",
-        "task",
-        "endpoint",
-        "duration",
-        "status",
-    ]
+    fieldnames = RESULT_FIELDNAMES
 
     filtered_rows = [
         {field: entry.get(field) for field in fieldnames}
@@ -112,14 +116,15 @@ def save_results(results, output_file: str):
 
 def save_global_performance_summary(
     path, users, duration, api_reqs, bc_reqs, total_reqs, rps, phase,
-    api_success=0, api_fail=0, bc_success=0, bc_fail=0
+    api_success=0, api_fail=0, bc_success=0, bc_fail=0, generator=None
 ):
-    """Saves the global execution summary to a CSV file."""
+    """Saves the global execution summary to a CSV file (with the load generator loop summary, when sampled)."""
     file_exists = os.path.isfile(path)
     fieldnames = [
         "phase", "users", "duration", "total_api", "total_bc", "total_requests", "rps",
         "api_success", "api_fail", "bc_success", "bc_fail"
-    ]
+    ] + GENERATOR_FIELDNAMES
+    generator = generator or {}
     
     try:
         with open(path, "a", newline="") as csvfile:
@@ -138,12 +143,37 @@ def save_global_performance_summary(
                 "api_success": api_success,
                 "api_fail": api_fail,
                 "bc_success": bc_success,
-                "bc_fail": bc_fail
+                "bc_fail": bc_fail,
+                **{field: generator.get(field) for field in GENERATOR_FIELDNAMES}
             })
     except Exception as e:
         print(f"[Save] Failed to save global summary: {e}")
 
 
+def histogram_path(output_file: str) -> str:
+    """Path of the latency histograms saved next to an out*.csv file (out_rep-1.csv -> histogram_rep-1.json)."""
+    directory, filename = os.path.split(output_file)
+    name = os.path.splitext(filename)[0].replace("out", "histogram", 1)
+    return os.path.join(directory, f"{name}.json")
+
+
+def reverts_path(output_file: str) -> str:
+    """Path of the reverted transactions saved next to an out*.csv file (out_rep-1.csv -> reverts_rep-1.csv)."""
+    directory, filename = os.path.split(output_file)
+    return os.path.join(directory, filename.replace("out", "reverts", 1))
+
+
+REVERT_FIELDNAMES = ["user_id", "request", "tx_hash", "block", "reason"]
+
+
+def save_reverts(reverts, output_file):
+    """Saves the reverted transactions of a phase and their revert reasons."""
+    with open(output_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=REVERT_FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(reverts)
+
+
 def save_all_outputs(run_data, phase_name, output_file):
     """
     Saves all test outputs: raw results, global summary, and detailed statistics.
@@ -153,6 +183,28 @@ def save_all_outputs(run_data, phase_name, output_file):
 
     logging.info(f"Saving raw outputs for phase: {phase_name}")
     results = run_data.get("results", [])
+
+    histograms = run_data.get("histograms")
+    if histograms is not None:
+        histograms.save(histogram_path(output_file))
+        logging.info(f"\t- Latency histograms saved: {histogram_path(output_file)}")
+
+    loop_windows = run_data.get("loop")
+    if loop_windows:
+        save_windows(loop_windows, loop_path(output_file))
+        logging.info(f"\t- Event loop samples saved: {loop_path(output_file)}")
+
+    reverts = run_data.get("reverts")
+    if reverts:
+        save_reverts(reverts, reverts_path(output_file))
+        logging.info(f"\t- Reverted transactions saved: {reverts_path(output_file)} ({len(reverts)} rows)")
+
+    # Sinks already hold (or wrote) the rows, they only need to be finalized
+    if isinstance(results, ResultSink):
+        results.close()
+        logging.info(f"\t- Raw results saved by sink: {output_file} ({len(results)} rows)")
+        return
+
     save_results(results, output_file)
     logging.info(f"\t- Raw results saved: {output_file}")
 
@@ -226,6 +278,16 @@ def consolidate_stats(run_directory, phase_name):
         for p in percentile_cols:
             agg_map[p] = ["mean"]
 
+        # Coordinated-omission corrected metrics (mean across reps, like percentiles)
+        corrected_cols = [c for c in all_df.columns if c.startswith("corrected_")]
+        for c in corrected_cols:
+            agg_map[c] = ["max"] if c == "corrected_max" else ["mean"]
+
+        # HTTP timing breakdown (pool_wait_mean, ttfb_p99, ...), mean across reps
+        timing_cols = [c for c in all_df.columns if c.startswith(tuple(f"{f}_" for f in HTTP_TIMING_FIELDS))]
+        for c in timing_cols:
+            agg_map[c] = ["mean"]
+
         # Perform aggregation
         grouped = all_df.groupby(group_cols).agg(agg_map)
         
@@ -286,6 +348,11 @@ def consolidate_stats(run_directory, phase_name):
                 if not gs.empty:
                     row = gs.iloc[0]
                     duration = row.get("total_time", 0)
+
+                    # Saturation of the load generator during this repetition (loop_rep-N.csv)
+                    generator = None
+                    if os.path.exists(loop_path(of)):
+                        generator = summarize_windows(load_windows(loop_path(of)))
                     
                     if phase_name == "api-tx-build":
                         save_global_performance_summary(
@@ -300,7 +367,8 @@ def consolidate_stats(run_directory, phase_name):
                             api_success=row.get("success_api", 0),
                             api_fail=row.get("fails_api", 0),
                             bc_success=row.get("success_blockchain", 0),
-                            bc_fail=row.get("fails_blockchain", 0)
+                            bc_fail=row.get("fails_blockchain", 0),
+                            generator=generator
                         )
                     else: # api-read-only
                         save_global_performance_summary(
@@ -313,11 +381,28 @@ def consolidate_stats(run_directory, phase_name):
                             rps=row.get("rps_api", 0),
                             phase=phase_name,
                             api_success=row.get("success", 0),
-                            api_fail=row.get("fails", 0)
+                            api_fail=row.get("fails", 0),
+                            generator=generator
                         )
             except Exception as e:
                 logging.warning(f"Failed to process global metrics for {of}: {e}")
                 
         logging.info(f"\t- Consolidated Global Stats saved  : {path_stats_global}")
 
+    # 4. Percentiles from the merged latency histograms of every repetition
+    histogram_files = [histogram_path(of) for of in sorted(out_files) if os.path.exists(histogram_path(of))]
+    if histogram_files:
+        merged = HistogramSet()
+        for hf in histogram_files:
+            try:
+                merged.merge(HistogramSet.load(hf))
+            except Exception as e:
+                logging.warning(f"[Consolidate] Failed to load histograms {hf}: {e}")
+
+        path_stats_histogram = os.path.join(phase_dir, "stats_histogram.csv")
+        df_histogram = pd.DataFrame(merged.summary())
+        if not df_histogram.empty:
+            df_histogram.to_csv(path_stats_histogram, index=False)
+            logging.info(f"\t- Histogram percentiles (merged)   : {path_stats_histogram}")
+
 
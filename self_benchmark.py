@@ -0,0 +1,189 @@
+import os
+import csv
+import logging
+import multiprocessing as mp
+
+import numpy as np
+
+# Internal imports
+import log
+from load_tester import LoadTester
+from users.user_erc721 import UserERC721
+from users.user_erc1155 import UserERC1155
+from wallet.config import set_rpc_url
+from standin import LatencyModel, run_standin
+from event_loop import available_backends
+from config import STANDIN_API_PORT, STANDIN_RPC_PORT, STANDIN_BLOCK_TIME
+
+SELF_BENCHMARK_FILENAME = "self_benchmark.csv"
+
+SELF_BENCHMARK_FIELDNAMES = [
+    "latency", "loop_backend", "mode", "contract", "phase", "workers", "users", "duration",
+    "requests", "rps", "rps_per_core", "api_mean_ms", "api_p50_ms", "api_p99_ms", "overhead_ms",
+]
+
+PHASES = ["api-read-only", "api-tx-build"]
+
+
+class StandInProcess:
+    """Runs the stand-in servers in their own process (and core) for one latency setting."""
+
+    def __init__(self, latency: str, block_time: float = STANDIN_BLOCK_TIME, host: str = "127.0.0.1"):
+        self.latency = latency
+        self.block_time = block_time
+        self.host = host
+        self.process = None
+
+    @property
+    def api_url(self) -> str:
+        return f"http://{self.host}:{STANDIN_API_PORT}"
+
+    @property
+    def rpc_url(self) -> str:
+        return f"http://{self.host}:{STANDIN_RPC_PORT}"
+
+    def __enter__(self):
+        ctx = mp.get_context("spawn")
+        ready = ctx.Event()
+        self.process = ctx.Process(
+            target=run_standin,
+            args=(self.host, STANDIN_API_PORT, STANDIN_RPC_PORT, self.latency, self.latency, self.block_time, ready),
+            daemon=True
+        )
+        self.process.start()
+        if not ready.wait(timeout=30):
+            self.process.terminate()
+            raise RuntimeError("Stand-in servers did not start")
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join(timeout=10)
+
+
+def _api_latencies(results) -> np.ndarray:
+    """Durations (seconds) of the API rows of a phase (the ones the stand-in latency applies to)."""
+    return np.array([
+        result["duration"] for result in results
+        if str(result.get("task", "")).startswith("API-")
+        and isinstance(result.get("duration"), (int, float)) and result["duration"] >= 0
+    ])
+
+
+def _measure(api_url, mode, contract, phase, workers, users, duration, latency: LatencyModel, loop_backend: str) -> dict:
+    """Runs one static phase against the stand-in and derives the tester's throughput and overhead."""
+    tester = LoadTester(
+        host=api_url,
+        mode=mode,
+        contract=contract,
+        duration=duration,
+        user_cls=UserERC721 if contract == "erc721" else UserERC1155,
+        users=users,
+        interval_requests=0,
+        workers=workers,
+        loop_backend=loop_backend,
+        prepare_wallets=False,
+    )
+
+    try:
+        run_data = tester.run_static_load(phase)
+    finally:
+        tester.close()
+
+    stats = run_data["global_stats"]
+    latencies = _api_latencies(run_data["results"])
+
+    row = {
+        "latency": str(latency),
+        "loop_backend": loop_backend,
+        "mode": mode,
+        "contract": contract,
+        "phase": phase,
+        "workers": tester.workers,
+        "users": users,
+        "duration": duration,
+        "requests": stats["total"],
+        "rps": round(stats["rps"], 2),
+        "rps_per_core": round(stats["rps"] / tester.workers, 2),
+        "api_mean_ms": None,
+        "api_p50_ms": None,
+        "api_p99_ms": None,
+        "overhead_ms": None,
+    }
+
+    if len(latencies):
+        row["api_mean_ms"] = round(latencies.mean() * 1000, 3)
+        row["api_p50_ms"] = round(float(np.percentile(latencies, 50)) * 1000, 3)
+        row["api_p99_ms"] = round(float(np.percentile(latencies, 99)) * 1000, 3)
+        # Measured minus served: what the client side adds to every request
+        row["overhead_ms"] = round((latencies.mean() - latency.mean) * 1000, 3)
+
+    return row
+
+
+def run_self_benchmark(
+    results_directory: str,
+    workers_list: list,
+    users: int,
+    duration: float,
+    latency: str,
+    mode: str = "api-only",
+    contract: str = "erc721",
+    block_time: float = STANDIN_BLOCK_TIME,
+    loop_backends: list = None
+) -> str:
+    """
+    Benchmarks the tester itself against the local stand-in servers, offline.
+
+    With zero server latency every request is pure client cost, so the RPS
+    reached with W worker processes is the tester ceiling (per core =
+    RPS / W). With `latency` (known service time) the mean API latency minus
+    the served mean is the overhead the tester adds to each measurement.
+    Every measurement is repeated for each event loop backend in
+    `loop_backends` (the ones not installed are skipped). Results go to
+    self_benchmark.csv.
+    """
+    rows = []
+
+    installed = available_backends()
+    skipped = [backend for backend in loop_backends or installed if backend not in installed]
+    if skipped:
+        logging.warning(f"[SELF-BENCHMARK] Loop backends not installed, skipped: {', '.join(skipped)}")
+    loop_backends = [backend for backend in loop_backends or installed if backend in installed]
+
+    for latency_spec in dict.fromkeys(["none", latency]):
+        latency_model = LatencyModel(latency_spec)
+
+        with StandInProcess(latency_spec, block_time) as standin:
+            # Worker processes inherit the environment, this process is re-pointed directly
+            os.environ["BESU_RPC_URL"] = standin.rpc_url
+            set_rpc_url(standin.rpc_url)
+
+            for loop_backend in loop_backends:
+                for workers in workers_list:
+                    for phase in PHASES:
+                        logging.info("-" * log.SIZE)
+                        logging.info(f"[SELF-BENCHMARK] latency={latency_spec} loop={loop_backend} workers={workers} users={users} phase={phase}")
+                        rows.append(_measure(standin.api_url, mode, contract, phase, workers, users, duration, latency_model, loop_backend))
+
+    output_file = os.path.join(results_directory, SELF_BENCHMARK_FILENAME)
+    with open(output_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SELF_BENCHMARK_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    logging.info("=" * log.SIZE)
+    logging.info("[SELF-BENCHMARK] Results")
+    logging.info("")
+    logging.info(f"{'latency':<14} {'loop':<8} {'phase':<14} {'workers':>7} {'rps':>10} {'rps/core':>10} {'p50 ms':>9} {'p99 ms':>9} {'overhead ms':>12}")
+    for row in rows:
+        logging.info(
+            f"{row['latency']:<14} {row['loop_backend']:<8} {row['phase']:<14} {row['workers']:>7} {row['rps']:>10} {row['rps_per_core']:>10} "
+            f"{row['api_p50_ms'] if row['api_p50_ms'] is not None else '-':>9} "
+            f"{row['api_p99_ms'] if row['api_p99_ms'] is not None else '-':>9} "
+            f"{row['overhead_ms'] if row['overhead_ms'] is not None else '-':>12}"
+        )
+    logging.info("")
+    logging.info(f"Saved: {output_file}")
+
+    return output_file
@@ -0,0 +1,378 @@
+import os
+import csv
+import math
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from abc import ABC, abstractmethod
+from array import array
+
+import numpy as np
+import pandas as pd
+
+# Columns of out.csv
+RESULT_FIELDNAMES = [
+    "timestamp",
+    "user_id",
+    "request",
+    "task",
+    "endpoint",
+    "duration",
+    "status",
+    "intended_start",
+    "corrected_duration",
+]
+
+# Phases of traced API requests (--http-trace), seconds; blank for the other rows
+HTTP_TIMING_FIELDS = ["pool_wait", "dns", "connect", "ttfb", "transfer"]
+RESULT_FIELDNAMES += HTTP_TIMING_FIELDS
+
+SINK_QUEUE_SIZE = 10000
+SINK_BATCH_SIZE = 500
+SINK_FLUSH_INTERVAL = 1.0
+
+NS_PER_SECOND = 1_000_000_000
+
+# Integer code stored for a missing / non-numeric `request` (e.g. "error")
+NO_REQUEST = -1
+
+# Nanosecond timestamp stored for a missing `intended_start` (rows without a schedule)
+NO_INTENDED_START = -1
+
+_CLOSE = object()
+
+
+class ResultSink(ABC):
+    """
+    Destination of the result dicts produced during a phase.
+
+    LoadTester only calls `append()`; `save.save_all_outputs` calls `close()`
+    to finalize the sink once the phase is over.
+    """
+
+    @abstractmethod
+    def append(self, result: dict):
+        ...
+
+    def close(self):
+        pass
+
+
+class CsvStreamSink(ResultSink):
+    """
+    Writes results to a CSV file incrementally from a background thread.
+
+    `append()` only enqueues the dict and never blocks the event loop nor
+    loses a row: the queue is bounded so memory stays flat while the disk
+    keeps up, and when a stalled disk lets it fill up the rows spill to an
+    unbounded overflow deque that the writer drains after the queue (in
+    order, counted in `overflowed`). The writer thread batches rows and
+    flushes the file at least every `flush_interval` seconds, so a crash
+    mid-phase still leaves partial data.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fieldnames: list = None,
+        queue_size: int = SINK_QUEUE_SIZE,
+        batch_size: int = SINK_BATCH_SIZE,
+        flush_interval: float = SINK_FLUSH_INTERVAL
+    ):
+        self.path = path
+        self.fieldnames = fieldnames or RESULT_FIELDNAMES
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._count = 0
+        self.overflowed = 0
+        self._closed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._overflow = deque()
+
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        self._writer.writeheader()
+        self._file.flush()
+
+        self._thread = threading.Thread(target=self._write_loop, name="csv-sink", daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, result: dict):
+        self._count += 1
+
+        # Once rows spill, later ones follow them until the writer catches up (keeps the order)
+        if not self._overflow:
+            try:
+                self._queue.put_nowait(result)
+                return
+            except queue.Full:
+                if not self.overflowed:
+                    logging.warning(f"[Sink] Writer of {self.path} fell behind, buffering rows in memory")
+
+        self._overflow.append(result)
+        self.overflowed += 1
+
+    def _next(self):
+        """Next row to write: queued rows first, then the overflow (older first), None on timeout."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        if self._overflow:
+            return self._overflow.popleft()
+
+        try:
+            return self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return None
+
+    def _write_batch(self, batch):
+        try:
+            self._writer.writerows(batch)
+            self._file.flush()
+        except Exception as e:
+            logging.error(f"[Sink] Failed to write {len(batch)} rows to {self.path}: {e}")
+
+    def _write_loop(self):
+        batch = []
+        last_flush = time.monotonic()
+
+        while True:
+            item = self._next()
+
+            if item is _CLOSE:
+                # Rows that spilled before the phase ended are still written
+                batch.extend(self._overflow)
+                self._overflow.clear()
+                break
+
+            if item is not None:
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval):
+                self._write_batch(batch)
+                batch = []
+                last_flush = time.monotonic()
+
+        if batch:
+            self._write_batch(batch)
+
+    def close(self):
+        """Drains the queue, writes the remaining rows and closes the file."""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        self._file.close()
+
+        if self.overflowed:
+            logging.warning(f"[Sink] {self.overflowed} rows of {self.path} were buffered in memory, the writer fell behind (queue of {self._queue.maxsize})")
+
+
+class _Interner:
+    """Maps repeated strings (task, endpoint, status) to small integer codes."""
+
+    def __init__(self, values=None):
+        self.values = []
+        self._codes = {}
+        for value in values or []:
+            self.code(value)
+
+    def code(self, value) -> int:
+        value = "" if value is None else str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def decode(self, codes) -> np.ndarray:
+        """Vectorized code -> string lookup."""
+        return np.asarray(self.values, dtype=object)[codes] if self.values else np.array([], dtype=object)
+
+
+class RecordStore(ResultSink):
+    """
+    Struct-of-arrays storage of the phase results.
+
+    Every column is a typed `array` (int64 ns timestamps, float64 durations,
+    interned int32 codes for task/endpoint/status), so a retained result costs
+    a few dozen bytes instead of a dict with string keys, and the columns are
+    handed to pandas/numpy without any parsing.
+
+    Only the retained memory shrinks, not the allocation per request: the
+    tasks still build their result dicts (the schedule stamping, histograms,
+    live reporter and worker forwarding read them), and `append()` copies
+    each one into the arrays before it is dropped.
+
+    `close()` writes the usual out.csv (plots and manual inspection keep
+    working) plus an .npz sidecar that `Stats` loads directly.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+
+        self.timestamp = array("q")
+        self.user_id = array("q")
+        self.request = array("q")
+        self.duration = array("d")
+        self.intended_start = array("q")
+        self.corrected_duration = array("d")
+        for field in HTTP_TIMING_FIELDS:
+            setattr(self, field, array("d"))
+
+        self.task = array("i")
+        self.endpoint = array("i")
+        self.status = array("i")
+
+        self.tasks = _Interner()
+        self.endpoints = _Interner()
+        self.statuses = _Interner()
+
+        self._closed = False
+
+    def __len__(self):
+        return len(self.duration)
+
+    def record(
+        self,
+        timestamp: float,
+        user_id: int,
+        request,
+        task: str,
+        endpoint: str,
+        duration: float,
+        status: str,
+        intended_start: float = None,
+        corrected_duration: float = None,
+        timings: dict = None
+    ):
+        """Appends one result row (same fields as the result dicts, `timings` keyed by HTTP_TIMING_FIELDS)."""
+        self.timestamp.append(int(timestamp * NS_PER_SECOND))
+        self.user_id.append(int(user_id))
+        self.request.append(request if isinstance(request, int) else NO_REQUEST)
+        self.duration.append(float(duration))
+        self.intended_start.append(int(intended_start * NS_PER_SECOND) if intended_start is not None else NO_INTENDED_START)
+        self.corrected_duration.append(float(corrected_duration) if corrected_duration is not None else math.nan)
+        for field in HTTP_TIMING_FIELDS:
+            value = timings.get(field) if timings else None
+            getattr(self, field).append(float(value) if value is not None else math.nan)
+
+        self.task.append(self.tasks.code(task))
+        self.endpoint.append(self.endpoints.code(endpoint))
+        self.status.append(self.statuses.code(status))
+
+    def append(self, result: dict):
+        self.record(
+            timestamp=result.get("timestamp", 0),
+            user_id=result.get("user_id", 0),
+            request=result.get("request"),
+            task=result.get("task"),
+            endpoint=result.get("endpoint"),
+            duration=result.get("duration", -1),
+            status=result.get("status"),
+            intended_start=result.get("intended_start"),
+            corrected_duration=result.get("corrected_duration"),
+            timings=result,
+        )
+
+    def columns(self) -> dict:
+        """Raw numpy views of the arrays (no copy) plus the interned string tables."""
+        return {
+            "timestamp": np.frombuffer(self.timestamp, dtype=np.int64),
+            "user_id": np.frombuffer(self.user_id, dtype=np.int64),
+            "request": np.frombuffer(self.request, dtype=np.int64),
+            "duration": np.frombuffer(self.duration, dtype=np.float64),
+            "intended_start": np.frombuffer(self.intended_start, dtype=np.int64),
+            "corrected_duration": np.frombuffer(self.corrected_duration, dtype=np.float64),
+            **{field: np.frombuffer(getattr(self, field), dtype=np.float64) for field in HTTP_TIMING_FIELDS},
+            "task": np.frombuffer(self.task, dtype=np.int32),
+            "endpoint": np.frombuffer(self.endpoint, dtype=np.int32),
+            "status": np.frombuffer(self.status, dtype=np.int32),
+            "task_values": np.asarray(self.tasks.values, dtype=str),
+            "endpoint_values": np.asarray(self.endpoints.values, dtype=str),
+            "status_values": np.asarray(self.statuses.values, dtype=str),
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "RecordStore":
+        """Rebuilds a store from an .npz file written by `save()`."""
+        store = cls()
+        with np.load(path) as data:
+            for name in ("timestamp", "user_id", "request"):
+                getattr(store, name).frombytes(data[name].astype(np.int64).tobytes())
+            # Older sidecars stored a missing intended start as 0 (never a real epoch)
+            intended_start = data["intended_start"].astype(np.int64)
+            intended_start[intended_start == 0] = NO_INTENDED_START
+            store.intended_start.frombytes(intended_start.tobytes())
+            for name in ("duration", "corrected_duration"):
+                getattr(store, name).frombytes(data[name].astype(np.float64).tobytes())
+            # Sidecars written before the HTTP timing columns existed have none
+            for name in HTTP_TIMING_FIELDS:
+                column = data[name] if name in data.files else np.full(len(store.duration), np.nan)
+                getattr(store, name).frombytes(column.astype(np.float64).tobytes())
+            for name, interner in (("task", "tasks"), ("endpoint", "endpoints"), ("status", "statuses")):
+                getattr(store, name).frombytes(data[name].astype(np.int32).tobytes())
+                setattr(store, interner, _Interner(data[f"{name}_values"].tolist()))
+        return store
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame with the out.csv columns (epoch-second timestamps, blank when missing)."""
+        cols = self.columns()
+
+        request = pd.array(cols["request"], dtype="Int64")
+        request[cols["request"] == NO_REQUEST] = pd.NA
+
+        intended_start = cols["intended_start"] / NS_PER_SECOND
+        intended_start[cols["intended_start"] == NO_INTENDED_START] = np.nan
+
+        df = pd.DataFrame({
+            "timestamp": cols["timestamp"] // NS_PER_SECOND,
+            "user_id": cols["user_id"],
+            "request": request,
+            "task": self.tasks.decode(cols["task"]),
+            "endpoint": self.endpoints.decode(cols["endpoint"]),
+            "duration": cols["duration"],
+            "status": self.statuses.decode(cols["status"]),
+            "intended_start": intended_start,
+            "corrected_duration": cols["corrected_duration"],
+            **{field: cols[field] for field in HTTP_TIMING_FIELDS},
+        })
+        return df[RESULT_FIELDNAMES]
+
+    def save(self, path: str):
+        np.savez(path, **self.columns())
+
+    def close(self):
+        """Writes out.csv and the .npz sidecar next to it."""
+        if self._closed or not self.path:
+            return
+        self._closed = True
+
+        try:
+            self.to_dataframe().to_csv(self.path, index=False)
+            self.save(records_path(self.path))
+        except Exception as e:
+            logging.error(f"[Sink] Failed to save {len(self)} rows to {self.path}: {e}")
+
+
+def records_path(csv_path: str) -> str:
+    """Path of the .npz sidecar of an out*.csv file."""
+    return f"{os.path.splitext(csv_path)[0]}.npz"
+
+
+# Sinks selectable with --result-sink ("memory" keeps the plain in-memory list)
+SINKS = {
+    "csv": CsvStreamSink,
+    "records": RecordStore,
+}
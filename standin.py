@@ -0,0 +1,463 @@
+import math
+import time
+import random
+import asyncio
+import logging
+import argparse
+
+import rlp
+from aiohttp import web
+from eth_account import Account
+from eth_utils import keccak
+
+# Internal imports
+import campaigns
+from config import STANDIN_API_PORT, STANDIN_RPC_PORT, STANDIN_BLOCK_TIME, STANDIN_CHAIN_ID
+
+# Stand-in contract address returned in the *Tx bodies
+STANDIN_CONTRACT = "0x" + "5a" * 20
+
+# Gas limit reported by the stand-in blocks
+STANDIN_BLOCK_GAS_LIMIT = 30_000_000
+
+# Size of the fake calldata returned by the *Tx builders (bytes after the selector)
+STANDIN_CALLDATA_SIZE = 256
+
+# Latency distributions accepted by LatencyModel
+LATENCY_DISTRIBUTIONS = ["none", "constant", "uniform", "exp", "lognormal"]
+
+
+class LatencyModel:
+    """
+    Artificial service time of a stand-in route.
+
+    Specs (times in milliseconds): "none", "constant:10", "uniform:5:20",
+    "exp:10" (mean) or "lognormal:10:0.5" (median, sigma).
+    """
+
+    def __init__(self, spec: str = "none"):
+        name, *values = (spec or "none").split(":")
+        if name not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Invalid latency distribution '{name}' (expected one of {LATENCY_DISTRIBUTIONS})")
+
+        self.spec = spec or "none"
+        self.distribution = name
+        values = [float(value) for value in values]
+
+        # Times in seconds; the lognormal sigma is not a time
+        if name == "lognormal":
+            self.params = [values[0] / 1000.0, values[1] if len(values) > 1 else 0.5]
+        else:
+            self.params = [value / 1000.0 for value in values]
+
+    def sample(self) -> float:
+        if self.distribution == "constant":
+            return self.params[0]
+        if self.distribution == "uniform":
+            return random.uniform(self.params[0], self.params[1])
+        if self.distribution == "exp":
+            return random.expovariate(1.0 / self.params[0])
+        if self.distribution == "lognormal":
+            return random.lognormvariate(0.0, self.params[1]) * self.params[0]
+        return 0.0
+
+    @property
+    def mean(self) -> float:
+        """Expected service time (seconds), used to isolate the tester overhead."""
+        if self.distribution in ("constant", "exp"):
+            return self.params[0]
+        if self.distribution == "uniform":
+            return (self.params[0] + self.params[1]) / 2
+        if self.distribution == "lognormal":
+            return self.params[0] * math.exp(self.params[1] ** 2 / 2)
+        return 0.0
+
+    async def wait(self):
+        delay = self.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def __str__(self):
+        return self.spec
+
+
+def _hex(value: int) -> str:
+    return hex(value)
+
+
+def _decode_transaction(raw: bytes) -> dict:
+    """Fields of a signed legacy/EIP-2930/EIP-1559 transaction (the sender is recovered on demand)."""
+    if raw[0] > 0x7f:
+        nonce, gas_price, gas, to, value, data = rlp.decode(raw)[:6]
+        tx_type = 0
+    elif raw[0] == 1:
+        _, nonce, gas_price, gas, to, value, data = rlp.decode(raw[1:])[:7]
+        tx_type = 1
+    else:
+        _, nonce, _, gas_price, gas, to, value, data = rlp.decode(raw[1:])[:8]
+        tx_type = 2
+
+    as_int = lambda field: int.from_bytes(field, "big")
+    return {
+        "type": tx_type,
+        "nonce": as_int(nonce),
+        "gasPrice": as_int(gas_price),
+        "gas": as_int(gas),
+        "to": "0x" + to.hex() if to else None,
+        "value": as_int(value),
+        "input": "0x" + data.hex(),
+    }
+
+
+class StandInChain:
+    """
+    In-memory chain behind the stand-in JSON-RPC server.
+
+    Every accepted raw transaction is included in the next block, produced
+    every `block_time` seconds, always with status 1. Senders are recovered
+    lazily (only eth_getTransactionByHash and eth_getTransactionCount need
+    them), so accepting a transaction costs an RLP decode and a keccak.
+    """
+
+    def __init__(self, block_time: float = STANDIN_BLOCK_TIME, chain_id: int = STANDIN_CHAIN_ID):
+        self.block_time = block_time
+        self.chain_id = chain_id
+        self.blocks = [self._block(0, [])]
+        self.pending = []
+        self.transactions = {}
+        self.raw = {}
+        self.unrecovered = []
+        self.nonces = {}
+
+    def _block(self, number: int, hashes: list) -> dict:
+        return {
+            "number": number,
+            "hash": "0x" + keccak(number.to_bytes(32, "big")).hex(),
+            "parentHash": "0x" + keccak(max(0, number - 1).to_bytes(32, "big")).hex(),
+            "timestamp": int(time.time()),
+            "transactions": hashes,
+        }
+
+    def mine(self):
+        number = len(self.blocks)
+        hashes, self.pending = self.pending, []
+        block = self._block(number, hashes)
+        for index, tx_hash in enumerate(hashes):
+            tx = self.transactions[tx_hash]
+            tx["blockNumber"] = number
+            tx["blockHash"] = block["hash"]
+            tx["transactionIndex"] = index
+        self.blocks.append(block)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.block_time)
+            self.mine()
+
+    @property
+    def head(self) -> int:
+        return len(self.blocks) - 1
+
+    def _recover(self):
+        for tx_hash in self.unrecovered:
+            tx = self.transactions[tx_hash]
+            tx["from"] = Account.recover_transaction(self.raw.pop(tx_hash))
+            self.nonces[tx["from"].lower()] = max(self.nonces.get(tx["from"].lower(), 0), tx["nonce"] + 1)
+        self.unrecovered = []
+
+    def send_raw_transaction(self, raw_hex: str) -> str:
+        raw = bytes.fromhex(raw_hex[2:] if raw_hex.startswith("0x") else raw_hex)
+        tx_hash = "0x" + keccak(raw).hex()
+        if tx_hash in self.transactions:
+            raise ValueError("already known")
+
+        tx = _decode_transaction(raw)
+        tx["hash"] = tx_hash
+        tx["blockNumber"] = None
+
+        self.transactions[tx_hash] = tx
+        self.raw[tx_hash] = raw
+        self.unrecovered.append(tx_hash)
+        self.pending.append(tx_hash)
+        return tx_hash
+
+    def transaction_count(self, address: str) -> int:
+        self._recover()
+        return self.nonces.get(address.lower(), 0)
+
+    def transaction(self, tx_hash: str):
+        tx = self.transactions.get(tx_hash)
+        if tx is None:
+            return None
+        if "from" not in tx:
+            self._recover()
+        return {
+            "hash": tx["hash"],
+            "from": tx["from"],
+            "to": tx["to"],
+            "input": tx["input"],
+            "value": _hex(tx["value"]),
+            "nonce": _hex(tx["nonce"]),
+            "gas": _hex(tx["gas"]),
+            "gasPrice": _hex(tx["gasPrice"]),
+            "type": _hex(tx["type"]),
+            "chainId": _hex(self.chain_id),
+            "blockNumber": _hex(tx["blockNumber"]) if tx["blockNumber"] is not None else None,
+            "blockHash": tx.get("blockHash"),
+            "transactionIndex": _hex(tx["transactionIndex"]) if tx["blockNumber"] is not None else None,
+            "v": "0x0", "r": "0x0", "s": "0x0",
+        }
+
+    def receipt(self, tx_hash: str):
+        tx = self.transactions.get(tx_hash)
+        if tx is None or tx["blockNumber"] is None:
+            return None
+        return {
+            "transactionHash": tx["hash"],
+            "transactionIndex": _hex(tx["transactionIndex"]),
+            "blockHash": tx["blockHash"],
+            "blockNumber": _hex(tx["blockNumber"]),
+            "to": tx["to"],
+            "contractAddress": None,
+            "cumulativeGasUsed": _hex(21000 * (tx["transactionIndex"] + 1)),
+            "gasUsed": _hex(21000),
+            "effectiveGasPrice": _hex(tx["gasPrice"]),
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "type": _hex(tx["type"]),
+        }
+
+    def block(self, tag):
+        number = self.head if tag in ("latest", "pending", "safe", "finalized") else (0 if tag == "earliest" else int(tag, 16))
+        if number > self.head:
+            return None
+        block = self.blocks[number]
+        return {
+            "number": _hex(block["number"]),
+            "hash": block["hash"],
+            "parentHash": block["parentHash"],
+            "nonce": "0x0000000000000000",
+            "sha3Uncles": "0x" + "00" * 32,
+            "logsBloom": "0x" + "00" * 256,
+            "transactionsRoot": "0x" + "00" * 32,
+            "stateRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32,
+            "miner": "0x" + "00" * 20,
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "extraData": "0x",
+            "size": _hex(1000),
+            "gasLimit": _hex(STANDIN_BLOCK_GAS_LIMIT),
+            "gasUsed": _hex(21000 * len(block["transactions"])),
+            "timestamp": _hex(block["timestamp"]),
+            "transactions": block["transactions"],
+            "uncles": [],
+            "baseFeePerGas": "0x0",
+        }
+
+
+class StandInServer:
+    """
+    Local stand-in for the SmartAgroRAF API and the Besu JSON-RPC (Async).
+
+    The API app answers every route of `campaigns.py` (read-only queries and
+    *Tx builders) plus admin/setAllowedAddressesBatch; the RPC app answers the
+    JSON-RPC methods used by Wallet, the receipt tracker and wallet/admin.py.
+    Each side waits its own LatencyModel before answering, so a run against
+    the stand-in measures the tester itself (zero latency) or its overhead on
+    top of a known service time.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        api_port: int = STANDIN_API_PORT,
+        rpc_port: int = STANDIN_RPC_PORT,
+        api_latency: LatencyModel = None,
+        rpc_latency: LatencyModel = None,
+        block_time: float = STANDIN_BLOCK_TIME
+    ):
+        self.host = host
+        self.api_port = api_port
+        self.rpc_port = rpc_port
+        self.api_latency = api_latency or LatencyModel()
+        self.rpc_latency = rpc_latency or LatencyModel()
+        self.chain = StandInChain(block_time)
+
+        # Token ids minted through the *Tx builders, per address
+        self.tokens = {}
+        self.next_token_id = 1
+        self.requests = 0
+
+        self._runners = []
+        self._miner = None
+
+    @property
+    def api_url(self) -> str:
+        return f"http://{self.host}:{self.api_port}"
+
+    @property
+    def rpc_url(self) -> str:
+        return f"http://{self.host}:{self.rpc_port}"
+
+    # ---- API ----
+    def _api_app(self) -> web.Application:
+        app = web.Application()
+        routes = set()
+        for campaign in campaigns.CAMPAIGNS.values():
+            for endpoint, _ in campaign:
+                routes.add(endpoint)
+        for contract in ("erc721", "erc1155"):
+            routes.add(f"/api/{contract}/admin/setAllowedAddressesBatch")
+
+        for endpoint in sorted(routes):
+            app.router.add_post(endpoint, self._handle_api)
+        return app
+
+    async def _handle_api(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await self.api_latency.wait()
+
+        try:
+            payload = await request.json()
+        except Exception:
+            payload = {}
+
+        route = request.path.rsplit("/", 1)[-1]
+
+        if route == "setAllowedAddressesBatch":
+            return web.json_response({"success": True, "addresses": len(payload.get("addresses", []))})
+
+        if route.endswith("Tx"):
+            sender = payload.get("from")
+            if route == "mintRootBatchTx":
+                self.tokens.setdefault(str(sender).lower(), []).append(self.next_token_id)
+                self.next_token_id += 1
+            data = "0x" + keccak(route.encode())[:4].hex() + "00" * STANDIN_CALLDATA_SIZE
+            return web.json_response({"from": sender, "to": STANDIN_CONTRACT, "data": data})
+
+        if route == "getUsersBatches":
+            addresses = payload.get("userAddress") or []
+            return web.json_response({"results": [
+                {"userAddress": address, "tokenIds": self.tokens.get(str(address).lower(), [])}
+                for address in addresses
+            ]})
+
+        return web.json_response({"results": [{"route": route, "request": payload}]})
+
+    # ---- JSON-RPC ----
+    def _rpc_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/", self._handle_rpc)
+        return app
+
+    def _rpc_call(self, method: str, params: list):
+        chain = self.chain
+        if method == "eth_chainId":
+            return _hex(chain.chain_id)
+        if method == "net_version":
+            return str(chain.chain_id)
+        if method == "eth_gasPrice":
+            return _hex(1_000_000_000)
+        if method == "eth_blockNumber":
+            return _hex(chain.head)
+        if method == "eth_getBlockByNumber":
+            return chain.block(params[0])
+        if method == "eth_getTransactionCount":
+            return _hex(chain.transaction_count(params[0]))
+        if method == "eth_getBalance":
+            return _hex(10 ** 24)
+        if method == "eth_sendRawTransaction":
+            return chain.send_raw_transaction(params[0])
+        if method == "eth_getTransactionReceipt":
+            return chain.receipt(params[0])
+        if method == "eth_getTransactionByHash":
+            return chain.transaction(params[0])
+        if method == "eth_call":
+            return "0x"
+        if method == "eth_estimateGas":
+            return _hex(100_000)
+        raise NotImplementedError(method)
+
+    async def _handle_rpc(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await self.rpc_latency.wait()
+
+        body = await request.json()
+        calls = body if isinstance(body, list) else [body]
+
+        responses = []
+        for call in calls:
+            response = {"jsonrpc": "2.0", "id": call.get("id")}
+            try:
+                response["result"] = self._rpc_call(call.get("method"), call.get("params") or [])
+            except NotImplementedError as e:
+                response["error"] = {"code": -32601, "message": f"Method not found: {e}"}
+            except Exception as e:
+                response["error"] = {"code": -32000, "message": str(e)}
+            responses.append(response)
+
+        return web.json_response(responses if isinstance(body, list) else responses[0])
+
+    # ---- Lifecycle ----
+    async def start(self):
+        for app, port in ((self._api_app(), self.api_port), (self._rpc_app(), self.rpc_port)):
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, self.host, port).start()
+            self._runners.append(runner)
+
+        self._miner = asyncio.create_task(self.chain.run())
+        logging.info(
+            f"[StandIn] API {self.api_url} (latency {self.api_latency}) | "
+            f"RPC {self.rpc_url} (latency {self.rpc_latency}, block time {self.chain.block_time}s)"
+        )
+
+    async def stop(self):
+        if self._miner is not None:
+            self._miner.cancel()
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners = []
+
+
+def run_standin(host, api_port, rpc_port, api_latency: str, rpc_latency: str, block_time: float, ready=None):
+    """Process entry point: serves until terminated (`ready` is set once both ports listen)."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    async def main():
+        server = StandInServer(
+            host=host,
+            api_port=api_port,
+            rpc_port=rpc_port,
+            api_latency=LatencyModel(api_latency),
+            rpc_latency=LatencyModel(rpc_latency),
+            block_time=block_time
+        )
+        await server.start()
+        if ready is not None:
+            ready.set()
+        try:
+            while True:
+                await asyncio.sleep(3600)
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor substituto local (API SmartAgroRAF + JSON-RPC Besu)")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (default: 127.0.0.1)")
+    parser.add_argument("--api-port", type=int, default=STANDIN_API_PORT, help=f"Porta da API (default: {STANDIN_API_PORT})")
+    parser.add_argument("--rpc-port", type=int, default=STANDIN_RPC_PORT, help=f"Porta do JSON-RPC (default: {STANDIN_RPC_PORT})")
+    parser.add_argument("--api-latency", default="none", help="Latência da API em ms: none, constant:10, uniform:5:20, exp:10 ou lognormal:10:0.5 (default: none)")
+    parser.add_argument("--rpc-latency", default="none", help="Latência do JSON-RPC, mesmo formato de --api-latency (default: none)")
+    parser.add_argument("--block-time", type=float, default=STANDIN_BLOCK_TIME, help=f"Intervalo entre blocos (segundos) (default: {STANDIN_BLOCK_TIME})")
+    args = parser.parse_args()
+
+    run_standin(args.host, args.api_port, args.rpc_port, args.api_latency, args.rpc_latency, args.block_time)
@@ -2,6 +2,9 @@ import csv
 import os
 import pandas as pd
 
+# Internal imports
+from sinks import RecordStore, records_path, HTTP_TIMING_FIELDS
+
 class Stats:
     """
     Aggregates statistics over one or more CSV result files.
@@ -16,18 +19,31 @@ class Stats:
         frames = []
 
         for path, _label in files:
+            # Files saved by the "records" sink have a binary sidecar: no CSV parsing
+            if os.path.exists(records_path(path)):
+                frames.append(self._records_frame(RecordStore.load(records_path(path))))
+                continue
+
             df = pd.read_csv(path)
             
             # Ensure duration and timestamp are numeric
             df["duration"] = pd.to_numeric(df["duration"], errors="coerce")
             if "timestamp" in df.columns:
                 df["timestamp"] = pd.to_numeric(df["timestamp"], errors="coerce")
+            for column in ["corrected_duration"] + HTTP_TIMING_FIELDS:
+                if column in df.columns:
+                    df[column] = pd.to_numeric(df[column], errors="coerce")
             
             df.dropna(subset=["duration"], inplace=True)
             frames.append(df)
 
         self.df = pd.concat(frames, ignore_index=True)
 
+    @staticmethod
+    def _records_frame(store: RecordStore):
+        df = store.to_dataframe()
+        return df[df["duration"].notna()]
+
     # ---- Helpers ----
     def _compute_stats(self, group: pd.DataFrame):
         count = len(group)
@@ -51,12 +67,39 @@ class Stats:
         for p in self.percentiles:
             stats[f"p{int(p * 100)}"] = group["duration"].quantile(p)
 
+        # Coordinated-omission corrected latency (completion - intended start)
+        if "corrected_duration" in group.columns:
+            corrected = group["corrected_duration"][group["corrected_duration"] >= 0]
+            if not corrected.empty:
+                stats["corrected_mean"] = corrected.mean()
+                stats["corrected_max"] = corrected.max()
+                for p in self.percentiles:
+                    stats[f"corrected_p{int(p * 100)}"] = corrected.quantile(p)
+
+        # HTTP timing breakdown of traced requests (--http-trace)
+        for field in HTTP_TIMING_FIELDS:
+            if field in group.columns:
+                timing = group[field].dropna()
+                if not timing.empty:
+                    stats[f"{field}_mean"] = timing.mean()
+                    for p in self.percentiles:
+                        stats[f"{field}_p{int(p * 100)}"] = timing.quantile(p)
+
         return pd.Series(stats)
 
+    def _value_columns(self, *columns):
+        """Columns passed to _compute_stats (adds corrected_duration and traced HTTP timings when loaded)."""
+        extra = ["corrected_duration"] if "corrected_duration" in self.df.columns else []
+        extra += [
+            field for field in HTTP_TIMING_FIELDS
+            if field in self.df.columns and self.df[field].notna().any()
+        ]
+        return list(columns) + extra
+
     # ---- Stats by dimensions ----
     def stats_by_task(self):
         return (
-            self.df.groupby("task")[["duration", "status"]]
+            self.df.groupby("task")[self._value_columns("duration", "status")]
             .apply(lambda g: self._compute_stats(g))
             .reset_index()
         )
@@ -73,14 +116,14 @@ class Stats:
             df_rep = self.df
 
         return (
-            df_rep.groupby("endpoint")[["duration", "status"]]
+            df_rep.groupby("endpoint")[self._value_columns("duration", "status")]
             .apply(lambda g: self._compute_stats(g))
             .reset_index()
         )
 
     def stats_by_task_and_endpoint(self):
         return (
-            self.df.groupby(["task", "endpoint"])[["duration"]]
+            self.df.groupby(["task", "endpoint"])[self._value_columns("duration")]
             .apply(lambda g: self._compute_stats(g))
             .reset_index()
         )
@@ -5,38 +5,77 @@ import aiohttp
 import asyncio
 
 # Internal imports
-from config import TIMEOUT_API
+from config import TIMEOUT_API, READ_ONLY_RESPONSE
+from http_trace import http_timings
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Bodies are pre-encoded JSON (campaigns.PayloadTemplate), sent as they are
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 class TaskAPI:
     """Classe base para qualquer tipo de Task."""
 
-    def __init__(self, host, user_id):
+    def __init__(self, host, user_id, read_only_response: str = READ_ONLY_RESPONSE, http_trace: bool = False):
         self.host = host
         self.user_id = user_id
 
-    async def run_request(self, session: aiohttp.ClientSession, endpoint, payload, task_type, request_id):
-        """Executa uma requisição assíncrona e retorna os resultados formatados."""
+        # Timing breakdown columns per request (the session must carry http_trace.trace_config())
+        self.http_trace = http_trace
+
+        # Response policy per task ("discard", "light" or "full"), see config.RESPONSE_POLICIES
+        self.response_policies = {
+            "API-TX-BUILD": "full",
+            "API-READ-ONLY": read_only_response,
+        }
+
+    async def _read_body(self, response: aiohttp.ClientResponse, policy: str):
+        """Consumes the response body per `policy`; None when a "light" check fails."""
+        if policy == "discard":
+            # Streamed without buffering, the connection is released once the body is read
+            async for _ in response.content.iter_any():
+                pass
+            return {}
+
+        raw = await response.read()
+
+        if policy == "light":
+            return {} if raw.lstrip()[:1] in (b"{", b"[") else None
+
+        try:
+            return json_loads(raw)
+        except ValueError:
+            return {}
+
+    async def run_request(self, session: aiohttp.ClientSession, endpoint, body: bytes, task_type, request_id):
+        """Executa uma requisição assíncrona (corpo JSON já codificado) e retorna os resultados formatados."""
         url = self.host + endpoint
         timestamp = int(time.time())
 
         try:
             start_time = time.perf_counter()
+            marks = {} if self.http_trace else None
 
             async with session.post(
                 url=url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=TIMEOUT_API
+                data=body,
+                headers=JSON_HEADERS,
+                timeout=TIMEOUT_API,
+                trace_request_ctx=marks
             ) as response:
             
                 duration = round(time.perf_counter() - start_time, 5)
                 status_code = response.status
                 status = "success" if 200 <= status_code < 300 else "fail"
 
-                try:
-                    transaction = await response.json()
-                except Exception:
-                    transaction = {}
+                transaction = await self._read_body(response, self.response_policies.get(task_type, "full"))
+                if transaction is None:
+                    status, transaction = "fail", {}
+                body_end = time.perf_counter()
 
                 log_msg = (
                     f"[User-{self.user_id:03d}]"
@@ -52,7 +91,7 @@ class TaskAPI:
 
                 logging.debug(log_msg)
 
-                return {
+                result = {
                     "timestamp": timestamp,
                     "user_id": self.user_id,
                     "request": request_id,
@@ -60,7 +99,11 @@ class TaskAPI:
                     "endpoint": endpoint,
                     "duration": duration,
                     "status": status,
-                }, transaction
+                }
+                if marks is not None:
+                    result.update(http_timings(marks, body_end))
+
+                return result, transaction
 
         except asyncio.TimeoutError:            
             logging.warning(f"[User-{self.user_id}] Timeout at {endpoint}")
@@ -1,6 +1,9 @@
 import time
 import logging
 
+# Internal imports
+from wallet.signer import get_signer
+
 class TaskBlockchain:
     """Handles the full lifecycle of processing, signing, and broadcasting blockchain transactions (Async)."""
 
@@ -53,12 +56,28 @@ class TaskBlockchain:
 
         return result, tx
 
-    def _tx_sign(self, tx, endpoint, request_id):
-        """Signs the built transaction (Sync wrapper)."""
-        # Signing is CPU bound and handled by local account, no await needed mostly
+    async def _tx_sign(self, tx, endpoint, request_id):
+        """
+        Signs the built transaction (Async).
+
+        Inline signing runs on the event loop. With a signer pool the TX-SIGN
+        row holds the signing time measured in the pool and a TX-SIGN-QUEUE row
+        the rest of the elapsed time (waiting for a free signer and hand-off).
+        """
+        signer = get_signer()
         start_time = time.perf_counter()
-        signed_tx = self.wallet.sign_transaction(tx)
-        duration = (time.perf_counter() - start_time)
+        queue_wait = None
+
+        if signer is None:
+            signed_tx = self.wallet.sign_transaction(tx)
+            duration = (time.perf_counter() - start_time)
+        else:
+            try:
+                signed_tx, duration = await signer.sign(self.wallet, tx)
+            except Exception as e:
+                logging.error(f"[User-{self.user_id:03d}] [wallet:{self.wallet.address}] Failed to sign transaction: {e}")
+                signed_tx, duration = None, 0.0
+            queue_wait = max(0.0, time.perf_counter() - start_time - duration)
         
         logging.debug(
             f"[User-{self.user_id:03d}]"
@@ -72,25 +91,42 @@ class TaskBlockchain:
             logging.error(f"[User-{self.user_id:03d}] Failed to sign transaction.")
             raise Exception("Failed to sign transaction")
 
-        result = self._format_result(
+        results = [self._format_result(
             request_id=request_id,
             task_type="TX-SIGN", 
             endpoint=endpoint, 
             duration=duration, 
             status=""
-        )
+        )]
 
-        return result, signed_tx
+        if queue_wait is not None:
+            results.append(self._format_result(
+                request_id=request_id,
+                task_type="TX-SIGN-QUEUE",
+                endpoint=endpoint,
+                duration=queue_wait,
+                status=""
+            ))
 
-    async def _tx_send(self, signed_tx, endpoint, request_id):
-        """Broadcasts the signed Ethereum transaction (Async)."""
+        return results, signed_tx
 
-        start_time = time.perf_counter()
-        
-        # Await wallet send
-        tx_hash, receipt = await self.wallet.send_transaction(signed_tx, request_id)
+    async def _tx_broadcast(self, signed_tx, request_id):
+        """Broadcasts the signed Ethereum transaction without waiting for it (Async)."""
+
+        tx_hash = await self.wallet.broadcast_transaction(signed_tx, request_id)
+
+        if tx_hash is None:
+            logging.error(f"[User-{self.user_id:03d}] Transaction not accepted by the node.")
+            raise Exception("Failed to send transaction")
+
+        return tx_hash
+
+    async def _tx_confirm(self, signed_tx, tx_hash, endpoint, request_id, send_start):
+        """Waits for the receipt; TX-SEND is measured from the broadcast (Async)."""
+
+        receipt = await self.wallet.wait_for_receipt(signed_tx, tx_hash, request_id)
         
-        duration = time.perf_counter() - start_time
+        duration = time.perf_counter() - send_start
 
         status = "success" if receipt and receipt.status == 1 else "fail"
 
@@ -115,11 +151,16 @@ class TaskBlockchain:
             status=""
         )
 
-        return result, tx_hash, status
+        return result, status
 
     
-    async def execute(self, tx_obj, endpoint, request_id):
-        """Executes the full blockchain pipeline (Async)."""
+    async def submit(self, tx_obj, endpoint, request_id):
+        """
+        Builds, signs and broadcasts a transaction without waiting for its receipt (Async).
+
+        Returns the TX-BUILD/TX-SIGN rows and the pending transaction to hand
+        to `confirm()`.
+        """
 
         results = []
 
@@ -130,15 +171,34 @@ class TaskBlockchain:
         results.append(result_tx_build)
 
         # Sign
-        result_tx_sign, signed_tx = self._tx_sign(tx=tx, endpoint=endpoint, request_id=request_id)
-        results.append(result_tx_sign)
+        results_tx_sign, signed_tx = await self._tx_sign(tx=tx, endpoint=endpoint, request_id=request_id)
+        results.extend(results_tx_sign)
 
         # Send
-        result_tx_send, tx_hash, status = await self._tx_send(signed_tx, endpoint, request_id)
+        send_start = time.perf_counter()
+        tx_hash = await self._tx_broadcast(signed_tx, request_id)
+
+        pending = {
+            "signed_tx": signed_tx,
+            "tx_hash": tx_hash,
+            "start_time": start_time,
+            "send_start": send_start,
+        }
+
+        return results, pending
+
+    async def confirm(self, pending, endpoint, request_id):
+        """Waits for a submitted transaction and returns its TX-SEND and TX-BLOCK rows (Async)."""
+
+        results = []
+
+        result_tx_send, status = await self._tx_confirm(
+            pending["signed_tx"], pending["tx_hash"], endpoint, request_id, pending["send_start"]
+        )
         results.append(result_tx_send)
         
         # TX-BLOCKCHAIN Total
-        duration = (time.perf_counter() - start_time)
+        duration = (time.perf_counter() - pending["start_time"])
         
         logging.debug(
             f"[User-{self.user_id:03d}]"
@@ -157,4 +217,14 @@ class TaskBlockchain:
             status=status
         ))
 
-        return results, tx_hash.hex(), status
+        return results, pending["tx_hash"].hex(), status
+
+    async def execute(self, tx_obj, endpoint, request_id):
+        """Executes the full blockchain pipeline (Async)."""
+
+        results, pending = await self.submit(tx_obj, endpoint, request_id)
+
+        results_confirm, tx_hash, status = await self.confirm(pending, endpoint, request_id)
+        results.extend(results_confirm)
+
+        return results, tx_hash, status
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+import campaigns
+from campaigns import PayloadTemplate, TEMPLATES
+
+ADDRESS = "0x" + "ab" * 20
+
+
+def _filled(payload: dict, values: dict) -> dict:
+    """Reference substitution: every placeholder string replaced by its value (as a string)."""
+    def walk(value):
+        if isinstance(value, dict):
+            return {key: walk(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [walk(item) for item in value]
+        if isinstance(value, str) and value in values:
+            return str(values[value])
+        return value
+    return walk(payload)
+
+
+@pytest.mark.parametrize("payload", [
+    campaigns.payload_mint_root_batch,
+    campaigns.payload_split_batch,
+    campaigns.payload_add_status,
+    campaigns.payload_get_users_batches,
+    campaigns.payload_get_batch_products,
+])
+def test_render_matches_substituted_payload(payload):
+    values = {"<FROM>": ADDRESS, "<TO>": ADDRESS, "<BATCH_ID>": "LOTE-1", "<TOKEN_ID>": 7}
+    template = PayloadTemplate.compile(payload)
+
+    assert json.loads(template.render(values)) == _filled(payload, values)
+
+
+def test_bind_then_render():
+    template = PayloadTemplate.compile(campaigns.payload_split_batch)
+    assert template.slots == {"<FROM>", "<TO>", "<TOKEN_ID>"}
+
+    bound = template.bind({"<FROM>": ADDRESS, "<TO>": ADDRESS})
+    assert bound.slots == {"<TOKEN_ID>"}
+
+    body = json.loads(bound.render({"<TOKEN_ID>": 42}))
+    assert body["parentTokenId"] == "42"
+    assert body["from"] == body["to"] == ADDRESS
+    # The compiled template is left untouched
+    assert template.slots == {"<FROM>", "<TO>", "<TOKEN_ID>"}
+
+
+def test_fully_bound_template_is_constant():
+    template = PayloadTemplate.compile(campaigns.payload_get_tokens_by_batch_id).bind({"<BATCH_ID>": "LOTE-9"})
+
+    assert not template.slots
+    assert template.render() is template.render()
+    assert json.loads(template.render()) == {"batchId": "LOTE-9"}
+
+
+def test_values_are_json_escaped():
+    template = PayloadTemplate.compile(campaigns.payload_get_tokens_by_batch_id)
+    batch_id = 'LOTE "1"\\'
+
+    assert json.loads(template.render({"<BATCH_ID>": batch_id})) == {"batchId": batch_id}
+
+
+def test_unfilled_slot_raises():
+    template = PayloadTemplate.compile(campaigns.payload_split_batch).bind({"<FROM>": ADDRESS})
+
+    with pytest.raises(KeyError, match="<TO>"):
+        template.render({"<TOKEN_ID>": 1})
+
+
+def test_build_campaign_sequential_leaves_token_slot():
+    campaign = campaigns.build_campaign_sequential(
+        contract="ERC-721", address=ADDRESS, batch_id="LOTE-2", n_split_batch_tx=2
+    )
+
+    endpoints = [endpoint for endpoint, _ in campaign]
+    assert endpoints[:3] == ["/api/erc721/mintRootBatchTx"] + ["/api/erc721/splitBatchTx"] * 2
+    assert json.loads(campaign[0][1].render())["batchId"] == "LOTE-2"
+    assert campaign[1][1].slots == {"<TOKEN_ID>"}
+    assert set(TEMPLATES) >= set(endpoints)
@@ -0,0 +1,106 @@
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("aiohttp")
+pytest.importorskip("web3")
+
+from corpus import TxCorpus
+from histogram import HistogramSet
+from load_tester import LoadTester
+
+
+def _entries(user_id, base_nonce, count):
+    return [
+        {"user_id": user_id, "nonce": base_nonce + index, "endpoint": "/mint",
+         "raw": bytes([user_id, index]), "hash": bytes([user_id, index]) * 16}
+        for index in range(count)
+    ]
+
+
+def test_interleave_is_round_robin_in_nonce_order():
+    entries = TxCorpus._interleave([_entries(1, 10, 3), _entries(2, 0, 1), _entries(3, 5, 2)])
+
+    assert [(entry["user_id"], entry["nonce"]) for entry in entries] == [
+        (1, 10), (2, 0), (3, 5), (1, 11), (3, 6), (1, 12)
+    ]
+
+
+class FakeNode:
+    """Earlier sends take longer to arrive, so unordered concurrent sends land out of order."""
+
+    def __init__(self, total):
+        self.remaining = total
+        self.delivered = []
+        self.eth = types.SimpleNamespace(send_raw_transaction=self.send_raw_transaction)
+
+    async def send_raw_transaction(self, raw):
+        self.remaining -= 1
+        await asyncio.sleep(0.001 * self.remaining)
+        self.delivered.append(raw)
+        return raw
+
+
+class FakeTracker:
+    def track(self, tx_hash):
+        pass
+
+    def forget(self, tx_hash):
+        pass
+
+    async def wait(self, tx_hash, timeout):
+        return types.SimpleNamespace(status=1, blockNumber=1)
+
+
+def _fire(corpus, lock_for):
+    """Fires the corpus like run_corpus_load (one task per entry); returns the delivered (user, nonce)."""
+    tester = LoadTester.__new__(LoadTester)
+    tester.in_flight = 0
+    tester.receipt_tracker = FakeTracker()
+    tester.revert_log = None
+    tester.reporter = None
+    tester.histograms = {"phase": HistogramSet()}
+
+    nonces = {entry["raw"]: (entry["user_id"], entry["nonce"]) for entry in corpus}
+    counts = {user_id: {"bc": 0, "bc_success": 0, "bc_fail": 0} for user_id, _ in nonces.values()}
+    results = []
+    node = FakeNode(len(corpus))
+
+    async def main():
+        await asyncio.gather(*(
+            asyncio.create_task(tester._send_raw(
+                node, entry, request_id, "phase", results, counts, 0.0, lock_for(entry)
+            ))
+            for request_id, entry in enumerate(corpus, start=1)
+        ))
+
+    asyncio.run(main())
+    assert len(results) == 2 * len(corpus)
+    return [nonces[raw] for raw in node.delivered]
+
+
+def _per_user(delivered):
+    per_user = {}
+    for user_id, nonce in delivered:
+        per_user.setdefault(user_id, []).append(nonce)
+    return per_user
+
+
+def test_corpus_sends_reach_the_node_in_nonce_order():
+    corpus = TxCorpus(TxCorpus._interleave([_entries(1, 0, 5), _entries(2, 7, 5)]))
+
+    send_locks = {}
+    delivered = _fire(corpus, lambda entry: send_locks.setdefault(entry["user_id"], asyncio.Lock()))
+
+    assert _per_user(delivered) == {1: [0, 1, 2, 3, 4], 2: [7, 8, 9, 10, 11]}
+
+
+def test_unserialized_sends_would_arrive_out_of_order():
+    # Control: without a shared lock per wallet the fake node does reorder them
+    corpus = TxCorpus(TxCorpus._interleave([_entries(1, 0, 5)]))
+
+    delivered = _fire(corpus, lambda entry: asyncio.Lock())
+
+    assert _per_user(delivered)[1] != [0, 1, 2, 3, 4]
@@ -0,0 +1,90 @@
+import pytest
+
+pytest.importorskip("zmq")
+pytest.importorskip("web3")
+
+from eth_account import Account
+
+from distributed import encode_message, decode_message, pack_job, unpack_job, _SocketChannel
+from histogram import HistogramSet
+from users.user_erc721 import UserERC721
+
+SECRET = b"test-secret"
+
+
+def test_message_round_trip():
+    frame = encode_message(("results", 1, [{"duration": 0.5, "status": "success"}]), SECRET)
+    assert decode_message(frame, SECRET) == ("results", 1, [{"duration": 0.5, "status": "success"}])
+
+
+def test_unsigned_or_tampered_frames_are_rejected():
+    frame = encode_message(("hello", None, "node"), SECRET)
+
+    assert decode_message(frame, b"other-secret") is None
+    assert decode_message(frame.replace(b"node", b"evil"), SECRET) is None
+    assert decode_message(b"\x80\x04" + b"x" * 40, SECRET) is None
+
+
+def test_job_keys_are_encrypted():
+    account = Account.create()
+    kwargs = {
+        "host": "http://localhost:3000",
+        "duration": 10,
+        "user_cls": UserERC721,
+        "user_specs": [(3, account.key.hex(), "LOTE-3")],
+    }
+
+    frame = encode_message(("job", 0, pack_job(kwargs, SECRET)), SECRET)
+    assert account.key.hex().encode() not in frame
+
+    _, _, payload = decode_message(frame, SECRET)
+    job = unpack_job(payload, SECRET)
+    assert job["user_cls"] is UserERC721
+    assert job["user_specs"] == [(3, account.key.hex(), "LOTE-3")]
+    assert job["host"] == kwargs["host"]
+
+
+def test_user_class_outside_users_package_is_refused():
+    with pytest.raises(ValueError):
+        unpack_job({"user_cls": "os:system", "user_specs": []}, SECRET)
+
+
+def test_done_summary_histograms_travel_as_lists():
+    sent = []
+
+    class Socket:
+        def send(self, frame):
+            sent.append(frame)
+
+    histograms = HistogramSet()
+    histograms.record({"task": "API-READ-ONLY", "endpoint": "/a", "status": "success", "duration": 0.25})
+
+    _SocketChannel(Socket(), SECRET).put(("done", 0, {"global_stats": {"api": 1}, "histograms": histograms}))
+
+    _, _, payload = decode_message(sent[0], SECRET)
+    restored = HistogramSet.from_list(payload["histograms"])
+    assert restored.summary() == histograms.summary()
+
+
+def test_coordinator_only_accepts_signed_workers():
+    import zmq
+    from distributed import Coordinator
+
+    coordinator = Coordinator("tcp://127.0.0.1:*", expected_workers=1, secret=SECRET.decode())
+    endpoint = coordinator.socket.getsockopt_string(zmq.LAST_ENDPOINT)
+
+    context = zmq.Context.instance()
+    intruder, worker = context.socket(zmq.DEALER), context.socket(zmq.DEALER)
+    try:
+        intruder.connect(endpoint)
+        intruder.send(encode_message(("hello", None, "intruder"), b"guessed"))
+        assert coordinator._recv(1.0) is None
+
+        worker.connect(endpoint)
+        worker.send(encode_message(("hello", None, "worker"), SECRET))
+        coordinator.wait_for_workers()
+        assert coordinator.worker_count == 1
+    finally:
+        intruder.close(linger=0)
+        worker.close(linger=0)
+        coordinator.socket.close(linger=0)
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import event_loop
+
+
+async def _loop_type():
+    await asyncio.sleep(0)
+    return type(asyncio.get_running_loop())
+
+
+def test_run_asyncio_uses_asyncio_run(monkeypatch):
+    calls = []
+    real_run = asyncio.run
+    monkeypatch.setattr(event_loop.asyncio, "run", lambda coro: calls.append(coro) or real_run(coro))
+
+    assert issubclass(event_loop.run(_loop_type(), "asyncio"), asyncio.BaseEventLoop)
+    assert len(calls) == 1
+
+
+def test_run_uvloop_falls_back_when_missing(monkeypatch):
+    monkeypatch.setattr(event_loop, "_uvloop", lambda: None)
+
+    assert event_loop.resolve_backend("uvloop") == "asyncio"
+    assert issubclass(event_loop.run(_loop_type(), "uvloop"), asyncio.BaseEventLoop)
+
+
+def test_run_uvloop():
+    uvloop = pytest.importorskip("uvloop")
+    policy = asyncio.get_event_loop_policy()
+
+    assert event_loop.run(_loop_type(), "uvloop") is uvloop.Loop
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        event_loop.resolve_backend("trio")
@@ -0,0 +1,79 @@
+import math
+
+from histogram import (
+    LatencyHistogram,
+    SUB_BUCKET_BITS,
+    UNITS_PER_SECOND,
+    _bucket_index,
+    _bucket_range,
+)
+
+
+def test_bucket_range_contains_its_values():
+    for value in [0, 1, 255, 256, 257, 1000, 12_345, 1_000_000, 987_654_321]:
+        low, high = _bucket_range(_bucket_index(value))
+        assert low <= value <= high
+
+
+def test_buckets_are_contiguous():
+    previous_high = -1
+    for index in range(_bucket_index(10_000_000) + 1):
+        low, high = _bucket_range(index)
+        if low > high:
+            continue
+        assert low == previous_high + 1
+        previous_high = high
+
+
+def test_bucket_relative_error():
+    bound = 1 / 2 ** (SUB_BUCKET_BITS - 1)
+    for value in [300, 4_096, 65_535, 1_000_001, 250_000_000]:
+        low, high = _bucket_range(_bucket_index(value))
+        assert (high - low) / low <= bound
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for micros in range(1, 101):
+        histogram.record(micros / UNITS_PER_SECOND)
+
+    assert histogram.percentile(0.5) == 50 / UNITS_PER_SECOND
+    assert histogram.percentile(0.99) == 99 / UNITS_PER_SECOND
+    assert histogram.percentile(1.0) == 100 / UNITS_PER_SECOND
+
+
+def test_percentiles_within_resolution():
+    histogram = LatencyHistogram()
+    values = [i / 1000 for i in range(1, 1001)]  # 1 ms .. 1 s
+    for value in values:
+        histogram.record(value)
+
+    bound = 1 / 2 ** (SUB_BUCKET_BITS - 1)
+    for q, expected in [(0.5, 0.5), (0.9, 0.9), (0.99, 0.99)]:
+        assert math.isclose(histogram.percentile(q), expected, rel_tol=bound)
+    assert histogram.min <= histogram.percentile(0.0) <= 0.001 * (1 + bound)
+    assert histogram.percentile(1.0) <= histogram.max == 1.0
+    assert math.isclose(histogram.mean, sum(values) / len(values))
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert math.isnan(histogram.percentile(0.5))
+    assert math.isnan(histogram.mean)
+
+
+def test_merge_and_round_trip():
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for index in range(500):
+        value = (index % 97 + 1) / 1000
+        (a if index % 2 else b).record(value)
+        both.record(value)
+
+    merged = a.copy().merge(b)
+    assert merged.counts == both.counts
+    assert merged.count == both.count == 500
+    assert merged.percentile(0.9) == both.percentile(0.9)
+
+    restored = LatencyHistogram.from_dict(merged.to_dict())
+    assert restored.percentile(0.99) == merged.percentile(0.99)
+    assert (restored.min, restored.max) == (merged.min, merged.max)
@@ -0,0 +1,106 @@
+import glob
+import os
+
+import pytest
+
+from load_profile import LoadProfile, Stage
+
+
+def _profile(*stages, start=0):
+    return LoadProfile([Stage(**stage) for stage in stages], start=start)
+
+
+def test_ramp_is_linear_from_previous_level():
+    profile = _profile({"duration": 10, "target": 20}, {"duration": 10, "target": 0})
+
+    assert profile.target_at(0) == 0
+    assert profile.target_at(5) == 10
+    assert profile.target_at(10) == 20
+    assert profile.target_at(15) == 10
+    assert profile.duration == 20
+
+
+def test_spike_returns_to_previous_level():
+    profile = _profile(
+        {"duration": 10, "target": 10, "shape": "step"},
+        {"duration": 5, "target": 50, "shape": "spike"},
+        {"duration": 10, "shape": "hold"},
+    )
+
+    assert profile.target_at(3) == 10
+    assert profile.target_at(10) == 50
+    assert profile.target_at(14.9) == 50
+    assert profile.target_at(15) == 10
+    assert profile.target_at(24) == 10
+    assert profile.max_target == 50
+
+
+def test_sine_oscillates_between_base_and_target():
+    profile = _profile(
+        {"duration": 10, "target": 10, "shape": "step"},
+        {"duration": 20, "target": 30, "shape": "sine", "period": 10},
+    )
+
+    assert profile.target_at(10) == pytest.approx(10)
+    assert profile.target_at(15) == pytest.approx(30)
+    assert profile.target_at(20) == pytest.approx(10)
+
+
+def test_target_is_zero_after_the_profile():
+    profile = _profile({"duration": 10, "target": 5, "shape": "step"})
+    assert profile.target_at(10) == 0
+    assert profile.target_at(100) == 0
+
+
+def test_ramp_up_expansion():
+    profile = LoadProfile.ramp_up(users=10, step_users=4, interval_users=5, duration=30)
+
+    assert [stage.target for stage in profile.stages] == [4, 8, 10]
+    assert [stage.duration for stage in profile.stages] == [5, 5, 30]
+    assert profile.target_at(0) == 4
+    assert profile.target_at(7) == 8
+    assert profile.target_at(10) == 10
+    assert profile.duration == 40
+
+
+def test_ramp_up_without_step_starts_everyone():
+    profile = LoadProfile.ramp_up(users=6, step_users=0, interval_users=5, duration=30)
+    assert [stage.target for stage in profile.stages] == [6]
+
+
+def test_ramp_up_without_interval_starts_everyone():
+    profile = LoadProfile.ramp_up(users=10, step_users=2, interval_users=0, duration=30)
+
+    assert [stage.target for stage in profile.stages] == [10]
+    assert profile.target_at(0) == 10
+    assert profile.duration == 30
+
+
+def test_dict_round_trip():
+    profile = _profile(
+        {"duration": 10, "target": 10},
+        {"duration": 20, "target": 30, "shape": "sine", "period": 10},
+        start=2,
+    )
+    restored = LoadProfile.from_dict(profile.to_dict())
+
+    for elapsed in range(0, 31, 3):
+        assert restored.target_at(elapsed) == pytest.approx(profile.target_at(elapsed))
+
+
+@pytest.mark.parametrize("stage, message", [
+    ({"duration": 10, "target": 5, "shape": "wave"}, "shape"),
+    ({"duration": 0, "target": 5}, "duration"),
+    ({"duration": 10}, "target"),
+    ({"duration": 10, "target": -1}, "negative"),
+])
+def test_invalid_stages(stage, message):
+    with pytest.raises(ValueError, match=message):
+        Stage(**stage)
+
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(os.path.dirname(__file__), "profiles", "*.json"))))
+def test_bundled_profiles_load(path):
+    profile = LoadProfile.load(path)
+    assert profile.duration > 0
+    assert profile.max_target > 0
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("web3")
+
+from histogram import HistogramSet
+from load_tester import LoadTester
+
+
+def _lags(cycles, interval, start=0.0):
+    """Schedule lag of each call of a closed loop whose calls take `cycles` seconds."""
+    lags = []
+    actual_start = next_intended = start
+    for cycle in cycles:
+        intended_start, next_intended = LoadTester._closed_loop_schedule(next_intended, actual_start, interval)
+        lags.append(actual_start - intended_start)
+        actual_start += cycle
+    return lags
+
+
+def test_slow_call_delays_only_the_next_one():
+    assert _lags([1, 1, 3, 1, 1, 1], interval=1) == [0, 0, 0, 2, 0, 0]
+
+
+def test_calls_faster_than_the_interval_have_no_lag():
+    assert _lags([0.5, 1, 0.8], interval=1) == [0, -0.5, 0]
+
+
+def test_no_expected_interval_means_no_schedule():
+    assert _lags([1, 3, 1], interval=None) == [0, 0, 0]
+
+
+def test_stamp_schedule_corrects_by_the_lag():
+    now = time.perf_counter()
+    results = LoadTester._stamp_schedule(
+        [{"duration": 0.5, "status": "success"}], intended_start=now - 2, actual_start=now - 1.5
+    )
+    assert results[0]["corrected_duration"] == pytest.approx(1.0)
+    assert results[0]["intended_start"] == pytest.approx(time.time() - 2, abs=0.05)
+
+
+def test_stamp_schedule_keeps_failures_in_corrected_latency():
+    now = time.perf_counter()
+    results = LoadTester._stamp_schedule(
+        [{"request": "error", "duration": -1, "status": "fail (RuntimeError)"}], intended_start=now - 3, actual_start=now - 1
+    )
+    assert results[0]["corrected_duration"] == pytest.approx(3.0, abs=0.05)
+
+
+class FakeCoordinator:
+    """Stands in for the shard runner: streams rows into `results`, returns the shard summaries."""
+
+    def __init__(self, rows, summaries):
+        self.rows = rows
+        self.summaries = summaries
+        self.shard_kwargs = None
+
+    def run_sharded(self, shard_kwargs, run_method, phase, results):
+        self.shard_kwargs = shard_kwargs
+        for row in self.rows:
+            results.append(row)
+        return self.summaries, 12.5
+
+
+def _shard_summary(durations, arrivals=None, reverts=(), loop=()):
+    histograms = HistogramSet()
+    for duration in durations:
+        histograms.record({"task": "API-TX-BUILD", "endpoint": "/mint", "status": "success", "duration": duration})
+    return {
+        "global_stats": {"total": len(durations)},
+        "arrivals": arrivals,
+        "histograms": histograms,
+        "reverts": list(reverts),
+        "loop": list(loop),
+    }
+
+
+def test_shard_results_are_merged(monkeypatch):
+    summaries = [
+        _shard_summary([0.1, 0.2], arrivals={"scheduled": 10, "dropped": 1}, reverts=[{"tx": "a"}], loop=[{"worker": 0}]),
+        _shard_summary([0.3], arrivals={"scheduled": 7, "dropped": 2}, loop=[{"worker": 1}, {"worker": 1}]),
+    ]
+    coordinator = FakeCoordinator(rows=[{"request": 1}, {"request": 2}], summaries=summaries)
+
+    tester = LoadTester.__new__(LoadTester)
+    tester.__dict__.update(
+        workers=2, number_users=5, duration=30, coordinator=coordinator, report_interval=0, reporter=None,
+        arrival_rate=20, arrival_distribution="poisson", results_tx_build=[],
+        histograms={"api-tx-build": HistogramSet()},
+    )
+    summarized = {}
+    monkeypatch.setattr(tester, "user_specs", lambda: [(user_id, f"key-{user_id}", 0) for user_id in range(5)])
+    monkeypatch.setattr(tester, "_worker_kwargs", lambda specs: {"user_specs": specs})
+    monkeypatch.setattr(
+        tester, "_summarize_phase",
+        lambda label, phase, stats, total_time, output_file, reverts, loop_windows:
+            summarized.update(stats=stats, total_time=total_time, reverts=reverts, loop=loop_windows) or {}
+    )
+
+    run_data = tester._run_in_workers("run_arrival_rate_load", "ARRIVAL-RATE", "api-tx-build", None)
+
+    # Users striped across the shards
+    assert [[spec[0] for spec in kwargs["user_specs"]] for kwargs in coordinator.shard_kwargs] == [[0, 2, 4], [1, 3]]
+    assert tester.results_tx_build == [{"request": 1}, {"request": 2}]
+    assert len(tester.histograms["api-tx-build"]) == 3
+    assert summarized == {
+        "stats": [{"total": 2}, {"total": 1}],
+        "total_time": 12.5,
+        "reverts": [{"tx": "a"}],
+        "loop": [{"worker": 0}, {"worker": 1}, {"worker": 1}],
+    }
+    assert run_data["arrivals"] == {"target_rate": 20, "distribution": "poisson", "scheduled": 17, "dropped": 3}
@@ -0,0 +1,135 @@
+import csv
+import threading
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from sinks import CsvStreamSink, RecordStore, ResultSink, RESULT_FIELDNAMES, records_path
+
+
+def _result(index: int, **extra) -> dict:
+    return {
+        "timestamp": 1_700_000_000 + index,
+        "user_id": index % 3 + 1,
+        "request": index,
+        "task": "API-READ-ONLY",
+        "endpoint": "/api/erc721/getUsersBatches",
+        "duration": 0.01 * (index + 1),
+        "status": "success",
+        **extra,
+    }
+
+
+def _read(path) -> list:
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_result_sink_is_abstract():
+    with pytest.raises(TypeError):
+        ResultSink()
+
+
+def test_csv_sink_close_writes_every_row_in_order(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = CsvStreamSink(str(path), batch_size=7, flush_interval=60)
+    for index in range(50):
+        sink.append(_result(index))
+    sink.close()
+
+    rows = _read(path)
+    assert len(sink) == 50
+    assert [int(row["request"]) for row in rows] == list(range(50))
+    assert list(rows[0]) == RESULT_FIELDNAMES
+
+
+def test_csv_sink_flushes_before_close(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = CsvStreamSink(str(path), batch_size=1000, flush_interval=0.05)
+    try:
+        sink.append(_result(0))
+        sink.append(_result(1))
+
+        # The writer flushes the partial batch once flush_interval is over
+        for _ in range(100):
+            if len(_read(path)) == 2:
+                break
+            threading.Event().wait(0.02)
+        assert len(_read(path)) == 2
+    finally:
+        sink.close()
+
+
+def test_csv_sink_close_is_idempotent(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = CsvStreamSink(str(path))
+    sink.append(_result(0))
+    sink.close()
+    sink.close()
+
+    assert len(_read(path)) == 1
+
+
+def test_csv_sink_spills_instead_of_blocking_or_dropping(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = CsvStreamSink(str(path), queue_size=2, batch_size=1)
+
+    # Stall the writer thread on its first batch
+    stalled, release = threading.Event(), threading.Event()
+    write_batch = sink._write_batch
+
+    def slow_write(batch):
+        stalled.set()
+        release.wait()
+        write_batch(batch)
+
+    sink._write_batch = slow_write
+    sink.append(_result(0))
+    assert stalled.wait(1)
+
+    # The queue holds 2 rows: the rest spill to the overflow, append() never blocks
+    for index in range(1, 10):
+        sink.append(_result(index))
+    assert sink.overflowed == 7
+    assert len(sink) == 10
+
+    release.set()
+    # More rows while the writer drains the overflow keep their order
+    for index in range(10, 20):
+        sink.append(_result(index))
+    sink.close()
+
+    assert [int(row["request"]) for row in _read(path)] == list(range(20))
+
+
+def test_csv_sink_small_queue_keeps_every_row_in_order(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = CsvStreamSink(str(path), queue_size=4, batch_size=16, flush_interval=0.01)
+    for index in range(5000):
+        sink.append(_result(index))
+    sink.close()
+
+    assert [int(row["request"]) for row in _read(path)] == list(range(5000))
+
+
+def test_record_store_close_writes_csv_and_sidecar(tmp_path):
+    path = tmp_path / "out.csv"
+    store = RecordStore(str(path))
+    store.append(_result(0, intended_start=1_700_000_000.5, corrected_duration=0.02))
+    store.append(_result(1, ttfb=0.004))
+    store.append(_result(2, request="error", status="fail (Exception)"))
+    store.close()
+
+    rows = _read(path)
+    assert [row["status"] for row in rows] == ["success", "success", "fail (Exception)"]
+    assert rows[2]["request"] == ""
+    assert rows[0]["corrected_duration"] == "0.02"
+    assert rows[1]["corrected_duration"] == ""
+    assert float(rows[0]["intended_start"]) == 1_700_000_000.5
+    assert rows[1]["intended_start"] == ""
+
+    restored = RecordStore.load(records_path(str(path)))
+    assert len(restored) == 3
+    assert restored.to_dataframe().equals(store.to_dataframe())
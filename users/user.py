@@ -10,14 +10,14 @@ from functools import partial
 # Internal imports
 import campaigns 
 from wallet.wallet import Wallet
-from tasks.task_api import TaskAPI
+from tasks.task_api import TaskAPI, JSON_HEADERS, json_loads
 from tasks.task_blockchain import TaskBlockchain
-from config import TIMEOUT_API
+from config import TIMEOUT_API, MAX_IN_FLIGHT_TX, READ_ONLY_RESPONSE
 
 class User:
     """Simulates a user performing API or blockchain operations (Async)."""
 
-    def __init__(self, host, mode, contract, user_id, interval_requests, campaign_names: list):
+    def __init__(self, host, mode, contract, user_id, interval_requests, campaign_names: list, private_key: str = None, batch_id: str = None, max_in_flight_tx: int = MAX_IN_FLIGHT_TX, read_only_response: str = READ_ONLY_RESPONSE, http_trace: bool = False):
 
         self.host = host
         self.mode = mode
@@ -37,16 +37,29 @@ class User:
         self.api_errors = 0
         self.blockchain_errors = 0
 
-        self.wallet = Wallet(self.user_id)
+        # An existing key/batch is reused when the user is rebuilt in a worker process
+        self.wallet = Wallet(self.user_id, private_key=private_key)
         self.campaign_names = campaign_names
 
         self.sequence_step = 0
         self.last_token_id = None
-        self.batch_id = f"LOTE-{uuid.uuid4()}"
+        self.batch_id = batch_id or f"LOTE-{uuid.uuid4()}"
+
+        # Body of the getUsersBatches lookup of this user, encoded once
+        self._get_token_body = campaigns.TEMPLATES[
+            f"/api/{self.contract.lower().replace('-', '')}/getUsersBatches"
+        ].bind({"<FROM>": self.wallet.address}).render()
 
         # Session will be initialized in run_... methods or passed in
         self.session = None
 
+        # Pipelined writes: up to `max_in_flight_tx` transactions awaiting their
+        # receipt while the next steps run. Their TX-SEND/TX-BLOCK/FULL rows are
+        # delivered later through `deferred_results` (set by LoadTester per call).
+        self.max_in_flight_tx = max(1, max_in_flight_tx)
+        self._pending_tx = set()
+        self.deferred_results = None
+
         # READ-ONLY campaigns
         self.available_campaigns_read_only = self._build_user_campaigns_read_only()
 
@@ -55,7 +68,7 @@ class User:
 
         logging.info(f"\t[User-{self.user_id:03d}] Wallet : {self.wallet.address}")
 
-        self.task_api = TaskAPI(host, user_id)
+        self.task_api = TaskAPI(host, user_id, read_only_response=read_only_response, http_trace=http_trace)
         self.task_blockchain = TaskBlockchain(self.wallet, user_id)
 
 
@@ -94,24 +107,24 @@ class User:
                 )
 
                 # Passo 1: Mint (adiciona a função _step_mint à sequência)
-                mint_endpoint, mint_payload = campaign_requests[0]
-                self.tx_build_sequence.append(partial(self._step_mint, mint_endpoint, mint_payload))
+                mint_endpoint, mint_template = campaign_requests[0]
+                self.tx_build_sequence.append(partial(self._step_mint, mint_endpoint, mint_template))
 
                 # Passo 2: Get Token (adiciona a função _step_get_token)
                 self.tx_build_sequence.append(self._step_get_token)
 
                 # Passos seguintes: Transações que dependem do token_id
-                for endpoint, payload in campaign_requests[1:]:
-                    self.tx_build_sequence.append(partial(self._step_tx, endpoint, payload))
+                for endpoint, template in campaign_requests[1:]:
+                    self.tx_build_sequence.append(partial(self._step_tx, endpoint, template))
         
         return campaigns_dict
 
 
-    async def _step_mint(self, endpoint, payload):
+    async def _step_mint(self, endpoint, template):
            """Passo 1: Executa o mintRootBatchTx (Async)."""
            measured_results, _, status = await self._measure_api_block(
                endpoint=endpoint,
-               payload=payload,
+               body=template.render(),
                task_type="API-TX-BUILD"
            )
            if status == "reverted":
@@ -122,6 +135,9 @@ class User:
     async def _step_get_token(self):
         """Passo 2: Executa o getUsersBatches e armazena o token ID (Async)."""
         try:
+            # O token só existe depois que o mint for confirmado
+            await self.wait_in_flight()
+
             contract = self.contract.lower().replace("-", "")
             endpoint = f"/api/{contract}/getUsersBatches"
             url = self.host + endpoint
@@ -129,8 +145,8 @@ class User:
             # Use aiohttp
             async with self.session.post(
                 url=url,
-                json={"userAddress": [self.wallet.address]},
-                headers={"Content-Type": "application/json"},
+                data=self._get_token_body,
+                headers=JSON_HEADERS,
                 # timeout=aiohttp.ClientTimeout(total=TIMEOUT_API)
                 timeout=TIMEOUT_API
             ) as response:
@@ -138,7 +154,7 @@ class User:
                 if response.status != 200:
                     raise Exception(f"HTTP Error {response.status}")
 
-                body = await response.json()
+                body = json_loads(await response.read())
 
             if (
                 not body or "results" not in body or len(body["results"]) == 0 or
@@ -171,7 +187,7 @@ class User:
             # Retorna um erro formatado como os outros resultados
             return [{"timestamp": int(time.time()), "user_id": self.user_id, "endpoint": "get_token_error", "status_code": "error", "duration": -1, "status": f"fail ({type(e).__name__})"}]
  
-    async def _step_tx(self, endpoint, payload):
+    async def _step_tx(self, endpoint, template):
         """Passos seguintes: Executa uma transação genérica que precisa de um token ID (Async)."""
         if self.last_token_id is None:
             # Se não temos um token, não podemos continuar. Reiniciamos a sequência.
@@ -179,11 +195,9 @@ class User:
             self.sequence_step = 0
             return []
 
-        updated_payload = self._replace_token_id(payload, self.last_token_id)
-
         measured_results, _, status = await self._measure_api_block(
             endpoint=endpoint,
-            payload=updated_payload,
+            body=template.render({"<TOKEN_ID>": self.last_token_id}),
             task_type="API-TX-BUILD"
         )
 
@@ -193,14 +207,14 @@ class User:
         return measured_results
 
 
-    async def _api_request(self, endpoint, payload, task_type):
-        """Executes one API request and increments request counter (Async)."""
+    async def _api_request(self, endpoint, body, task_type):
+        """Executes one API request (pre-encoded body) and increments request counter (Async)."""
         self.api_requests_counter += 1
         
         result, transaction = await self.task_api.run_request(
             session=self.session,
             endpoint=endpoint,
-            payload=payload,
+            body=body,
             task_type=task_type,
             request_id=self.api_requests_counter
         )
@@ -243,6 +257,97 @@ class User:
             raise e
 
 
+    @property
+    def pipelined(self) -> bool:
+        """True when writes are confirmed asynchronously (api-blockchain with a window > 1)."""
+        return self.mode == "api-blockchain" and self.max_in_flight_tx > 1
+
+    async def wait_in_flight(self):
+        """Waits until every pipelined transaction of this user is confirmed (Async)."""
+        if self._pending_tx:
+            await asyncio.gather(*self._pending_tx, return_exceptions=True)
+
+    async def _blockchain_submit(self, tx_obj, endpoint, start_time):
+        """
+        Submits a transaction and confirms it in the background (Async).
+
+        Waits for a free slot in the in-flight window first. Submissions stay
+        serial, so local nonces are assigned in order. Returns the TX-BUILD/TX-SIGN
+        rows; the remaining rows are delivered when the receipt arrives.
+        """
+        while len(self._pending_tx) >= self.max_in_flight_tx:
+            await asyncio.wait(set(self._pending_tx), return_when=asyncio.FIRST_COMPLETED)
+
+        self.blockchain_requests_counter += 1
+        request_id = self.blockchain_requests_counter
+
+        try:
+            results, pending = await self.task_blockchain.submit(
+                tx_obj=tx_obj,
+                endpoint=endpoint,
+                request_id=request_id
+            )
+        except Exception as e:
+            self.bc_fail += 1
+            raise e
+
+        # Captured now: the user may already be serving another call when it completes
+        deliver = self.deferred_results
+        task = asyncio.create_task(self._confirm_tx(pending, endpoint, request_id, start_time, deliver))
+        self._pending_tx.add(task)
+        task.add_done_callback(self._pending_tx.discard)
+
+        return results
+
+    async def _confirm_tx(self, pending, endpoint, request_id, start_time, deliver):
+        """Waits for one pipelined transaction and delivers its rows under its own request id (Async)."""
+        try:
+            results, _, status = await self.task_blockchain.confirm(pending, endpoint, request_id)
+
+            if status == "success":
+                self.bc_success += 1
+            else:
+                self.bc_fail += 1
+
+            duration = time.perf_counter() - start_time
+
+            logging.debug(
+                f"[User-{self.user_id:03d}]"
+                f" {f'[REQ-BLOCK-{request_id:03d}]':<15}"
+                f" {f'[FULL]':<15}"
+                f" {endpoint:<31}"
+                f" {duration:<1.3f}s"
+            )
+
+            results.append({
+                "timestamp": int(time.time()),
+                "user_id": self.user_id,
+                "request": request_id,
+                "task": "FULL",
+                "endpoint": endpoint,
+                "duration": duration,
+                "status": status
+            })
+
+        except Exception as e:
+            self.bc_fail += 1
+            logging.error(f"[User-{self.user_id:03d}] [REQ-BLOCK-{request_id:03d}] Erro ao confirmar transação: {type(e).__name__}: {e}")
+            results = [{
+                "timestamp": int(time.time()),
+                "user_id": self.user_id,
+                "request": request_id,
+                "task": "error",
+                "endpoint": endpoint,
+                "duration": -1,
+                "status": f"fail ({type(e).__name__})"
+            }]
+
+        if deliver is not None:
+            deliver(results)
+        else:
+            logging.warning(f"[User-{self.user_id:03d}] [REQ-BLOCK-{request_id:03d}] Resultados da transação descartados (sem destino).")
+
+
     # RANDOM MODE (READ-ONLY)
     async def run_random_request(self):
         """Executes a random READ-ONLY request (Async)."""
@@ -258,9 +363,9 @@ class User:
             )
 
             # Select a random endpoint
-            endpoint, payload = random.choice(campaign)
+            endpoint, template = random.choice(campaign)
 
-            api_result, _ = await self._api_request(endpoint, payload, "API-READ-ONLY")
+            api_result, _ = await self._api_request(endpoint, template.render(), "API-READ-ONLY")
             results.append(api_result)
 
             return results
@@ -280,20 +385,9 @@ class User:
             }]
 
 
-    
-    def _replace_token_id(self, obj, token_id):
-        """Recursively replaces <TOKEN_ID> in a JSON object."""
-        if isinstance(obj, dict):
-            return {k: self._replace_token_id(v, token_id) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._replace_token_id(v, token_id) for v in obj]
-        elif isinstance(obj, str):
-            return obj.replace("<TOKEN_ID>", str(token_id))
-        return obj
-
 
 
-    async def _measure_api_block(self, endpoint, payload, task_type):
+    async def _measure_api_block(self, endpoint, body, task_type):
         """
         Executes API + blockchain and appends a synthetic [API-BLOCK] result (Async).
 
@@ -307,10 +401,19 @@ class User:
         # Note: _api_request returns (result, transaction)
         api_result, tx_body = await self._api_request(
             endpoint=endpoint,
-            payload=payload,
+            body=body,
             task_type=task_type
         )
 
+        # Pipelined: TX-SEND, TX-BLOCK and FULL arrive later through deferred_results
+        if self.pipelined:
+            bc_results = await self._blockchain_submit(tx_body, endpoint, start_time)
+
+            if self.interval_requests:
+                await asyncio.sleep(self.interval_requests)
+
+            return [api_result, *bc_results], tx_body, "pending"
+
         # BLOCKCHAIN
         bc_results, _, status = await self._blockchain_execute(tx_body, endpoint)
 
@@ -3,7 +3,7 @@ from users.user import User
 class UserERC1155(User):
     """Usuário especializado para testes com contratos ERC-1155."""
 
-    def __init__(self, host: str, mode: str, user_id: int, interval_requests: float):
+    def __init__(self, host: str, mode: str, user_id: int, interval_requests: float, private_key: str = None, batch_id: str = None, max_in_flight_tx: int = 1, read_only_response: str = "discard", http_trace: bool = False):
 
         super().__init__(
             host=host,
@@ -11,5 +11,10 @@ class UserERC1155(User):
             contract="ERC-1155",
             user_id=user_id,
             interval_requests=interval_requests,
-            campaign_names=["API-READ-ONLY", "API-TX-BUILD"]
+            campaign_names=["API-READ-ONLY", "API-TX-BUILD"],
+            private_key=private_key,
+            batch_id=batch_id,
+            max_in_flight_tx=max_in_flight_tx,
+            read_only_response=read_only_response,
+            http_trace=http_trace
         )
@@ -6,10 +6,11 @@ from typing import Optional
 
 from eth_account import Account
 from web3 import Web3
+from web3.exceptions import TransactionNotFound
 
 # Internal imports
-from config import PRIVATE_KEY, CONTRACT_ADDRESS, ABI_PATH
-from wallet.config import get_w3
+from config import PRIVATE_KEY, CONTRACT_ADDRESS, ABI_PATH, FUNDING_WINDOW
+from wallet.config import get_w3, get_chain_id, get_gas_price
 from log import SIZE
 
 # --- Locks e singletons ---
@@ -17,6 +18,9 @@ _admin_account: Optional[Account] = None
 _admin_init_lock = threading.Lock()
 _admin_tx_lock = threading.Lock()
 
+# Receipt polling of the pipelined funder
+FUNDING_POLL_INTERVAL = 0.5
+
 
 # ---------------------------
 # Admin account initialization
@@ -34,14 +38,14 @@ def get_admin_account():
 
 
 def _get_chain_id():
-    return get_w3().eth.chain_id
+    return get_chain_id()
 
 
 def _get_gas_price_wei(gwei: int) -> int:
     try:
         return get_w3().to_wei(gwei, "gwei")
     except Exception:
-        return get_w3().eth.gas_price
+        return get_gas_price()
 
 
 def _get_nonce_rpc(address: str) -> int:
@@ -283,6 +287,237 @@ def fund_wallets_batch(
 
 
 
+# -------------------------------------
+# FUND WALLETS PIPELINED
+# -------------------------------------
+def _send_transfer(w3, admin, target, value_wei, gas_price, nonce, chain_id):
+    tx = {
+        "from": admin.address,
+        "to": Web3.to_checksum_address(target),
+        "value": value_wei,
+        "gas": 21000,
+        "gasPrice": gas_price,
+        "nonce": nonce,
+        "chainId": chain_id,
+    }
+    signed_tx = w3.eth.account.sign_transaction(tx, PRIVATE_KEY)
+    return w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+
+
+def _find_receipt(w3, hashes):
+    """Receipt of whichever submission of a nonce got mined (None while pending)."""
+    for tx_hash in hashes:
+        try:
+            receipt = w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            continue
+        if receipt is not None:
+            return receipt
+    return None
+
+
+def _in_mempool(w3, hashes) -> bool:
+    for tx_hash in hashes:
+        try:
+            if w3.eth.get_transaction(tx_hash) is not None:
+                return True
+        except TransactionNotFound:
+            continue
+    return False
+
+
+def fund_wallets_pipelined(
+    recipients: list,  # List of (user_id, address) tuples
+    amount_eth: float = 1.0,
+    gas_price_gwei: int = 5,
+    window_size: int = FUNDING_WINDOW,
+    max_retries: int = 3,
+    receipt_timeout: float = 120
+) -> dict:
+    """
+    Fund multiple wallets with consecutive nonces assigned locally.
+
+    Transfers are submitted in windows of `window_size` without waiting for
+    each other and the receipts of a window are polled together, so a window
+    usually confirms within a block or two. A nonce whose transaction left the
+    mempool (or got no receipt within `receipt_timeout`) is re-submitted with
+    the same nonce and a higher gas price. A transfer abandoned after
+    `max_retries` is replaced by a 0-value self-transfer at its nonce, so it
+    never leaves a gap that would stall every later nonce; if even that cannot
+    be sent, the remaining transfers are given up at once.
+    """
+    admin = get_admin_account()
+    results = {}
+
+    if not recipients:
+        return results
+
+    logging.info("-" * SIZE)
+    logging.info(f"Starting PIPELINED funding for {len(recipients)} users (window {window_size})...")
+
+    w3 = get_w3()
+    chain_id = _get_chain_id()
+    gas_price = _get_gas_price_wei(gas_price_gwei)
+    value_wei = w3.to_wei(amount_eth, "ether")
+
+    valid = []
+    for user_id, target in recipients:
+        if Web3.is_address(target):
+            valid.append((user_id, target))
+        else:
+            logging.warning(f"\tInvalid address: {target} (User-{user_id:03d})")
+            results[user_id] = False
+
+    # The admin nonce sequence is owned by this batch until it finishes
+    with _admin_tx_lock:
+        balance = w3.eth.get_balance(admin.address)
+        unit_cost = value_wei + 21000 * gas_price * 2  # room for one gas bump per transfer
+        affordable = int(balance // unit_cost) if unit_cost else len(valid)
+        if affordable < len(valid):
+            logging.error(
+                f"\tInsufficient Admin Balance: {w3.from_wei(balance, 'ether')} ETH funds "
+                f"{affordable}/{len(valid)} users"
+            )
+            for user_id, _ in valid[affordable:]:
+                results[user_id] = False
+            valid = valid[:affordable]
+
+        next_nonce = _get_nonce_rpc(admin.address)
+        stalled_at = None
+
+        for start in range(0, len(valid), window_size):
+            window = valid[start:start + window_size]
+
+            # A gap that could not be filled blocks every later nonce
+            if stalled_at is not None:
+                for user_id, _ in window:
+                    results[user_id] = False
+                continue
+
+            pending = {}
+
+            for user_id, target in window:
+                pending[next_nonce] = {
+                    "user_id": user_id,
+                    "target": target,
+                    "hashes": [],
+                    "transfers": set(),
+                    "attempts": 0,
+                    "bumps": 0,
+                    "filler": False,
+                }
+                next_nonce += 1
+
+            def submit(nonce, entry):
+                entry["attempts"] += 1
+                entry["bumps"] += 1
+                # A replacement must outbid every previous submission of the same nonce
+                price = int(gas_price * (1 + 0.125 * (entry["bumps"] - 1)))
+                # A filler is a 0-value self-transfer that only consumes the nonce
+                target, value = (admin.address, 0) if entry["filler"] else (entry["target"], value_wei)
+                kind = "filler" if entry["filler"] else f"User-{entry['user_id']:03d}"
+                try:
+                    tx_hash = _send_transfer(w3, admin, target, value, price, nonce, chain_id)
+                    entry["hashes"].append(tx_hash)
+                    if not entry["filler"]:
+                        entry["transfers"].add(bytes(tx_hash))
+                    entry["deadline"] = time.monotonic() + receipt_timeout
+                    logging.debug(f"\t- Sent nonce {nonce} ({kind}, attempt {entry['attempts']}): {tx_hash.hex()[:10]}...")
+                except Exception as e:
+                    # Not in the mempool: retried after a short backoff
+                    entry["deadline"] = time.monotonic() + FUNDING_POLL_INTERVAL * 2 ** entry["attempts"]
+                    logging.error(f"\t- Error sending nonce {nonce} ({kind}, attempt {entry['attempts']}): {e}")
+
+            for nonce, entry in pending.items():
+                submit(nonce, entry)
+
+            logging.info(
+                f" Window {start // window_size + 1}: sent {len(window)} transfers "
+                f"(nonces {min(pending)}-{max(pending)}), waiting for receipts..."
+            )
+
+            while pending:
+                time.sleep(FUNDING_POLL_INTERVAL)
+
+                for nonce, entry in list(pending.items()):
+                    try:
+                        receipt = _find_receipt(w3, entry["hashes"])
+                    except Exception as e:
+                        logging.error(f"\t- Receipt error for nonce {nonce}: {e}")
+                        continue
+
+                    if receipt is not None:
+                        if bytes(receipt.transactionHash) not in entry["transfers"]:
+                            logging.info(f"\t- Gap at nonce {nonce} filled, User-{entry['user_id']:03d} not funded")
+                        else:
+                            success = receipt.status == 1
+                            results[entry["user_id"]] = success
+                            if success:
+                                logging.info(f"\t- Confirmed: User-{entry['user_id']:03d} funded with {amount_eth} ETH")
+                            else:
+                                logging.warning(f"\t- Failed (Revert): User-{entry['user_id']:03d} (nonce {nonce})")
+                        del pending[nonce]
+
+                if not pending:
+                    break
+
+                # Gap detection: anything below the mined nonce count without one of
+                # our receipts was consumed elsewhere; anything above it must still be
+                # in the mempool, otherwise it was dropped and is re-submitted
+                try:
+                    mined = w3.eth.get_transaction_count(admin.address, "latest")
+                except Exception as e:
+                    logging.error(f"\t- Failed to read admin nonce: {e}")
+                    continue
+
+                for nonce, entry in sorted(pending.items()):
+                    if nonce < mined and _find_receipt(w3, entry["hashes"]) is None:
+                        logging.error(f"\t- Nonce {nonce} used by another transaction, User-{entry['user_id']:03d} not funded")
+                        results[entry["user_id"]] = False
+                        del pending[nonce]
+                        continue
+
+                    # Without a hash the last send failed: it waits for its backoff
+                    dropped = bool(entry["hashes"]) and not _in_mempool(w3, entry["hashes"])
+                    if not dropped and time.monotonic() < entry["deadline"]:
+                        continue
+
+                    if entry["attempts"] >= max_retries:
+                        if entry["filler"]:
+                            logging.error(
+                                f"\t- Could not fill the gap at nonce {nonce}: every later nonce is stuck, "
+                                f"giving up on the remaining transfers"
+                            )
+                            stalled_at = nonce
+                            for other_nonce, other in list(pending.items()):
+                                if other_nonce >= nonce:
+                                    results[other["user_id"]] = False
+                                    del pending[other_nonce]
+                            break
+
+                        # Abandoning the nonce would stall every later one: consume it instead
+                        logging.error(
+                            f"\t- Failed to fund User-{entry['user_id']:03d} after {max_retries} attempts (nonce {nonce}), "
+                            f"filling the nonce with a 0-value transfer"
+                        )
+                        results[entry["user_id"]] = False
+                        entry["filler"] = True
+                        entry["attempts"] = 0
+                        submit(nonce, entry)
+                        continue
+
+                    reason = "dropped" if dropped else ("timed out" if entry["hashes"] else "not sent")
+                    logging.warning(f"\t- Nonce {nonce} {reason}, re-submitting (User-{entry['user_id']:03d})")
+                    submit(nonce, entry)
+
+    # Summary
+    success_count = sum(results.values())
+    logging.info("")
+    logging.info(f"Funding Complete: {success_count}/{len(recipients)} successful.")
+
+    return results
+
+
 # -------------------------------------
 # Contract loading
 # -------------------------------------
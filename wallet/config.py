@@ -1,4 +1,6 @@
 import os
+import time
+import asyncio
 import threading
 from web3 import Web3
 
@@ -9,6 +11,13 @@ _async_w3 = None
 _w3_lock = threading.Lock()
 _async_w3_lock = threading.Lock()
 
+# TTL (seconds) of the cached chain values, None = never expires
+CHAIN_CACHE_TTL = {
+    "chain_id": None,
+    "gas_price": 30.0,
+    "block_gas_limit": 60.0,
+}
+
 def get_w3():
     """Returns the synchronous Web3 instance, initializing it if necessary."""
     global _w3
@@ -34,6 +43,15 @@ def get_async_w3():
                 _async_w3 = None
     return _async_w3
 
+def set_rpc_url(url: str):
+    """Points the Web3 instances (and the chain cache) at another node, e.g. the stand-in server."""
+    global BESU_RPC_URL, _w3, _async_w3
+    with _w3_lock, _async_w3_lock:
+        BESU_RPC_URL = url
+        _w3 = None
+        _async_w3 = None
+    chain_cache.invalidate()
+
 def check_connection():
     """Verifica se a conexão com o nó Ethereum foi bem-sucedida."""
     # Verifica w3 sync
@@ -51,3 +69,112 @@ def check_connection():
 
 # Lock para garantir que o nonce seja acessado de forma thread-safe
 NONCE_LOCK = threading.Lock()
+
+
+class ChainCache:
+    """
+    Per-key TTL cache of chain-level values (chain id, gas price, gas limit).
+
+    Refreshes are single-flight: concurrent threads (sync admin path) wait on
+    a per-key lock, and concurrent coroutines of the same loop (async user
+    path) await the same in-flight fetch, so an expired key costs one RPC call
+    no matter how many users ask for it at once.
+    """
+
+    def __init__(self, ttls: dict):
+        self.ttls = ttls
+        self._values = {}
+        self._locks = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key):
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        ttl = self.ttls.get(key)
+        if ttl is not None and time.monotonic() - entry[1] > ttl:
+            return None
+        return entry
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _store(self, key, value):
+        self._values[key] = (value, time.monotonic())
+        return value
+
+    def get(self, key, fetch):
+        """Cached value of `key`, calling `fetch()` once when it is missing or expired."""
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry[0]
+
+        with self._key_lock(key):
+            entry = self._fresh(key)
+            if entry is not None:
+                return entry[0]
+            return self._store(key, fetch())
+
+    async def get_async(self, key, fetch):
+        """Async variant: `fetch` is a coroutine function, awaited once per refresh."""
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry[0]
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is None or inflight[0] is not loop:
+            future = asyncio.ensure_future(fetch())
+            inflight = self._inflight[key] = (loop, future)
+
+            def done(task, key=key):
+                if self._inflight.get(key, (None, None))[1] is task:
+                    del self._inflight[key]
+                if not task.cancelled() and task.exception() is None:
+                    self._store(key, task.result())
+
+            future.add_done_callback(done)
+
+        # Shielded: a cancelled caller must not cancel the fetch shared with the others
+        return await asyncio.shield(inflight[1])
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._values.clear()
+        else:
+            self._values.pop(key, None)
+
+
+chain_cache = ChainCache(CHAIN_CACHE_TTL)
+
+
+def get_chain_id() -> int:
+    return chain_cache.get("chain_id", lambda: get_w3().eth.chain_id)
+
+
+def get_gas_price() -> int:
+    return chain_cache.get("gas_price", lambda: get_w3().eth.gas_price)
+
+
+def get_block_gas_limit() -> int:
+    return chain_cache.get("block_gas_limit", lambda: get_w3().eth.get_block("latest")["gasLimit"])
+
+
+async def get_chain_id_async() -> int:
+    async def fetch():
+        return await get_async_w3().eth.chain_id
+    return await chain_cache.get_async("chain_id", fetch)
+
+
+async def get_gas_price_async() -> int:
+    async def fetch():
+        return await get_async_w3().eth.gas_price
+    return await chain_cache.get_async("gas_price", fetch)
+
+
+async def get_block_gas_limit_async() -> int:
+    async def fetch():
+        return (await get_async_w3().eth.get_block("latest"))["gasLimit"]
+    return await chain_cache.get_async("block_gas_limit", fetch)
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import logging
+import threading
+
+from eth_account import Account
+
+
+def authorization_scope(host: str, contract: str, chain_id: int) -> str:
+    """
+    Key of an authorization in the pool: the contract label of the API is only
+    unique per deployment, so the same label on another host or chain (e.g. a
+    redeployed node) is a different contract to authorize.
+    """
+    return f"{chain_id}@{host.rstrip('/')}/{contract}"
+
+
+class WalletPool:
+    """
+    Persistent pool of test wallets (JSON file), reused across runs and sweeps.
+
+    Each entry keeps the private key, the contracts the address was already
+    authorized for (scoped by chain and API host, see `authorization_scope()`)
+    and the last known balance (ETH). LoadTester takes the
+    first N wallets of the pool for its N users, authorizes only the addresses
+    missing for the contract and tops up only the wallets whose balance
+    dropped below the threshold, instead of creating, authorizing and funding
+    fresh wallets for every run.
+
+    The file holds private keys of disposable test wallets only: keep it out
+    of version control.
+    """
+
+    def __init__(self, path: str, wallets: list = None):
+        self.path = path
+        self.wallets = wallets or []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.wallets)
+
+    @classmethod
+    def load(cls, path: str) -> "WalletPool":
+        """Reads the pool from `path` (an empty pool when the file does not exist yet)."""
+        if not os.path.exists(path):
+            return cls(path)
+
+        with open(path) as f:
+            data = json.load(f)
+        return cls(path, data.get("wallets", []))
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = {"updated": int(time.time()), "wallets": self.wallets}
+
+        # Write then rename, so an interrupted run never leaves a truncated pool
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def ensure(self, size: int):
+        """Grows the pool to at least `size` wallets (new keys are generated locally)."""
+        created = 0
+        with self._lock:
+            while len(self.wallets) < size:
+                account = Account.create()
+                self.wallets.append({
+                    "private_key": account.key.hex(),
+                    "address": account.address,
+                    "authorized": [],
+                    "balance": 0.0,
+                })
+                created += 1
+
+        if created:
+            logging.info(f"[WalletPool] Created {created} wallets ({len(self.wallets)} in {self.path})")
+            self.save()
+
+    def user_specs(self, amount_users: int) -> list:
+        """(user_id, private_key, batch_id) for users 1..amount_users, as LoadTester expects."""
+        self.ensure(amount_users)
+        return [
+            (user_id, self.wallets[user_id - 1]["private_key"], None)
+            for user_id in range(1, amount_users + 1)
+        ]
+
+    def _entry(self, address: str):
+        for entry in self.wallets:
+            if entry["address"] == address:
+                return entry
+        raise KeyError(f"Address not in wallet pool: {address}")
+
+    def is_authorized(self, address: str, scope: str) -> bool:
+        """`scope` is an `authorization_scope()` key."""
+        return scope in self._entry(address)["authorized"]
+
+    def mark_authorized(self, addresses: list, scope: str):
+        with self._lock:
+            for address in addresses:
+                entry = self._entry(address)
+                if scope not in entry["authorized"]:
+                    entry["authorized"].append(scope)
+
+    def balance(self, address: str) -> float:
+        return self._entry(address)["balance"]
+
+    def set_balance(self, address: str, balance_eth: float):
+        with self._lock:
+            self._entry(address)["balance"] = float(balance_eth)
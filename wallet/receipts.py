@@ -0,0 +1,117 @@
+import asyncio
+import logging
+
+# Internal imports
+from wallet.config import get_async_w3
+
+# How often the tracker asks the node for its block number
+BLOCK_POLL_INTERVAL = 0.25
+
+
+class ReceiptTracker:
+    """
+    Resolves transaction receipts by following new blocks (Async).
+
+    Instead of every transaction polling eth_getTransactionReceipt on its own,
+    one task polls eth_blockNumber, reads each new block's transaction hashes
+    and fetches receipts only for the hashes being tracked. RPC traffic no
+    longer grows with the number of pending transactions, and a receipt is
+    resolved as soon as its block is seen.
+
+    Hashes are registered with `track()` before the raw transaction is sent,
+    so a transaction can never be mined in a block the tracker already read.
+    A resolved receipt stays in the tracker until `wait()` (or `forget()`)
+    consumes it, so a block that lands before its waiter is not lost.
+    """
+
+    def __init__(self, poll_interval: float = BLOCK_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._pending = {}
+        self._last_block = None
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def track(self, tx_hash) -> asyncio.Future:
+        """Future resolved with the receipt of `tx_hash` (call before sending it)."""
+        key = bytes(tx_hash)
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.get_running_loop().create_future()
+        return future
+
+    def forget(self, tx_hash):
+        future = self._pending.pop(bytes(tx_hash), None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    async def wait(self, tx_hash, timeout: float):
+        """Waits for the receipt of a tracked hash (raises asyncio.TimeoutError)."""
+        future = self.track(tx_hash)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            self.forget(tx_hash)
+
+    def _waiting(self) -> bool:
+        return any(not future.done() for future in self._pending.values())
+
+    async def _resolve(self, async_w3, tx_hash):
+        future = self._pending.get(bytes(tx_hash))
+        if future is None or future.done():
+            return
+        try:
+            future.set_result(await async_w3.eth.get_transaction_receipt(tx_hash))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+    async def _poll(self, async_w3):
+        idle = not self._waiting()
+        head = await async_w3.eth.block_number
+
+        # First poll: start at the head (re-reading it if users already sent)
+        if self._last_block is None:
+            self._last_block = head - 1 if self._waiting() else head
+
+        # Nothing was tracked before the head was read: just follow it
+        if idle and not self._waiting():
+            self._last_block = head
+            return
+
+        for number in range(self._last_block + 1, head + 1):
+            block = await async_w3.eth.get_block(number)
+            ours = [tx_hash for tx_hash in block["transactions"]
+                    if bytes(tx_hash) in self._pending and not self._pending[bytes(tx_hash)].done()]
+            if ours:
+                await asyncio.gather(*(self._resolve(async_w3, tx_hash) for tx_hash in ours))
+            self._last_block = number
+
+    async def run(self):
+        """Event loop task: follows the chain head until cancelled."""
+        async_w3 = get_async_w3()
+        self._last_block = None
+
+        try:
+            while True:
+                try:
+                    await self._poll(async_w3)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # The block is read again on the next poll
+                    logging.debug(f"[Receipts] Block poll failed: {type(e).__name__}: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.cancel()
+            self._pending.clear()
+
+    def start(self):
+        """Starts the tracker task on the running loop."""
+        self._task = asyncio.create_task(self.run())
+        return self._task
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from collections import Counter
+
+# Internal imports
+from wallet.config import get_async_w3
+from config import REVERT_CONCURRENCY
+
+
+class RevertLog:
+    """
+    Reverted transactions of a phase, kept for the post-run analysis.
+
+    Wallets only record the hash when a receipt comes back with status 0; the
+    get_transaction + eth_call replay that recovers the revert reason runs after
+    the phase (`resolve_revert_reasons`), outside the measured TX-SEND window.
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def record(self, user_id, request_id, tx_hash, block_number):
+        self.entries.append({
+            "user_id": user_id,
+            "request": request_id,
+            "tx_hash": tx_hash.hex() if isinstance(tx_hash, (bytes, bytearray)) else str(tx_hash),
+            "block": block_number,
+        })
+
+    def drain(self) -> list:
+        """Returns the recorded entries and starts a new log (one per phase)."""
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def _reason(error: Exception) -> str:
+    """Revert reason carried by the eth_call error ("execution reverted: ..." for Besu)."""
+    message = str(error) or type(error).__name__
+    return message.replace("execution reverted:", "").strip() or "execution reverted"
+
+
+async def _replay(async_w3, entry, calls: dict, semaphore: asyncio.Semaphore):
+    async with semaphore:
+        tx = await async_w3.eth.get_transaction(entry["tx_hash"])
+
+    # The same call against the same state reverts for the same reason: replay it once
+    key = (tx["from"], tx["to"], bytes(tx["input"]), tx["value"], entry["block"])
+    if key not in calls:
+        calls[key] = asyncio.ensure_future(_call(async_w3, tx, entry["block"], semaphore))
+    return await calls[key]
+
+
+async def _call(async_w3, tx, block_number, semaphore: asyncio.Semaphore) -> str:
+    async with semaphore:
+        try:
+            await async_w3.eth.call({
+                "to": tx["to"],
+                "from": tx["from"],
+                "data": tx["input"],
+                "value": tx["value"],
+            }, block_number - 1)
+        except Exception as e:
+            return _reason(e)
+
+    # The replay on the parent block succeeded: the revert depended on the block's own transactions
+    return "not reproduced"
+
+
+async def resolve_revert_reasons(entries: list, concurrency: int = REVERT_CONCURRENCY) -> list:
+    """Adds the "reason" of every reverted transaction, replaying `concurrency` calls at a time (Async)."""
+    if not entries:
+        return entries
+
+    async_w3 = get_async_w3()
+    semaphore = asyncio.Semaphore(concurrency)
+    calls = {}
+
+    reasons = await asyncio.gather(
+        *(_replay(async_w3, entry, calls, semaphore) for entry in entries),
+        return_exceptions=True
+    )
+
+    for entry, reason in zip(entries, reasons):
+        if isinstance(reason, Exception):
+            reason = f"unresolved ({type(reason).__name__}: {reason})"
+        entry["reason"] = reason
+
+    logging.info(f"[Reverts] {len(entries)} reverted transactions ({len(calls)} calls replayed)")
+    for reason, count in Counter(entry["reason"] for entry in entries).most_common():
+        logging.info(f"\t- {count:>5}x {reason}")
+
+    return entries
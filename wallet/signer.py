@@ -0,0 +1,82 @@
+import time
+import asyncio
+import logging
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from eth_account import Account
+
+
+class SignedRawTransaction:
+    """Picklable result of a pool signature (what send_transaction needs)."""
+
+    __slots__ = ("raw_transaction", "hash")
+
+    def __init__(self, raw_transaction: bytes, tx_hash: bytes):
+        self.raw_transaction = raw_transaction
+        self.hash = tx_hash
+
+
+def _sign(private_key: bytes, tx: dict):
+    """Runs in the pool: returns the signed transaction and the signing time (seconds)."""
+    start_time = time.perf_counter()
+    signed_tx = Account.sign_transaction(tx, private_key)
+    duration = time.perf_counter() - start_time
+    return SignedRawTransaction(bytes(signed_tx.raw_transaction), bytes(signed_tx.hash)), duration
+
+
+class TransactionSigner:
+    """
+    Signs transactions off the event loop (Async).
+
+    "thread" uses a thread pool (no pickling, but ECDSA still competes for the
+    GIL); "process" uses a pool of spawned processes fed through the executor
+    queue, with `workers=1` being a dedicated signer process. `sign()` returns
+    the signing time measured inside the pool, so the caller can split the
+    total elapsed time into signing and queue wait.
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 2):
+        self.mode = mode
+        self.workers = workers
+
+        if mode == "process":
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+        elif mode == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="signer")
+        else:
+            raise ValueError(f"Invalid signer mode '{mode}'")
+
+        logging.info(f"[Signer] Signing transactions in a {mode} pool ({workers} workers)")
+
+    async def sign(self, wallet, tx: dict):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _sign, bytes(wallet.account.key), tx)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+# One signer per process, shared by every user of every LoadTester
+_signer = None
+
+
+def configure_signer(mode: str = "inline", workers: int = 2):
+    """Sets up the process-wide signer ("inline" signs on the event loop, as before)."""
+    global _signer
+
+    if _signer is not None and (_signer.mode, _signer.workers) == (mode, workers):
+        return _signer
+
+    if _signer is not None:
+        _signer.close()
+        _signer = None
+
+    if mode != "inline":
+        _signer = TransactionSigner(mode, workers)
+    return _signer
+
+
+def get_signer():
+    """The configured signer, or None when signing inline."""
+    return _signer
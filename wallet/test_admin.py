@@ -0,0 +1,129 @@
+import types
+
+import pytest
+
+pytest.importorskip("web3")
+
+from hexbytes import HexBytes
+
+import wallet.admin as admin
+
+ADMIN = "0x" + "ad" * 20
+
+
+class FakeChain:
+    """
+    Admin nonce sequence of a node: the latest submission of each nonce sits in
+    the mempool and nonces are mined strictly in order. `rejects(nonce, value)`
+    makes a send fail, `drops(nonce, value)` accepts it but evicts it from the
+    mempool so it is never mined.
+    """
+
+    def __init__(self, base=10, rejects=None, drops=None):
+        self.mined = base
+        self.mempool = {}
+        self.receipts = {}
+        self.sent = []
+        self.rejects = rejects or (lambda nonce, value: False)
+        self.drops = drops or (lambda nonce, value: False)
+        self.eth = types.SimpleNamespace(
+            get_balance=lambda address: 10 ** 24,
+            get_transaction_count=lambda address, block: self.mined,
+        )
+
+    to_wei = staticmethod(lambda value, unit: int(value * 10 ** 18) if unit == "ether" else int(value * 10 ** 9))
+    from_wei = staticmethod(lambda value, unit: value / 10 ** 18)
+
+    def send(self, w3, account, target, value, gas_price, nonce, chain_id):
+        if nonce < self.mined:
+            raise ValueError("nonce too low")
+        if self.rejects(nonce, value):
+            raise ConnectionError("send rejected")
+        tx_hash = HexBytes(bytes([len(self.sent) + 1]) * 32)
+        self.sent.append({"nonce": nonce, "to": target, "value": value, "gas_price": gas_price, "hash": tx_hash})
+        if not self.drops(nonce, value):
+            self.mempool[nonce] = tx_hash
+        return tx_hash
+
+    def mine(self):
+        while self.mined in self.mempool:
+            tx_hash = self.mempool.pop(self.mined)
+            self.receipts[tx_hash] = types.SimpleNamespace(status=1, transactionHash=tx_hash)
+            self.mined += 1
+
+    def find_receipt(self, w3, hashes):
+        self.mine()
+        for tx_hash in hashes:
+            receipt = self.receipts.get(bytes(tx_hash))
+            if receipt is not None:
+                return receipt
+        return None
+
+    def in_mempool(self, w3, hashes):
+        return any(bytes(tx_hash) in self.mempool.values() for tx_hash in hashes)
+
+
+@pytest.fixture
+def chain_factory(monkeypatch):
+    def factory(**kwargs):
+        chain = FakeChain(**kwargs)
+        monkeypatch.setattr(admin, "get_admin_account", lambda: types.SimpleNamespace(address=ADMIN))
+        monkeypatch.setattr(admin, "get_w3", lambda: chain)
+        monkeypatch.setattr(admin, "_get_chain_id", lambda: 1337)
+        monkeypatch.setattr(admin, "_get_gas_price_wei", lambda gwei: gwei * 10 ** 9)
+        monkeypatch.setattr(admin, "_get_nonce_rpc", lambda address: chain.mined)
+        monkeypatch.setattr(admin, "_send_transfer", chain.send)
+        monkeypatch.setattr(admin, "_find_receipt", chain.find_receipt)
+        monkeypatch.setattr(admin, "_in_mempool", chain.in_mempool)
+        monkeypatch.setattr(admin, "FUNDING_POLL_INTERVAL", 0.001)
+        return chain
+    return factory
+
+
+def _recipients(count):
+    return [(user_id, "0x" + f"{user_id:040x}") for user_id in range(1, count + 1)]
+
+
+def _fund(count, window_size=3):
+    return admin.fund_wallets_pipelined(_recipients(count), window_size=window_size, receipt_timeout=0.05)
+
+
+def test_all_transfers_confirmed(chain_factory):
+    chain = chain_factory()
+    assert _fund(7) == {user_id: True for user_id in range(1, 8)}
+    assert [tx["nonce"] for tx in chain.sent] == list(range(10, 17))
+
+
+def test_rejected_send_is_filled_and_later_nonces_proceed(chain_factory):
+    # The transfer of nonce 11 (user 2) never reaches the mempool
+    chain = chain_factory(rejects=lambda nonce, value: nonce == 11 and value > 0)
+    results = _fund(7)
+
+    assert results[2] is False
+    assert all(results[user_id] for user_id in range(1, 8) if user_id != 2)
+
+    fillers = [tx for tx in chain.sent if tx["value"] == 0]
+    assert [(tx["nonce"], tx["to"]) for tx in fillers] == [(11, ADMIN)]
+    assert chain.mined == 17
+
+
+def test_dropped_transfer_is_filled(chain_factory):
+    # Accepted, then evicted from the mempool on every attempt
+    chain = chain_factory(drops=lambda nonce, value: nonce == 12 and value > 0)
+    results = _fund(5)
+
+    assert results == {1: True, 2: True, 3: False, 4: True, 5: True}
+    transfers = [tx for tx in chain.sent if tx["nonce"] == 12 and tx["value"] > 0]
+    assert len(transfers) == 3
+    # Every re-submission and the filler outbid the previous one
+    prices = [tx["gas_price"] for tx in chain.sent if tx["nonce"] == 12]
+    assert prices == sorted(prices) and len(set(prices)) == len(prices)
+
+
+def test_unfillable_gap_gives_up_on_the_rest(chain_factory):
+    chain = chain_factory(rejects=lambda nonce, value: nonce == 11)
+    results = _fund(7)
+
+    assert results == {1: True, 2: False, 3: False, 4: False, 5: False, 6: False, 7: False}
+    # Nothing is sent past the stuck window
+    assert max(tx["nonce"] for tx in chain.sent) == 12
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import types
+
+import pytest
+
+pytest.importorskip("web3")
+
+import wallet.config
+from wallet.config import ChainCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(wallet.config, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _counter(value=None):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return value if value is not None else len(calls)
+    return fetch, calls
+
+
+def test_value_is_cached_until_ttl(clock):
+    cache = ChainCache({"gas_price": 30.0})
+    fetch, calls = _counter()
+
+    assert cache.get("gas_price", fetch) == 1
+    clock.now += 29
+    assert cache.get("gas_price", fetch) == 1
+    clock.now += 2
+    assert cache.get("gas_price", fetch) == 2
+    assert len(calls) == 2
+
+
+def test_no_ttl_never_expires(clock):
+    cache = ChainCache({"chain_id": None})
+    fetch, calls = _counter()
+
+    cache.get("chain_id", fetch)
+    clock.now += 1e9
+    cache.get("chain_id", fetch)
+    assert len(calls) == 1
+
+
+def test_invalidate(clock):
+    cache = ChainCache({})
+    fetch, calls = _counter()
+
+    cache.get("chain_id", fetch)
+    cache.invalidate("chain_id")
+    assert cache.get("chain_id", fetch) == 2
+    cache.invalidate()
+    assert cache.get("chain_id", fetch) == 3
+
+
+def test_threads_share_one_fetch():
+    cache = ChainCache({"chain_id": None})
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(1)
+        return 1337
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("chain_id", fetch))) for _ in range(8)]
+    threads[0].start()
+    started.wait(1)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [1337] * 8
+    assert len(calls) == 1
+
+
+def test_coroutines_share_one_fetch():
+    async def scenario():
+        cache = ChainCache({"gas_price": 30.0})
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 7
+
+        results = await asyncio.gather(*(cache.get_async("gas_price", fetch) for _ in range(20)))
+        assert results == [7] * 20
+        assert len(calls) == 1
+
+        # Stored by the shared fetch: the next call is a cache hit
+        assert await cache.get_async("gas_price", fetch) == 7
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch():
+    async def scenario():
+        cache = ChainCache({"chain_id": None})
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return 1337
+
+        first = asyncio.ensure_future(cache.get_async("chain_id", fetch))
+        second = asyncio.ensure_future(cache.get_async("chain_id", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 1337
+        assert first.cancelled()
+
+    asyncio.run(scenario())
+
+
+def test_failed_fetch_is_not_cached():
+    async def scenario():
+        cache = ChainCache({"chain_id": None})
+        attempts = []
+
+        async def fetch():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("node down")
+            return 1337
+
+        with pytest.raises(ConnectionError):
+            await cache.get_async("chain_id", fetch)
+        assert await cache.get_async("chain_id", fetch) == 1337
+
+    asyncio.run(scenario())
+
+
+def test_async_value_expires(clock):
+    async def scenario():
+        cache = ChainCache({"gas_price": 30.0})
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return len(calls)
+
+        assert await cache.get_async("gas_price", fetch) == 1
+        clock.now += 31
+        assert await cache.get_async("gas_price", fetch) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,104 @@
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("web3")
+
+from wallet.receipts import ReceiptTracker
+
+
+class FakeEth:
+    """Chain of `blocks` (list of tx hash lists); block i has number i + 1."""
+
+    def __init__(self):
+        self.blocks = []
+        self.receipt_calls = 0
+
+    @property
+    async def block_number(self):
+        return len(self.blocks)
+
+    async def get_block(self, number):
+        return {"transactions": self.blocks[number - 1]}
+
+    async def get_transaction_receipt(self, tx_hash):
+        self.receipt_calls += 1
+        return types.SimpleNamespace(transactionHash=tx_hash, status=1)
+
+
+def _w3():
+    return types.SimpleNamespace(eth=FakeEth())
+
+
+def test_block_before_wait_resolves():
+    async def scenario():
+        w3 = _w3()
+        tracker = ReceiptTracker()
+        tx_hash = b"\x01" * 32
+
+        await tracker._poll(w3)
+        tracker.track(tx_hash)
+        # Mined and read by the tracker before anyone waits for it
+        w3.eth.blocks.append([tx_hash])
+        await tracker._poll(w3)
+
+        receipt = await tracker.wait(tx_hash, timeout=0.1)
+        assert receipt.transactionHash == tx_hash
+        assert not tracker._pending
+
+    asyncio.run(scenario())
+
+
+def test_wait_before_block_resolves():
+    async def scenario():
+        w3 = _w3()
+        tracker = ReceiptTracker()
+        tx_hash = b"\x02" * 32
+
+        await tracker._poll(w3)
+        tracker.track(tx_hash)
+        waiter = asyncio.ensure_future(tracker.wait(tx_hash, timeout=1))
+        await asyncio.sleep(0)
+
+        w3.eth.blocks.append([b"\x03" * 32, tx_hash])
+        await tracker._poll(w3)
+
+        assert (await waiter).transactionHash == tx_hash
+        assert w3.eth.receipt_calls == 1
+        assert not tracker._pending
+
+    asyncio.run(scenario())
+
+
+def test_resolved_hash_does_not_keep_tracker_busy():
+    async def scenario():
+        w3 = _w3()
+        tracker = ReceiptTracker()
+        tx_hash = b"\x04" * 32
+
+        await tracker._poll(w3)
+        tracker.track(tx_hash)
+        w3.eth.blocks.append([tx_hash])
+        await tracker._poll(w3)
+
+        # Only the resolved (not yet consumed) hash is left: new blocks are skipped
+        w3.eth.blocks.append([b"\x05" * 32])
+        await tracker._poll(w3)
+        assert tracker._last_block == 2
+        assert w3.eth.receipt_calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_timeout_forgets_hash():
+    async def scenario():
+        tracker = ReceiptTracker()
+        tx_hash = b"\x06" * 32
+
+        tracker.track(tx_hash)
+        with pytest.raises(asyncio.TimeoutError):
+            await tracker.wait(tx_hash, timeout=0.01)
+        assert not tracker._pending
+
+    asyncio.run(scenario())
@@ -0,0 +1,149 @@
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("web3")
+pytest.importorskip("dotenv")
+
+import wallet.wallet as wallet_module
+from wallet.wallet import Wallet
+
+
+class FakeW3:
+    """
+    Node whose pending nonce is `pending`: the next `fail_sends` sends raise,
+    receipts have `status` (None makes them time out).
+    """
+
+    def __init__(self, pending=5, fail_sends=0, status=1):
+        self.pending = pending
+        self.fail_sends = fail_sends
+        self.status = status
+        self.gas_price_error = None
+        self.count_calls = 0
+        self.sent = []
+        self.eth = types.SimpleNamespace(
+            get_transaction_count=self.get_transaction_count,
+            send_raw_transaction=self.send_raw_transaction,
+            wait_for_transaction_receipt=self.wait_for_transaction_receipt,
+        )
+
+    to_wei = staticmethod(lambda value, unit: int(value * 10 ** 18))
+
+    async def gas_price(self):
+        if self.gas_price_error is not None:
+            raise self.gas_price_error
+        return 10 ** 9
+
+    async def get_transaction_count(self, address, block):
+        self.count_calls += 1
+        return self.pending
+
+    async def send_raw_transaction(self, raw):
+        if self.fail_sends:
+            self.fail_sends -= 1
+            raise ValueError("nonce too high")
+        self.sent.append(raw)
+        self.pending += 1
+        return b"\x01" * 32
+
+    async def wait_for_transaction_receipt(self, tx_hash, timeout):
+        if self.status is None:
+            raise asyncio.TimeoutError()
+        return types.SimpleNamespace(status=self.status, blockNumber=1)
+
+
+@pytest.fixture
+def w3(monkeypatch):
+    fake = FakeW3()
+
+    async def constant(value):
+        return value
+
+    monkeypatch.setattr(wallet_module, "get_async_w3", lambda: fake)
+    monkeypatch.setattr(wallet_module, "get_gas_price_async", fake.gas_price)
+    monkeypatch.setattr(wallet_module, "get_chain_id_async", lambda: constant(1337))
+    monkeypatch.setattr(wallet_module, "get_block_gas_limit_async", lambda: constant(30_000_000))
+    return fake
+
+
+def _signed(nonce):
+    return types.SimpleNamespace(hash=bytes([nonce]) * 32, raw_transaction=bytes([nonce]))
+
+
+async def _build_and_send(wallet, request_id=1):
+    tx = await wallet.build_transaction({"from": wallet.address, "to": wallet.address})
+    return tx["nonce"], await wallet.broadcast_transaction(_signed(tx["nonce"]), request_id)
+
+
+def test_nonce_read_once_then_incremented(w3):
+    wallet = Wallet(1)
+
+    async def scenario():
+        return [(await _build_and_send(wallet, i))[0] for i in range(3)]
+
+    assert asyncio.run(scenario()) == [5, 6, 7]
+    assert w3.count_calls == 1
+
+
+def test_send_failure_resyncs_from_node(w3):
+    wallet = Wallet(1)
+
+    async def scenario():
+        first = await _build_and_send(wallet)
+        w3.fail_sends = 1
+        failed = await _build_and_send(wallet)
+        # Someone else used a nonce meanwhile: only the node knows it
+        w3.pending += 1
+        retried = await _build_and_send(wallet)
+        return first, failed, retried
+
+    first, failed, retried = asyncio.run(scenario())
+
+    assert first[0] == 5 and first[1] is not None
+    assert failed == (6, None)
+    assert wallet._nonce == 8
+    assert retried[0] == 7 and retried[1] is not None
+    assert w3.count_calls == 2
+
+
+def test_failed_build_does_not_consume_a_nonce(w3):
+    wallet = Wallet(1)
+
+    async def scenario():
+        await _build_and_send(wallet)
+        w3.gas_price_error = ConnectionError("node down")
+        assert await wallet.build_transaction({"from": wallet.address, "to": wallet.address}) is None
+        w3.gas_price_error = None
+        return (await _build_and_send(wallet))[0]
+
+    assert asyncio.run(scenario()) == 6
+    assert w3.count_calls == 2
+
+
+@pytest.mark.parametrize("status", [0, None], ids=["reverted", "receipt-timeout"])
+def test_revert_or_lost_receipt_resyncs(w3, status):
+    wallet = Wallet(1)
+    w3.status = status
+
+    async def scenario():
+        tx = await wallet.build_transaction({"from": wallet.address, "to": wallet.address})
+        tx_hash, _ = await wallet.send_transaction(_signed(tx["nonce"]), 1)
+        return tx_hash
+
+    assert asyncio.run(scenario()) is not None
+    assert wallet._nonce is None
+
+
+def test_explicit_nonce_bypasses_the_manager(w3):
+    wallet = Wallet(1)
+
+    async def scenario():
+        tx = await wallet.build_transaction({"from": wallet.address, "to": wallet.address}, nonce=42)
+        await wallet.broadcast_transaction(_signed(tx["nonce"]), 1)
+        return tx["nonce"]
+
+    assert asyncio.run(scenario()) == 42
+    assert w3.count_calls == 0
+    assert wallet._nonce is None
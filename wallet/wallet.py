@@ -7,9 +7,12 @@ from eth_account import Account
 from eth_account.signers.local import LocalAccount
 
 # Internal imports
-from wallet.config import get_async_w3
+from wallet.config import get_async_w3, get_chain_id_async, get_gas_price_async, get_block_gas_limit_async
 from config import TIMEOUT_BLOCKCHAIN
 
+# Gas limit of the user transactions (capped by the block gas limit)
+TX_GAS_LIMIT = 1_000_000
+
 class Wallet:
     """Represents an Ethereum wallet associated with a user (Async)."""
 
@@ -24,6 +27,27 @@ class Wallet:
         )
         self.address = self.account.address
 
+        # Local nonce manager: the nonce is read once and incremented on every
+        # accepted submission; any send failure or revert forces a resync
+        self._nonce = None
+        self._built_nonce = None
+
+        # Shared wallet.receipts.ReceiptTracker (set by LoadTester), per-tx polling otherwise
+        self.receipt_tracker = None
+
+        # Shared wallet.reverts.RevertLog (set by LoadTester): reverts analyzed after the run
+        self.revert_log = None
+
+    def resync_nonce(self):
+        """Drops the local nonce so the next build reads it from the node."""
+        self._nonce = None
+
+    async def _next_nonce(self, async_w3) -> int:
+        if self._nonce is None:
+            self._nonce = await async_w3.eth.get_transaction_count(self.address, "pending")
+            logging.debug(f"[User-{self.user_id:03d}] [wallet:{self.address}] Nonce synchronized: {self._nonce}")
+        return self._nonce
+
     async def get_balance(self) -> float:
         """Return the wallet balance in ETH."""
         try:
@@ -56,78 +80,124 @@ class Wallet:
             return None
 
 
-    async def send_transaction(self, signed_tx, request_id, wait_receipt: bool = True):
-        """Send a signed transaction to the network (Async)."""
+    def _active_tracker(self):
+        if self.receipt_tracker is not None and self.receipt_tracker.running:
+            return self.receipt_tracker
+        return None
+
+    async def broadcast_transaction(self, signed_tx, request_id, track_receipt: bool = True):
+        """Sends a signed transaction without waiting for it (Async). Returns the hash, or None."""
         async_w3 = get_async_w3()
-        
+
+        tracker = self._active_tracker()
+        if track_receipt and tracker is not None:
+            # Registered before sending, so the block that includes it is never missed
+            tracker.track(signed_tx.hash)
+
         try:
             # Send raw transaction
-            tx_hash_bytes = await async_w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            tx_hash = tx_hash_bytes # hex() is called later usually
+            tx_hash = await async_w3.eth.send_raw_transaction(signed_tx.raw_transaction)
 
-            if wait_receipt:
-                # Wait for receipt
-                receipt = await async_w3.eth.wait_for_transaction_receipt(tx_hash, timeout=TIMEOUT_BLOCKCHAIN)
-                
-                if receipt.status == 0:
-                    # Try to get revert reason (call trace)
-                    try:
-                        tx = await async_w3.eth.get_transaction(tx_hash)
-                        await async_w3.eth.call({
-                            "to": tx["to"],
-                            "from": tx["from"],
-                            "data": tx["input"],
-                            "value": tx["value"],
-                        }, receipt.blockNumber - 1)
-                    except Exception as e:
-                        logging.error(
-                            f"[User-{self.user_id:03d}]" 
-                            f"  [Req-{request_id:03d}]"
-                            f"  [wallet:{self.address}]"
-                            f"  Revert reason: {e}"
-                        )
-                
-                return tx_hash, receipt
+            # Accepted by the node: the built nonce is used
+            if self._nonce is not None and self._built_nonce == self._nonce:
+                self._nonce += 1
 
-            return tx_hash, None
+            return tx_hash
 
         except Exception as e:
+            if tracker is not None:
+                tracker.forget(signed_tx.hash)
+
+            # Nonce too low/high, rejected or unknown outcome: read it again next time
+            self.resync_nonce()
             logging.error(
                 f"[User-{self.user_id:03d}]"
                 f" [Req-{request_id:03d}]" 
                 f" [wallet:{self.address}]"
                 f" Send failed: {e}"
             )
+            return None
+
+    async def wait_for_receipt(self, signed_tx, tx_hash, request_id):
+        """Receipt of a broadcast transaction (shared tracker or per-tx polling), None on failure (Async)."""
+        async_w3 = get_async_w3()
+        tracker = self._active_tracker()
+
+        try:
+            if tracker is not None:
+                receipt = await tracker.wait(signed_tx.hash, timeout=TIMEOUT_BLOCKCHAIN)
+            else:
+                receipt = await async_w3.eth.wait_for_transaction_receipt(tx_hash, timeout=TIMEOUT_BLOCKCHAIN)
+
+        except Exception as e:
+            # Unknown outcome: read the nonce again next time
+            self.resync_nonce()
+            logging.error(
+                f"[User-{self.user_id:03d}]"
+                f" [Req-{request_id:03d}]" 
+                f" [wallet:{self.address}]"
+                f" Receipt failed: {type(e).__name__}: {e}"
+            )
+            return None
+
+        if receipt.status == 0:
+            self.resync_nonce()
+
+            # The revert reason is replayed after the run, not inside the measured send
+            if self.revert_log is not None:
+                self.revert_log.record(self.user_id, request_id, tx_hash, receipt.blockNumber)
+
+            logging.error(
+                f"[User-{self.user_id:03d}]" 
+                f"  [Req-{request_id:03d}]"
+                f"  [wallet:{self.address}]"
+                f"  Transaction reverted in block {receipt.blockNumber}"
+            )
+
+        return receipt
+
+    async def send_transaction(self, signed_tx, request_id, wait_receipt: bool = True):
+        """Send a signed transaction to the network and wait for its receipt (Async)."""
+        tx_hash = await self.broadcast_transaction(signed_tx, request_id, track_receipt=wait_receipt)
+        if tx_hash is None:
             return None, None
 
+        if not wait_receipt:
+            return tx_hash, None
+
+        return tx_hash, await self.wait_for_receipt(signed_tx, tx_hash, request_id)
+
 
-    async def build_transaction(self, tx_obj: dict) -> dict:
-        """Build a transaction ready for signing (Async)."""
+    async def build_transaction(self, tx_obj: dict, nonce: int = None) -> dict:
+        """Build a transaction ready for signing (Async).
+
+        An explicit `nonce` (pre-signed corpus) bypasses the local nonce manager.
+        """
         try:
             gas_price_gwei = "50"
             async_w3 = get_async_w3()
 
-            # Async calls
-            nonce = await async_w3.eth.get_transaction_count(self.address)
+            if nonce is None:
+                # Only the first build (or the first after a resync) goes to the node
+                nonce = await self._next_nonce(async_w3)
+                self._built_nonce = nonce
             
-            # Helper for gas price
-            try:
-                gas_price = await async_w3.eth.gas_price
-            except:
-                gas_price = await async_w3.eth.gas_price
+            # Chain values come from the cache shared by every wallet
+            gas_price = await get_gas_price_async()
             
             # Increase gas price by 10% to prevent stuck transactions
             gas_price = int(gas_price * 1.1)
 
             value_wei = int(async_w3.to_wei(0.0, "ether"))
-            chain_id = await async_w3.eth.chain_id
+            chain_id = await get_chain_id_async()
+            gas_limit = min(TX_GAS_LIMIT, await get_block_gas_limit_async())
 
             tx = {
                 "from": tx_obj["from"],
                 "to": tx_obj["to"],
                 "data": tx_obj.get("data", "0x"),
                 "value": value_wei,
-                "gas": 1_000_000,
+                "gas": gas_limit,
                 "gasPrice": gas_price,
                 "nonce": nonce,
                 "chainId": chain_id,
@@ -139,5 +209,6 @@ class Wallet:
             return tx
 
         except Exception as e:
+            self.resync_nonce()
             logging.error(f"[User-{self.user_id:03d}] [wallet:{self.address}] Failed to build transaction: {e}")
             return None
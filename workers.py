@@ -0,0 +1,188 @@
+import time
+import queue
+import logging
+import logging.handlers
+import multiprocessing as mp
+
+# Internal imports
+from sinks import ResultSink
+
+RESULT_BATCH_SIZE = 500
+POLL_INTERVAL = 1.0
+
+
+class ResultForwarder(ResultSink):
+    """Result sink that streams batches back to the parent process."""
+
+    def __init__(self, result_queue, worker_index: int, batch_size: int = RESULT_BATCH_SIZE, flush_interval: float = POLL_INTERVAL):
+        self.result_queue = result_queue
+        self.worker_index = worker_index
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._batch = []
+        self._last_flush = time.monotonic()
+
+    def append(self, result):
+        self._batch.append(result)
+        # Low rates still reach the parent (live metrics) within about flush_interval
+        if len(self._batch) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self._batch:
+            self.result_queue.put(("results", self.worker_index, self._batch))
+            self._batch = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+
+class _WorkerPrefixFilter(logging.Filter):
+    """Prefixes worker log records so they can be told apart in the parent log."""
+
+    def __init__(self, worker_index: int):
+        super().__init__()
+        self.prefix = f"[Worker-{worker_index:02d}] "
+
+    def filter(self, record):
+        record.msg = f"{self.prefix}{record.msg}"
+        return True
+
+
+def _setup_worker_logging(worker_index, verbosity, log_queue):
+    root_logger = logging.getLogger()
+    root_logger.handlers.clear()
+    root_logger.setLevel(verbosity)
+
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(_WorkerPrefixFilter(worker_index))
+    root_logger.addHandler(handler)
+
+
+def run_shard(worker_index, tester_kwargs, run_method, phase, channel, wait_for_start):
+    """
+    Builds the shard LoadTester, waits for the phase start barrier and runs it.
+
+    `channel` is anything with a `put(message)` method (a multiprocessing queue
+    or a socket adapter); messages are (kind, worker_index, payload) tuples.
+    """
+    try:
+        # Imported here to avoid a circular import with load_tester
+        from load_tester import LoadTester
+
+        tester = LoadTester(**tester_kwargs)
+        forwarder = ResultForwarder(channel, worker_index)
+        tester.results_tx_build = forwarder
+        tester.results_read_only = forwarder
+
+        # Phase start barrier: every shard begins at the same time
+        channel.put(("ready", worker_index, None))
+        if not wait_for_start():
+            tester.close()
+            return
+
+        run_data = getattr(tester, run_method)(phase)
+        forwarder.close()
+        tester.close()
+
+        # Loop windows are told apart by the shard that sampled them
+        for window in run_data.get("loop") or []:
+            window["worker"] = worker_index
+
+        channel.put(("done", worker_index, {
+            "global_stats": run_data["global_stats"],
+            "arrivals": run_data.get("arrivals"),
+            "histograms": run_data.get("histograms"),
+            "reverts": run_data.get("reverts"),
+            "loop": run_data.get("loop"),
+        }))
+
+    except Exception as e:
+        logging.error(f"Worker failed: {type(e).__name__}: {e}", exc_info=True)
+        channel.put(("error", worker_index, f"{type(e).__name__}: {e}"))
+
+
+def _worker_main(worker_index, tester_kwargs, run_method, phase, verbosity, result_queue, log_queue, start_event):
+    """Entry point of a load generation process: own event loop, wallets and sessions."""
+    _setup_worker_logging(worker_index, verbosity, log_queue)
+    run_shard(worker_index, tester_kwargs, run_method, phase, result_queue, start_event.wait)
+
+
+def run_sharded(shard_kwargs: list, run_method: str, phase: str, results):
+    """
+    Runs `run_method(phase)` of one LoadTester per shard, each in its own process.
+
+    Results are streamed back in batches and appended to `results` while the
+    shards run. Returns the per-shard summaries (global_stats / arrivals /
+    histograms) and the elapsed time measured from the common start barrier.
+    """
+    ctx = mp.get_context("spawn")
+    result_queue = ctx.Queue()
+    log_queue = ctx.Queue()
+    start_event = ctx.Event()
+    verbosity = logging.getLogger().getEffectiveLevel()
+
+    # Worker log records are handled by the parent handlers (console + log file)
+    listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+    listener.start()
+
+    processes = [
+        ctx.Process(
+            target=_worker_main,
+            args=(index, kwargs, run_method, phase, verbosity, result_queue, log_queue, start_event),
+            daemon=True
+        )
+        for index, kwargs in enumerate(shard_kwargs)
+    ]
+
+    for process in processes:
+        process.start()
+
+    logging.info(f"[Workers] Started {len(processes)} load generation processes")
+
+    pending = set(range(len(processes)))
+    not_ready = set(pending)
+    summaries = []
+    start_time = time.perf_counter()
+
+    try:
+        while pending:
+            try:
+                kind, index, payload = result_queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                for index in list(pending):
+                    if not processes[index].is_alive():
+                        logging.error(f"[Workers] Worker-{index:02d} exited without reporting (exit code {processes[index].exitcode})")
+                        pending.discard(index)
+                        not_ready.discard(index)
+                kind = None
+
+            if kind == "ready":
+                not_ready.discard(index)
+            elif kind == "results":
+                for result in payload:
+                    results.append(result)
+            elif kind == "done":
+                summaries.append(payload)
+                pending.discard(index)
+            elif kind == "error":
+                logging.error(f"[Workers] Worker-{index:02d} failed: {payload}")
+                pending.discard(index)
+                not_ready.discard(index)
+
+            if not not_ready and not start_event.is_set():
+                logging.info(f"[Workers] All workers ready, starting phase {phase}")
+                start_time = time.perf_counter()
+                start_event.set()
+
+        total_time = round(time.perf_counter() - start_time, 2)
+
+    finally:
+        for process in processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        listener.stop()
+
+    return summaries, total_time